@@ -0,0 +1,520 @@
+"""
+A local stand-in for the Binance REST API, the stream endpoints and the WebSocket API,
+so the clients can be benchmarked without touching the real exchange.
+
+All routes are served from one aiohttp application:
+
+- ``/api/v3/...``, the REST routes used by :mod:`binance_asyncio.endpoints`, with canned
+  responses and the weight headers of the exchange. Signed requests are verified against
+  :data:`SECRET_KEY`, and rejected like the exchange does when the signature is invalid
+- ``/ws`` and ``/ws/{messages}``, the raw stream endpoint, speaking the ``SUBSCRIBE`` protocol
+  of :class:`BaseStream`
+- ``/stream`` and ``/stream/{messages}``, the combined stream endpoint, subscribed by
+  ``?streams=`` or ``SUBSCRIBE``, as used by :class:`StreamMultiplexer`
+- ``/ws-api/v3``, the order methods of the WebSocket API
+
+When a stream url ends with a number of messages, that many messages are sent per
+subscribed stream, as fast as the connection accepts them, after which the connection
+is closed. Otherwise the server only acknowledges subscriptions.
+
+The payloads are generated from a fixed seed, so every run sends the exact same bytes.
+
+    python -m benchmarks.server --port 8080
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import struct
+import time
+from typing import Dict, List
+from aiohttp import WSMsgType, web
+
+API_KEY = 'vmPUZE6mv9SD5VNHk4HlWFsOr6aKE2zvsw0MuIgwCIPy6utIco14y7Ju91duEh8A'
+SECRET_KEY = 'NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j'
+SEED = 42
+START_TIME = 1672531200000
+VARIANTS = 16
+# the number of frames written at once, and the size of the write buffer at which the writer waits
+BATCH = 64
+WRITE_BUFFER = 1024 * 1024
+
+# the weight of the routes, as far as the mock is concerned
+WEIGHTS = {
+    'exchangeInfo': 20, 'depth': 5, 'trades': 25, 'historicalTrades': 25, 'aggTrades': 2, 'klines': 2,
+    'avgPrice': 2, 'ticker/24hr': 2, 'ticker/price': 2, 'ticker/bookTicker': 2, 'account': 20,
+    'openOrders': 6, 'allOrders': 20, 'order': 1, 'order/test': 1, 'userDataStream': 2,
+}
+
+# the fixtures of the ticker routes
+TICKERS = {'ticker/24hr': 'ticker', 'ticker/price': 'price', 'ticker/bookTicker': 'book_ticker'}
+
+
+def _price(rng: random.Random, base: float = 20000.0) -> str:
+    return '{:.8f}'.format(base + rng.uniform(-100, 100))
+
+
+def _quantity(rng: random.Random) -> str:
+    return '{:.8f}'.format(rng.uniform(0.0001, 2.0))
+
+
+class Fixtures:
+    """
+    The canned responses of the REST routes, and the messages of the streams
+    """
+    def __init__(self, seed: int = SEED) -> None:
+        self.seed = seed
+        rng = random.Random(seed)
+        self.symbols = ['SYM{:04d}USDT'.format(i) for i in range(50)] + ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+        self.exchange_info = {
+            'timezone': 'UTC',
+            'serverTime': START_TIME,
+            'rateLimits': [
+                {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 6000},
+                {'rateLimitType': 'ORDERS', 'interval': 'SECOND', 'intervalNum': 10, 'limit': 100},
+            ],
+            'symbols': [{
+                'symbol': symbol,
+                'status': 'TRADING',
+                'baseAsset': symbol[:-4],
+                'quoteAsset': 'USDT',
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000', 'maxPrice': '1000000.00000000',
+                        'tickSize': '0.01000000'},
+                    {'filterType': 'LOT_SIZE', 'minQty': '0.00001000', 'maxQty': '9000.00000000',
+                        'stepSize': '0.00001000'},
+                    {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'},
+                ],
+            } for symbol in self.symbols],
+        }
+        self.depth = {
+            'lastUpdateId': 1027024,
+            'bids': [[_price(rng), _quantity(rng)] for _ in range(5000)],
+            'asks': [[_price(rng), _quantity(rng)] for _ in range(5000)],
+        }
+        self.trades = [{
+            'id': 28457 + i, 'price': _price(rng), 'qty': _quantity(rng), 'quoteQty': _price(rng),
+            'time': START_TIME + i, 'isBuyerMaker': rng.random() < 0.5, 'isBestMatch': True,
+        } for i in range(1000)]
+        self.aggregated_trades = [{
+            'a': 26129 + i, 'p': _price(rng), 'q': _quantity(rng), 'f': 27781 + i, 'l': 27781 + i,
+            'T': START_TIME + i, 'm': rng.random() < 0.5, 'M': True,
+        } for i in range(1000)]
+        self.klines = [[
+            START_TIME + i * 60000, _price(rng), _price(rng), _price(rng), _price(rng), _quantity(rng),
+            START_TIME + (i + 1) * 60000 - 1, _price(rng), rng.randint(1, 1000), _quantity(rng),
+            _price(rng), '0',
+        ] for i in range(1000)]
+        self.average = {'mins': 5, 'price': _price(rng)}
+        self.ticker = {
+            'symbol': 'BTCUSDT', 'priceChange': '-94.99999800', 'priceChangePercent': '-95.960',
+            'weightedAvgPrice': _price(rng), 'prevClosePrice': _price(rng), 'lastPrice': _price(rng),
+            'lastQty': _quantity(rng), 'bidPrice': _price(rng), 'bidQty': _quantity(rng), 'askPrice': _price(rng),
+            'askQty': _quantity(rng), 'openPrice': _price(rng), 'highPrice': _price(rng), 'lowPrice': _price(rng),
+            'volume': _quantity(rng), 'quoteVolume': _price(rng), 'openTime': START_TIME,
+            'closeTime': START_TIME + 86400000, 'firstId': 28385, 'lastId': 28460, 'count': 76,
+        }
+        self.price = {'symbol': 'BTCUSDT', 'price': _price(rng)}
+        self.book_ticker = {'symbol': 'BTCUSDT', 'bidPrice': _price(rng), 'bidQty': _quantity(rng),
+            'askPrice': _price(rng), 'askQty': _quantity(rng)}
+        self.account = {
+            'makerCommission': 15, 'takerCommission': 15, 'buyerCommission': 0, 'sellerCommission': 0,
+            'canTrade': True, 'canWithdraw': True, 'canDeposit': True, 'updateTime': START_TIME,
+            'accountType': 'SPOT',
+            'balances': [{'asset': symbol[:-4], 'free': _quantity(rng), 'locked': '0.00000000'}
+                for symbol in self.symbols],
+            'permissions': ['SPOT'],
+        }
+        self._messages: Dict[str, List[str]] = {}
+
+    def get_order(self, parameters: dict, order_id: int) -> dict:
+        return {
+            'symbol': parameters.get('symbol', 'BTCUSDT'),
+            'orderId': order_id,
+            'orderListId': -1,
+            'clientOrderId': parameters.get('newClientOrderId') or 'mock{}'.format(order_id),
+            'transactTime': START_TIME,
+            'price': parameters.get('price', '0.00000000'),
+            'origQty': parameters.get('quantity', '0.00000000'),
+            'executedQty': '0.00000000',
+            'cummulativeQuoteQty': '0.00000000',
+            'status': 'NEW',
+            'timeInForce': parameters.get('timeInForce', 'GTC'),
+            'type': parameters.get('type', 'LIMIT'),
+            'side': parameters.get('side', 'BUY'),
+        }
+
+    def get_messages(self, stream: str) -> List[str]:
+        """
+        The encoded messages of a stream, a fixed number of variants which are sent in turn
+        """
+        messages = self._messages.get(stream)
+        if messages is None:
+            rng = random.Random('{}:{}'.format(self.seed, stream))
+            messages = [json.dumps(self.get_event(stream, rng, i), separators=(',', ':')) for i in range(VARIANTS)]
+            self._messages[stream] = messages
+        return messages
+
+    @staticmethod
+    def get_event(stream: str, rng: random.Random, sequence: int) -> dict:
+        symbol, _, kind = stream.partition('@')
+        symbol = symbol.upper()
+        event_time = START_TIME + sequence
+        if kind == 'trade':
+            return {'e': 'trade', 'E': event_time, 's': symbol, 't': 12345 + sequence, 'p': _price(rng),
+                'q': _quantity(rng), 'b': 88, 'a': 50, 'T': event_time, 'm': True, 'M': True}
+        if kind == 'aggTrade':
+            return {'e': 'aggTrade', 'E': event_time, 's': symbol, 'a': 12345 + sequence, 'p': _price(rng),
+                'q': _quantity(rng), 'f': 100, 'l': 105, 'T': event_time, 'm': True, 'M': True}
+        if kind.startswith('kline_'):
+            return {'e': 'kline', 'E': event_time, 's': symbol, 'k': {
+                't': START_TIME, 'T': START_TIME + 59999, 's': symbol, 'i': kind[6:], 'f': 100, 'L': 200,
+                'o': _price(rng), 'c': _price(rng), 'h': _price(rng), 'l': _price(rng), 'v': _quantity(rng),
+                'n': 100, 'x': False, 'q': _price(rng), 'V': _quantity(rng), 'Q': _price(rng), 'B': '0'}}
+        if kind == 'bookTicker':
+            return {'u': 400900217 + sequence, 's': symbol, 'b': _price(rng), 'B': _quantity(rng),
+                'a': _price(rng), 'A': _quantity(rng)}
+        if kind.startswith('depth'):
+            return {'e': 'depthUpdate', 'E': event_time, 's': symbol, 'U': 157 + sequence * 2,
+                'u': 158 + sequence * 2, 'b': [[_price(rng), _quantity(rng)] for _ in range(10)],
+                'a': [[_price(rng), _quantity(rng)] for _ in range(10)]}
+        return {'e': '24hrTicker', 'E': event_time, 's': symbol, 'p': '0.0015', 'P': '250.00',
+            'w': _price(rng), 'x': _price(rng), 'c': _price(rng), 'Q': _quantity(rng), 'b': _price(rng),
+            'B': _quantity(rng), 'a': _price(rng), 'A': _quantity(rng), 'o': _price(rng), 'h': _price(rng),
+            'l': _price(rng), 'v': _quantity(rng), 'q': _price(rng), 'O': 0, 'C': 86400000, 'F': 0,
+            'L': 18150, 'n': 18151}
+
+
+def _frame(message: str) -> bytes:
+    """
+    Encodes a text frame, as sent by a server, so unmasked
+    """
+    data = message.encode()
+    length = len(data)
+    if length < 126:
+        return bytes((0x81, length)) + data
+    if length < 65536:
+        return bytes((0x81, 126)) + struct.pack('!H', length) + data
+    return bytes((0x81, 127)) + struct.pack('!Q', length) + data
+
+
+def _error(status: int, code: int, message: str) -> web.Response:
+    return web.json_response({'code': code, 'msg': message}, status=status)
+
+
+class MockServer:
+    """
+    The mock exchange, which can be run in the current event loop with :meth:`start`,
+    or in a process of its own with :func:`serve`
+
+    :param host: The host to listen on
+    :param port: The port to listen on, 0 picks a free port
+    :param fixtures: The canned responses and messages
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, fixtures: Fixtures = None) -> None:
+        self.host = host
+        self.port = port
+        self.fixtures = fixtures or Fixtures()
+        self.requests = 0
+        self._order_ids = itertools.count(1)
+        self._minute = None
+        self._used_weight = 0
+        self._runner = None
+        self._sockets = set()
+        self._cache: Dict[str, bytes] = {}
+
+    @property
+    def url(self) -> str:
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    @property
+    def rest_uri(self) -> str:
+        return '{}/api/v3'.format(self.url)
+
+    @property
+    def stream_uri(self) -> str:
+        return 'ws://{}:{}/ws'.format(self.host, self.port)
+
+    @property
+    def combined_stream_uri(self) -> str:
+        return 'ws://{}:{}/stream'.format(self.host, self.port)
+
+    @property
+    def websocket_api_uri(self) -> str:
+        return 'ws://{}:{}/ws-api/v3'.format(self.host, self.port)
+
+    def get_application(self) -> web.Application:
+        application = web.Application()
+        application.router.add_get('/ws', self.handle_stream)
+        application.router.add_get('/ws/{messages:\\d+}', self.handle_stream)
+        application.router.add_get('/stream', self.handle_combined_stream)
+        application.router.add_get('/stream/{messages:\\d+}', self.handle_combined_stream)
+        application.router.add_get('/ws-api/v3', self.handle_websocket_api)
+        application.router.add_route('*', '/api/v3/{endpoint:.+}', self.handle_rest)
+        application.on_shutdown.append(self._close_sockets)
+        return application
+
+    async def start(self) -> 'MockServer':
+        self._runner = web.AppRunner(self.get_application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, backlog=1024)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _close_sockets(self, application) -> None:
+        for websocket in list(self._sockets):
+            await websocket.close()
+
+    # REST
+
+    def _get_weight_headers(self, weight: int) -> dict:
+        minute = int(time.time() // 60)
+        if minute != self._minute:
+            self._minute = minute
+            self._used_weight = 0
+        self._used_weight += weight
+        return {'X-MBX-USED-WEIGHT-1M': str(self._used_weight)}
+
+    def _respond(self, key: str, value, headers: dict) -> web.Response:
+        body = self._cache.get(key)
+        if body is None:
+            body = self._cache[key] = json.dumps(value, separators=(',', ':')).encode()
+        return web.Response(body=body, content_type='application/json', headers=headers)
+
+    def _respond_ticker(self, endpoint: str, ticker: dict, parameters: dict, headers: dict) -> web.Response:
+        if 'symbols' in parameters:
+            symbols = json.loads(parameters['symbols'])
+        elif 'symbol' in parameters:
+            symbols = parameters['symbol']
+        else:
+            symbols = self.fixtures.symbols
+        for symbol in [symbols] if isinstance(symbols, str) else symbols:
+            if symbol not in self.fixtures.symbols:
+                return _error(400, -1121, 'Invalid symbol.')
+        if isinstance(symbols, str):
+            return self._respond('{}:{}'.format(endpoint, symbols), dict(ticker, symbol=symbols), headers)
+        return self._respond('{}:[{}]'.format(endpoint, ','.join(symbols)),
+            [dict(ticker, symbol=symbol) for symbol in symbols], headers)
+
+    @staticmethod
+    def _is_signature_valid(payload: str) -> bool:
+        payload, separator, signature = payload.rpartition('&signature=')
+        if not separator:
+            payload, separator, signature = payload.rpartition('signature=')
+        if not separator:
+            return False
+        expected = hmac.new(SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    async def handle_rest(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        endpoint = request.match_info['endpoint']
+        method = request.method
+        if method == 'POST':
+            payload = await request.text()
+            parameters = dict(item.split('=', 1) for item in payload.split('&') if '=' in item)
+        else:
+            payload = request.rel_url.raw_query_string
+            parameters = dict(request.query)
+        headers = self._get_weight_headers(WEIGHTS.get(endpoint, 1))
+        fixtures = self.fixtures
+
+        if endpoint in ('account', 'order', 'order/test', 'openOrders', 'allOrders'):
+            if request.headers.get('X-MBX-APIKEY') != API_KEY:
+                return _error(401, -2015, 'Invalid API-key, IP, or permissions for action.')
+            if not self._is_signature_valid(payload):
+                return _error(400, -1022, 'Signature for this request is not valid.')
+
+        if endpoint == 'ping':
+            return self._respond('ping', {}, headers)
+        if endpoint == 'time':
+            return web.json_response({'serverTime': int(time.time() * 1000)}, headers=headers)
+        if endpoint == 'exchangeInfo':
+            return self._respond(endpoint, fixtures.exchange_info, headers)
+        if endpoint == 'depth':
+            limit = int(parameters.get('limit', 100))
+            return self._respond('depth:{}'.format(limit), {
+                'lastUpdateId': fixtures.depth['lastUpdateId'],
+                'bids': fixtures.depth['bids'][:limit],
+                'asks': fixtures.depth['asks'][:limit],
+            }, headers)
+        if endpoint in ('trades', 'historicalTrades'):
+            limit = int(parameters.get('limit', 500))
+            return self._respond('trades:{}'.format(limit), fixtures.trades[:limit], headers)
+        if endpoint == 'aggTrades':
+            limit = int(parameters.get('limit', 500))
+            return self._respond('aggTrades:{}'.format(limit), fixtures.aggregated_trades[:limit], headers)
+        if endpoint == 'klines':
+            limit = int(parameters.get('limit', 500))
+            return self._respond('klines:{}'.format(limit), fixtures.klines[:limit], headers)
+        if endpoint == 'avgPrice':
+            return self._respond(endpoint, fixtures.average, headers)
+        if endpoint in TICKERS:
+            return self._respond_ticker(endpoint, getattr(fixtures, TICKERS[endpoint]), parameters, headers)
+        if endpoint == 'account':
+            return self._respond(endpoint, fixtures.account, headers)
+        if endpoint == 'order/test':
+            return self._respond(endpoint, {}, headers)
+        if endpoint == 'order':
+            if method == 'POST':
+                headers['X-MBX-ORDER-COUNT-10S'] = '1'
+            return web.json_response(fixtures.get_order(parameters, next(self._order_ids)), headers=headers)
+        if endpoint in ('openOrders', 'allOrders'):
+            return self._respond(endpoint, [], headers)
+        if endpoint == 'userDataStream':
+            if request.headers.get('X-MBX-APIKEY') != API_KEY:
+                return _error(401, -2015, 'Invalid API-key, IP, or permissions for action.')
+            if method == 'POST':
+                return web.json_response({'listenKey': 'listen{:060d}'.format(next(self._order_ids))},
+                    headers=headers)
+            return self._respond('ping', {}, headers)
+        return _error(404, -1000, 'Unknown endpoint {}'.format(endpoint))
+
+    # streams
+
+    async def _send_messages(self, request: web.Request, websocket: web.WebSocketResponse, streams: List[str],
+            messages: int, combined: bool) -> None:
+        # the frames are encoded once, and written in batches straight to the transport, as sending
+        # them one at a time through the response would make the server the bottleneck
+        fixtures = self.fixtures
+        if combined:
+            cycles = [[_frame('{{"stream":"{}","data":{}}}'.format(stream, message))
+                for message in fixtures.get_messages(stream)] for stream in streams]
+        else:
+            cycles = [[_frame(message) for message in fixtures.get_messages(stream)] for stream in streams]
+        transport = request.transport
+        batch = []
+        for sequence in range(messages):
+            variant = sequence % VARIANTS
+            batch.extend(cycle[variant] for cycle in cycles)
+            if len(batch) >= BATCH or sequence == messages - 1:
+                if transport is None or transport.is_closing():
+                    return
+                transport.write(b''.join(batch))
+                batch = []
+                while transport.get_write_buffer_size() > WRITE_BUFFER:
+                    await asyncio.sleep(0.0005)
+        await websocket.close()
+
+    async def _serve_stream(self, request: web.Request, streams: List[str], combined: bool):
+        websocket = web.WebSocketResponse(compress=False, max_msg_size=0)
+        await websocket.prepare(request)
+        self._sockets.add(websocket)
+        messages = int(request.match_info.get('messages', 0))
+        sender = None
+        try:
+            if streams and messages:
+                sender = asyncio.ensure_future(self._send_messages(request, websocket, streams, messages, combined))
+            async for message in websocket:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                request_data = json.loads(message.data)
+                method = request_data.get('method')
+                if method == 'SUBSCRIBE':
+                    streams.extend(name for name in request_data.get('params', []) if name not in streams)
+                elif method == 'UNSUBSCRIBE':
+                    for name in request_data.get('params', []):
+                        if name in streams:
+                            streams.remove(name)
+                await websocket.send_str(json.dumps({'result': None, 'id': request_data.get('id')}))
+                if sender is None and streams and messages:
+                    sender = asyncio.ensure_future(self._send_messages(request, websocket, list(streams),
+                        messages, combined))
+        finally:
+            self._sockets.discard(websocket)
+            if sender is not None:
+                sender.cancel()
+        return websocket
+
+    async def handle_stream(self, request: web.Request):
+        return await self._serve_stream(request, [], combined=False)
+
+    async def handle_combined_stream(self, request: web.Request):
+        streams = [name for name in request.query.get('streams', '').split('/') if name]
+        return await self._serve_stream(request, streams, combined=True)
+
+    # WebSocket API
+
+    async def handle_websocket_api(self, request: web.Request):
+        websocket = web.WebSocketResponse(compress=False)
+        await websocket.prepare(request)
+        self._sockets.add(websocket)
+        try:
+            async for message in websocket:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                await websocket.send_str(json.dumps(self._call(json.loads(message.data))))
+        finally:
+            self._sockets.discard(websocket)
+        return websocket
+
+    def _call(self, request_data: dict) -> dict:
+        self.requests += 1
+        request_id = request_data.get('id')
+        parameters = dict(request_data.get('params') or {})
+        signature = parameters.pop('signature', '')
+        payload = '&'.join('{}={}'.format(name, parameters[name]) for name in sorted(parameters))
+        if parameters.get('apiKey') != API_KEY:
+            return {'id': request_id, 'status': 401,
+                'error': {'code': -2015, 'msg': 'Invalid API-key, IP, or permissions for action.'}}
+        if not self._is_signature_valid('{}&signature={}'.format(payload, signature)):
+            return {'id': request_id, 'status': 400,
+                'error': {'code': -1022, 'msg': 'Signature for this request is not valid.'}}
+        method = request_data.get('method')
+        if method == 'order.test':
+            result = {}
+        elif method in ('order.place', 'order.status', 'order.cancel'):
+            result = self.fixtures.get_order(parameters, next(self._order_ids))
+        else:
+            return {'id': request_id, 'status': 400, 'error': {'code': -1000, 'msg': 'Unknown method'}}
+        return {'id': request_id, 'status': 200, 'result': result}
+
+
+def serve(host: str = '127.0.0.1', port: int = 0, ready=None) -> None:
+    """
+    Runs the mock exchange until the process is terminated. The port it listens
+    on is sent through the optional ``ready`` connection, once it accepts connections
+    """
+    async def run():
+        server = await MockServer(host, port).start()
+        if ready is not None:
+            ready.send(server.port)
+            ready.close()
+        else:
+            print('Serving on {}'.format(server.url))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    arguments = parser.parse_args()
+    serve(arguments.host, arguments.port)
+
+
+if __name__ == '__main__':
+    main()
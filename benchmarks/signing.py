@@ -0,0 +1,57 @@
+"""
+Micro-benchmark of encoding and signing the parameters of an order, comparing
+the single-pass encoding with a pre-keyed HMAC, to encoding twice and keying
+a new HMAC for every request.
+
+    python -m benchmarks.signing
+"""
+import hashlib
+import hmac
+import time
+import timeit
+from urllib.parse import urlencode
+from binance_asyncio.signing import Signer, encode_parameters
+
+SECRET_KEY = 'NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j'
+TIMESTAMP = int(time.time() * 1000)
+
+
+def get_parameters() -> dict:
+    return {
+        'symbol': 'BTCUSDT',
+        'side': 'BUY',
+        'type': 'LIMIT',
+        'timeInForce': 'GTC',
+        'quantity': '0.00100000',
+        'price': '43123.45000000',
+        'newClientOrderId': None,
+        'timestamp': TIMESTAMP,
+    }
+
+
+def encode_twice() -> bytes:
+    parameters = get_parameters()
+    for key in [key for key, value in parameters.items() if value is None]:
+        del parameters[key]
+    signature = hmac.new(str.encode(SECRET_KEY), str.encode(urlencode(parameters)), hashlib.sha256).hexdigest()
+    parameters['signature'] = signature
+    return str.encode(urlencode(parameters))
+
+
+signer = Signer(SECRET_KEY)
+
+
+def encode_once() -> bytes:
+    query_string = encode_parameters(get_parameters())
+    return '{}&signature={}'.format(query_string, signer.sign(query_string.encode())).encode()
+
+
+def main(number: int = 100000) -> None:
+    assert encode_twice() == encode_once()
+    for name, function in (('encode twice, new hmac', encode_twice), ('encode once, cached hmac', encode_once)):
+        seconds = min(timeit.repeat(function, number=number, repeat=5))
+        print('{:<26} {:8.2f} us/request'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""
+Offline benchmark suite of the REST clients, the streams and the WebSocket API, run against
+the local mock exchange of :mod:`benchmarks.server`, which is started in a process of its own.
+
+The scenarios are
+
+- ``rest_throughput``, sustained requests per second of concurrent ticker requests over a pooled session
+- ``rest_order``, the round trip latency of signed orders, one at a time
+- ``websocket_api_order``, the round trip latency of orders over the WebSocket API, one at a
+  time, and the throughput of many in flight
+- ``stream_throughput``, messages per second of a single stream to a no-op handler, per decode mode,
+  and to a handler of batches of raw messages
+- ``stream_fanout``, many symbols subscribed over one connection, or sharded by the multiplexer
+
+Every scenario is repeated, and the median of every metric is reported. The results are printed
+and, optionally, written to a JSON file, which a later run can be compared to, to track regressions.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --quick --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+import aiohttp
+import websockets
+from binance_asyncio import codec
+from binance_asyncio.endpoints import AccountEndpoints, MarketDataEndpoints
+from binance_asyncio.session import HttpSession
+from binance_asyncio.websockets.api import WebSocketAccountEndpoints
+from binance_asyncio.websockets.dispatch import BatchDispatcher, Dispatcher
+from binance_asyncio.websockets.multiplexer import StreamMultiplexer
+from binance_asyncio.websockets.streams import BaseStream, TradeStream
+from benchmarks.server import API_KEY, SECRET_KEY, serve
+
+HOST = '127.0.0.1'
+
+# the sizes of the scenarios, and the smaller ones of a quick run
+SIZES = {
+    'rest_requests': (20000, 2000),
+    'rest_concurrency': (64, 64),
+    'orders': (2000, 300),
+    'websocket_api_requests': (20000, 2000),
+    'stream_messages': (200000, 20000),
+    'fanout_symbols': (1000, 200),
+    'fanout_messages': (200, 50),
+    'fanout_streams_per_connection': (200, 50),
+}
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def latency_metrics(latencies: List[float]) -> Dict[str, float]:
+    """
+    The latency distribution of round trips, in milliseconds
+    """
+    return {
+        'latency_mean_ms': statistics.fmean(latencies) * 1e3,
+        'latency_p50_ms': percentile(latencies, 0.50) * 1e3,
+        'latency_p90_ms': percentile(latencies, 0.90) * 1e3,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1e3,
+    }
+
+
+class Suite:
+    """
+    Runs the scenarios against a mock exchange listening on a port
+
+    :param port: The port of the mock exchange
+    :param quick: When true, the scenarios are smaller
+    """
+    def __init__(self, port: int, quick=False) -> None:
+        self.port = port
+        self.sizes = {name: size[1] if quick else size[0] for name, size in SIZES.items()}
+        self.rest_uri = 'http://{}:{}/api/v3'.format(HOST, port)
+        self.stream_uri = 'ws://{}:{}/ws'.format(HOST, port)
+        self.combined_stream_uri = 'ws://{}:{}/stream'.format(HOST, port)
+        self.websocket_api_uri = 'ws://{}:{}/ws-api/v3'.format(HOST, port)
+
+    def get_scenarios(self) -> Dict[str, Callable]:
+        return {
+            'rest_throughput': self.rest_throughput,
+            'rest_order': self.rest_order,
+            'websocket_api_order': self.websocket_api_order,
+            'stream_throughput': self.stream_throughput,
+            'stream_fanout': self.stream_fanout,
+        }
+
+    async def rest_throughput(self) -> Dict[str, float]:
+        requests = self.sizes['rest_requests']
+        concurrency = self.sizes['rest_concurrency']
+        latencies = []
+        async with HttpSession(limit=concurrency, limit_per_host=concurrency) as session:
+            market_data = MarketDataEndpoints(uri=self.rest_uri, session=session)
+            await market_data.warm_up(concurrency)
+            remaining = iter(range(requests))
+
+            async def worker():
+                for _ in remaining:
+                    start = time.perf_counter()
+                    status, _ = await market_data.get_symbol_price_ticker('BTCUSDT')
+                    latencies.append(time.perf_counter() - start)
+                    assert status == 200, status
+
+            start = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            elapsed = time.perf_counter() - start
+        return dict(requests_per_second=requests / elapsed, **latency_metrics(latencies))
+
+    async def rest_order(self) -> Dict[str, float]:
+        latencies = []
+        async with HttpSession() as session:
+            account = AccountEndpoints(API_KEY, SECRET_KEY, uri=self.rest_uri, session=session)
+            await account.warm_up()
+            for _ in range(self.sizes['orders']):
+                start = time.perf_counter()
+                status, result = await account.order('BTCUSDT', 'BUY', 'LIMIT', timeInForce='GTC',
+                    quantity='0.00100000', price='20000.00000000')
+                latencies.append(time.perf_counter() - start)
+                assert status == 200, result
+        return latency_metrics(latencies)
+
+    async def websocket_api_order(self) -> Dict[str, float]:
+        latencies = []
+        async with WebSocketAccountEndpoints(API_KEY, SECRET_KEY, uri=self.websocket_api_uri) as account:
+            for _ in range(self.sizes['orders']):
+                start = time.perf_counter()
+                status, result = await account.order('BTCUSDT', 'BUY', 'LIMIT', timeInForce='GTC',
+                    quantity='0.00100000', price='20000.00000000')
+                latencies.append(time.perf_counter() - start)
+                assert status == 200, result
+
+            requests = self.sizes['websocket_api_requests']
+            concurrency = self.sizes['rest_concurrency']
+            remaining = iter(range(requests))
+
+            async def worker():
+                for _ in remaining:
+                    status, result = await account.test_order('BTCUSDT', 'BUY', 'MARKET', quoteOrderQty=10)
+                    assert status == 200, result
+
+            start = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            elapsed = time.perf_counter() - start
+        return dict(requests_per_second=requests / elapsed, **latency_metrics(latencies))
+
+    async def _consume(self, stream: BaseStream, messages: int, decode: str, dispatcher: Dispatcher = None) -> float:
+        received = 0
+
+        async def handler(message):
+            nonlocal received
+            received += 1
+
+        async def batch_handler(batch):
+            nonlocal received
+            received += len(batch)
+
+        uri = BaseStream.uri
+        BaseStream.uri = '{}/{}'.format(self.stream_uri, messages)
+        try:
+            start = time.perf_counter()
+            await stream.start(handler if dispatcher is None else batch_handler, decode=decode, dispatcher=dispatcher)
+            elapsed = time.perf_counter() - start
+        finally:
+            BaseStream.uri = uri
+        expected = messages * len(stream.parameters)
+        assert received == expected, (received, expected)
+        return received / elapsed
+
+    async def stream_throughput(self) -> Dict[str, float]:
+        messages = self.sizes['stream_messages']
+        metrics = {}
+        for decode in ('raw', 'json', 'typed'):
+            stream = TradeStream()
+            await stream.subscribe('btcusdt')
+            metrics['{}_messages_per_second'.format(decode)] = await self._consume(stream, messages, decode)
+        stream = TradeStream()
+        await stream.subscribe('btcusdt')
+        metrics['batched_messages_per_second'] = await self._consume(stream, messages, 'raw', BatchDispatcher())
+        return metrics
+
+    async def stream_fanout(self) -> Dict[str, float]:
+        symbols = ['sym{:04d}usdt'.format(i) for i in range(self.sizes['fanout_symbols'])]
+        messages = self.sizes['fanout_messages']
+
+        # every subscription over a single connection
+        stream = TradeStream()
+        for symbol in symbols:
+            await stream.subscribe(symbol)
+        subscribe_rate = await self._consume(stream, messages, 'json')
+
+        # sharded across connections by the multiplexer, timing until every stream has delivered
+        trades = TradeStream()
+        for symbol in symbols:
+            await trades.subscribe(symbol)
+        seen = set()
+        received = 0
+        all_streams = None
+        start = time.perf_counter()
+
+        async def handler(data):
+            nonlocal received, all_streams
+            received += 1
+            if all_streams is None:
+                seen.add(data['s'])
+                if len(seen) == len(symbols):
+                    all_streams = time.perf_counter() - start
+
+        multiplexer = StreamMultiplexer(max_streams=self.sizes['fanout_streams_per_connection'])
+        multiplexer.uri = '{}/{}'.format(self.combined_stream_uri, messages)
+        multiplexer.add(trades, handler)
+        start = time.perf_counter()
+        await multiplexer.start()
+        elapsed = time.perf_counter() - start
+        assert received == messages * len(symbols), received
+        return {
+            'subscribe_messages_per_second': subscribe_rate,
+            'multiplexer_messages_per_second': received / elapsed,
+            'multiplexer_all_streams_ms': all_streams * 1e3,
+            'multiplexer_shards': len(multiplexer.shards),
+        }
+
+
+def get_environment() -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'revision': revision,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'aiohttp': aiohttp.__version__,
+        'websockets': websockets.__version__,
+        'codec': codec.name,
+    }
+
+
+async def run_scenarios(port: int, names: List[str], repeat: int, quick: bool) -> Dict[str, dict]:
+    suite = Suite(port, quick)
+    scenarios = suite.get_scenarios()
+    results = {}
+    for name in names:
+        runs = [await scenarios[name]() for _ in range(repeat)]
+        results[name] = {
+            'median': {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]},
+            'runs': runs,
+        }
+        print_result(name, results[name]['median'])
+    return results
+
+
+def print_result(name: str, metrics: Dict[str, float], baseline: Dict[str, float] = None) -> None:
+    print(name)
+    for metric, value in metrics.items():
+        line = '    {:<34} {:14.3f}'.format(metric, value)
+        if baseline is not None and baseline.get(metric):
+            change = (value - baseline[metric]) / baseline[metric] * 100
+            higher_is_better = not metric.endswith('_ms')
+            verdict = 'better' if (change > 0) == higher_is_better else 'worse'
+            line += '  {:+7.1f}% {}'.format(change, verdict if abs(change) >= 5 else '')
+        print(line)
+
+
+def start_server() -> tuple:
+    """
+    Starts the mock exchange in a process of its own, so it does not compete with the
+    clients for the event loop
+
+    :return: the process, and the port it listens on
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=serve, args=(HOST, 0, sender), daemon=True)
+    process.start()
+    sender.close()
+    if not receiver.poll(30):
+        process.terminate()
+        raise Exception("The mock exchange did not start")
+    return process, receiver.recv()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenarios', nargs='*', help='The scenarios to run, all by default')
+    parser.add_argument('--repeat', type=int, default=3, help='The number of runs of every scenario')
+    parser.add_argument('--quick', action='store_true', help='Run smaller scenarios')
+    parser.add_argument('--codec', help='The codec to use, see binance_asyncio.codec')
+    parser.add_argument('--output', help='A file to write the results to, as JSON')
+    parser.add_argument('--compare', help='A file of earlier results, to compare to')
+    arguments = parser.parse_args()
+
+    if arguments.codec:
+        codec.set_codec(arguments.codec)
+    available = list(Suite(0).get_scenarios().keys())
+    names = arguments.scenarios or available
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        parser.error('Unknown scenarios {}'.format(', '.join(unknown)))
+
+    process, port = start_server()
+    try:
+        results = asyncio.run(run_scenarios(port, names, arguments.repeat, arguments.quick))
+    finally:
+        process.terminate()
+        process.join()
+
+    report = {
+        'environment': get_environment(),
+        'parameters': {
+            'repeat': arguments.repeat,
+            'quick': arguments.quick,
+            'sizes': Suite(0, arguments.quick).sizes,
+        },
+        'scenarios': results,
+    }
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)['scenarios']
+        print('\ncompared to {}'.format(arguments.compare))
+        for name, result in results.items():
+            if name in baseline:
+                print_result(name, result['median'], baseline[name]['median'])
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
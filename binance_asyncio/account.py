@@ -0,0 +1,334 @@
+import asyncio
+import copy
+from typing import Callable, Dict, List, Optional
+from binance_asyncio.endpoints import AccountEndpoints
+from binance_asyncio.websockets.reconnect import ReconnectPolicy, _notify
+from binance_asyncio.websockets.streams import UserDataStream
+
+# the statuses of orders which are no longer open
+CLOSED_STATUSES = frozenset(('FILLED', 'CANCELED', 'REJECTED', 'EXPIRED', 'EXPIRED_IN_MATCH'))
+KEEP_ALIVE_INTERVAL = 30 * 60
+# the statuses which seeding is not retried on, the key is invalid or lacks permissions
+FATAL_STATUSES = frozenset((401, 403))
+
+
+class Balance:
+    """
+    The balance of an asset
+    """
+    __slots__ = ('asset', 'free', 'locked', 'update_time')
+
+    def __init__(self, asset: str, free: float, locked: float, update_time: int) -> None:
+        self.asset = asset
+        self.free = free
+        self.locked = locked
+        self.update_time = update_time
+
+    @property
+    def total(self) -> float:
+        return self.free + self.locked
+
+    def __repr__(self) -> str:
+        return "Balance({}, free={}, locked={})".format(self.asset, self.free, self.locked)
+
+
+class Order:
+    """
+    The state of an order, from the REST API, or the execution reports of the user data stream
+    """
+    __slots__ = ('symbol', 'order_id', 'client_order_id', 'side', 'type', 'time_in_force', 'status', 'price',
+        'quantity', 'executed_quantity', 'quote_quantity', 'update_time')
+
+    @classmethod
+    def from_rest(cls, data: dict) -> 'Order':
+        order = cls()
+        order.symbol = data['symbol']
+        order.order_id = data['orderId']
+        order.client_order_id = data['clientOrderId']
+        order.side = data['side']
+        order.type = data['type']
+        order.time_in_force = data.get('timeInForce')
+        order.status = data['status']
+        order.price = float(data['price'])
+        order.quantity = float(data['origQty'])
+        order.executed_quantity = float(data['executedQty'])
+        order.quote_quantity = float(data['cummulativeQuoteQty'])
+        order.update_time = data.get('updateTime', data.get('transactTime', 0))
+        return order
+
+    @classmethod
+    def from_event(cls, data: dict) -> 'Order':
+        order = cls()
+        order.symbol = data['s']
+        order.order_id = data['i']
+        order.client_order_id = data['c']
+        order.side = data['S']
+        order.type = data['o']
+        order.time_in_force = data['f']
+        order.status = data['X']
+        order.price = float(data['p'])
+        order.quantity = float(data['q'])
+        order.executed_quantity = float(data['z'])
+        order.quote_quantity = float(data['Z'])
+        order.update_time = data['T']
+        return order
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in CLOSED_STATUSES
+
+    def __repr__(self) -> str:
+        return "Order({}, {}, {} {} {}@{}, executed={})".format(self.symbol, self.order_id, self.status, self.side,
+            self.quantity, self.price, self.executed_quantity)
+
+
+class AccountState:
+    """
+    A local view of the balances and open orders of an account, seeded from the REST API,
+    and kept up to date by a :class:`UserDataStream`, so reading them is a dictionary lookup
+    rather than a request.
+
+    The listen key of the stream is created and kept alive, and renewed when it expires.
+    The state is seeded again every time the stream (re)connects, updates received while
+    seeding are applied afterwards, unless they are older than the seeded state.
+
+    .. code-block::
+
+        state = AccountState(AccountEndpoints(api_key, secret_key))
+        await state.start()
+        print(state.balances['USDT'].free)
+        print(state.get_open_orders('BTCUSDT'))
+        ...
+        await state.stop()
+
+    :param account: The client of the account
+    :param on_event: Optional callable, called with every event of the stream, once it has been applied
+    :param reconnect: How the stream reconnects, by default with the default :class:`ReconnectPolicy`
+    :type account: AccountEndpoints
+    :type on_event: Callable
+    :type reconnect: ReconnectPolicy
+    """
+    def __init__(self, account: AccountEndpoints, on_event: Callable = None, reconnect: ReconnectPolicy = None) -> None:
+        self.account = account
+        self.on_event = on_event
+        self.reconnect = reconnect
+        self.listen_key: Optional[str] = None
+        self.stream: Optional[UserDataStream] = None
+        self.balances: Dict[str, Balance] = {}
+        self.orders: Dict[int, Order] = {}
+        self.orders_by_client_id: Dict[str, Order] = {}
+        self.orders_by_symbol: Dict[str, Dict[int, Order]] = {}
+        self.update_time = 0
+        self.is_seeded = False
+        self._pending: List[dict] = []
+        self._seeded: Optional[asyncio.Event] = None
+        self._error: Optional[Exception] = None
+        self._stream_task = None
+        self._keep_alive_task = None
+
+    def get_balance(self, asset: str) -> Optional[Balance]:
+        return self.balances.get(asset.upper())
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """
+        Gets an open order by its id
+        """
+        return self.orders.get(order_id)
+
+    def get_order_by_client_id(self, client_order_id: str) -> Optional[Order]:
+        """
+        Gets an open order by its client order id
+        """
+        return self.orders_by_client_id.get(client_order_id)
+
+    def get_open_orders(self, symbol: str = None) -> List[Order]:
+        """
+        Gets the open orders of a symbol, or of all symbols
+        """
+        if symbol is None:
+            return list(self.orders.values())
+        return list(self.orders_by_symbol.get(symbol.upper(), {}).values())
+
+    async def start(self) -> None:
+        """
+        Creates a listen key, subscribes the user data stream, and returns once the state is seeded.
+        The stream, and the keep alive of the listen key, run in the background until :meth:`stop`.
+
+        Failed seeding is retried with the backoff of the reconnect policy, unless the exchange
+        rejected the key (status 401 or 403), in which case this fails straight away.
+        """
+        self._seeded = asyncio.Event()
+        self._error = None
+        self.listen_key = await self._create_listen_key()
+        self.stream = UserDataStream()
+        await self.stream.subscribe(self.listen_key)
+
+        policy = copy.copy(self.reconnect) if self.reconnect is not None else ReconnectPolicy()
+        on_connect = policy.on_connect
+
+        async def connected(stream):
+            await self.seed()
+            await _notify(on_connect, stream)
+        policy.on_connect = connected
+
+        self._stream_task = stream_task = asyncio.ensure_future(
+            self.stream.start(self.handle, decode='json', reconnect=policy))
+        self._keep_alive_task = asyncio.ensure_future(self._keep_alive())
+        seeded = asyncio.ensure_future(self._seeded.wait())
+        await asyncio.wait([seeded, stream_task], return_when=asyncio.FIRST_COMPLETED)
+        if self._error is not None:
+            await self.stop()
+            raise self._error
+        if not seeded.done():
+            seeded.cancel()
+            await self.stop()
+            stream_task.result()
+            raise Exception("The user data stream stopped before the account state was seeded")
+
+    async def stop(self) -> None:
+        """
+        Stops the stream, and closes the listen key
+        """
+        if self._keep_alive_task is not None:
+            self._keep_alive_task.cancel()
+            self._keep_alive_task = None
+        if self.stream is not None:
+            await self.stream.stop()
+        if self._stream_task is not None:
+            await asyncio.gather(self._stream_task, return_exceptions=True)
+            self._stream_task = None
+        if self.listen_key is not None:
+            await self.account.close_listen_key(self.listen_key)
+            self.listen_key = None
+
+    async def seed(self) -> None:
+        """
+        Replaces the state with the balances and open orders of the REST API, and then
+        applies the events received in the meantime. When it fails, the state is stale,
+        ``is_seeded`` stays false and the events are buffered, until seeding succeeds
+        """
+        self.is_seeded = False
+        status, account = await self.account.get_account_information()
+        if status != 200:
+            self._fail(status, "Failed to get the account information, status {}: {}".format(status, account))
+        status, open_orders = await self.account.open_orders()
+        if status != 200:
+            self._fail(status, "Failed to get the open orders, status {}: {}".format(status, open_orders))
+
+        self.update_time = update_time = account.get('updateTime', 0)
+        self.balances = {item['asset']: Balance(item['asset'], float(item['free']), float(item['locked']),
+            update_time) for item in account['balances']}
+        self.orders = {}
+        self.orders_by_client_id = {}
+        self.orders_by_symbol = {}
+        for item in open_orders:
+            self._put_order(Order.from_rest(item))
+        self._apply_pending()
+        if self._seeded is not None:
+            self._seeded.set()
+
+    def _fail(self, status: int, message: str) -> None:
+        exception = Exception(message)
+        if status in FATAL_STATUSES:
+            self._error = exception
+            if self._seeded is not None:
+                self._seeded.set()
+        raise exception
+
+    async def handle(self, event: dict) -> None:
+        """
+        Applies an event of the user data stream
+        """
+        if not self.is_seeded:
+            self._pending.append(event)
+            return
+        self._apply(event)
+        if event.get('e') == 'listenKeyExpired':
+            await self._renew()
+        if self.on_event is not None:
+            await _notify(self.on_event, event)
+
+    def _apply_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        self.is_seeded = True
+        for event in pending:
+            self._apply(event)
+        for event in pending:
+            if event.get('e') == 'listenKeyExpired':
+                asyncio.ensure_future(self._renew())
+
+    def _apply(self, event: dict) -> None:
+        kind = event.get('e')
+        if kind == 'executionReport':
+            self._apply_execution_report(event)
+        elif kind == 'outboundAccountPosition':
+            update_time = event['u']
+            balances = self.balances
+            for item in event['B']:
+                balance = balances.get(item['a'])
+                if balance is None:
+                    balances[item['a']] = Balance(item['a'], float(item['f']), float(item['l']), update_time)
+                elif update_time >= balance.update_time:
+                    balance.free = float(item['f'])
+                    balance.locked = float(item['l'])
+                    balance.update_time = update_time
+        elif kind == 'balanceUpdate':
+            balance = self.balances.get(event['a'])
+            if balance is None:
+                self.balances[event['a']] = Balance(event['a'], float(event['d']), 0.0, event['T'])
+            elif event['T'] > balance.update_time:
+                balance.free += float(event['d'])
+                balance.update_time = event['T']
+
+    def _apply_execution_report(self, event: dict) -> None:
+        order = self.orders.get(event['i'])
+        if order is not None and event['T'] < order.update_time:
+            return
+        updated = Order.from_event(event)
+        if order is not None:
+            self._remove_order(order)
+        if updated.is_open:
+            self._put_order(updated)
+
+    def _put_order(self, order: Order) -> None:
+        self.orders[order.order_id] = order
+        self.orders_by_client_id[order.client_order_id] = order
+        self.orders_by_symbol.setdefault(order.symbol, {})[order.order_id] = order
+
+    def _remove_order(self, order: Order) -> None:
+        self.orders.pop(order.order_id, None)
+        if self.orders_by_client_id.get(order.client_order_id) is order:
+            del self.orders_by_client_id[order.client_order_id]
+        orders = self.orders_by_symbol.get(order.symbol)
+        if orders is not None:
+            orders.pop(order.order_id, None)
+            if not orders:
+                del self.orders_by_symbol[order.symbol]
+
+    async def _create_listen_key(self) -> str:
+        status, result = await self.account.create_listen_key()
+        if status != 200:
+            raise Exception("Failed to create a listen key, status {}: {}".format(status, result))
+        return result['listenKey']
+
+    async def _renew(self) -> None:
+        """
+        Subscribes a new listen key, the state is seeded again once it is subscribed
+        """
+        self.listen_key = await self._create_listen_key()
+        self.stream.parameters.clear()
+        await self.stream.subscribe(self.listen_key)
+        await self.seed()
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(KEEP_ALIVE_INTERVAL)
+            try:
+                status, _ = await self.account.keep_alive_listen_key(self.listen_key)
+                if status != 200:
+                    await self._renew()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # try again at the next interval, the listen key is valid for 60 minutes
+                pass
@@ -0,0 +1,247 @@
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+from binance_asyncio import codec
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.intervals import interval_to_milliseconds
+
+_DAY = 24 * 60 * 60 * 1000
+# the epoch was a thursday, weekly klines open on mondays
+_WEEK_OFFSET = 4 * _DAY
+
+
+class Bar:
+    """
+    A kline/candlestick bar of an aggregated interval
+    """
+    __slots__ = ('open_time', 'close_time', 'open', 'high', 'low', 'close', 'volume', 'quote_volume',
+        'trades', 'is_closed')
+
+    def __init__(self, open_time: int, close_time: int, open: float, high: float, low: float, close: float,
+            volume: float = 0.0, quote_volume: float = 0.0, trades: int = 0, is_closed: bool = False) -> None:
+        self.open_time = open_time
+        self.close_time = close_time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.quote_volume = quote_volume
+        self.trades = trades
+        self.is_closed = is_closed
+
+    def __repr__(self) -> str:
+        fields = ", ".join("{}={!r}".format(name, getattr(self, name)) for name in self.__slots__)
+        return "Bar({})".format(fields)
+
+
+class _Interval:
+    __slots__ = ('interval', 'length', 'offset', 'history', 'current', 'completed', 'base_open_time')
+
+    def __init__(self, interval: str, history: int) -> None:
+        if interval == '1M':
+            raise Exception("Monthly klines can not be aggregated, as months vary in length")
+        self.interval = interval
+        self.length = interval_to_milliseconds(interval)
+        self.offset = _WEEK_OFFSET if interval == '1w' else 0
+        self.history = deque(maxlen=history)
+        self.current: Optional[Bar] = None
+        # the completed base bars of the current bar, and the open time of the base bar in progress
+        self.completed: Optional[Bar] = None
+        self.base_open_time = None
+
+    def get_open_time(self, time: int) -> int:
+        return time - (time - self.offset) % self.length
+
+
+class KlineAggregator:
+    """
+    Maintains klines of any number of intervals locally, from a single base stream. Either
+    from the updates of a 1m :class:`KlineStream`, or from the ticks of a :class:`TradeStream`
+    or :class:`AggregateTradeStream`, but not both.
+
+    Every update costs constant time per interval, and the closed bars of each interval are
+    kept in a ring buffer of ``history`` bars. Use :meth:`seed_from` to warm the history up.
+
+    .. code-block::
+
+        aggregator = KlineAggregator('btcusdt', ['5m', '15m', '1h', '4h'])
+        await aggregator.seed_from(market_data)
+        stream = KlineStream()
+        await stream.subscribe('btcusdt', '1m')
+        await stream.start(aggregator.handle)
+
+    :param symbol: The symbol of the pair
+    :param intervals: The intervals to maintain
+    :param history: The number of closed bars kept per interval
+    :param on_close: Optional callable, called with the interval and the bar when a bar closes
+    :type symbol: string
+    :type intervals: list
+    :type history: int
+    :type on_close: Callable
+    """
+    def __init__(self, symbol: str, intervals: Iterable[str] = ('5m', '15m', '1h', '4h'), history: int = 500,
+            on_close: Callable = None) -> None:
+        self.symbol = symbol.upper()
+        self.history = history
+        self.on_close = on_close
+        self.intervals: Dict[str, _Interval] = {interval: _Interval(interval, history) for interval in intervals}
+
+    def bars(self, interval: str) -> List[Bar]:
+        """
+        :return: the closed bars of an interval, oldest first, followed by the bar in progress
+        """
+        state = self.intervals[interval]
+        bars = list(state.history)
+        if state.current is not None:
+            bars.append(state.current)
+        return bars
+
+    def current(self, interval: str) -> Optional[Bar]:
+        """
+        :return: the bar in progress of an interval
+        """
+        return self.intervals[interval].current
+
+    async def handle(self, message) -> None:
+        """
+        Handler for the messages of a 1m :class:`KlineStream`, a :class:`TradeStream`
+        or an :class:`AggregateTradeStream`. Raw, decoded or typed
+        """
+        if isinstance(message, (str, bytes)):
+            message = codec.loads(message)
+        if isinstance(message, dict):
+            if 'k' in message:
+                kline = message['k']
+                self.update_kline(kline['t'], kline['T'], float(kline['o']), float(kline['h']), float(kline['l']),
+                    float(kline['c']), float(kline['v']), float(kline['q']), kline['n'], kline['x'])
+            else:
+                self.update_trade(float(message['p']), float(message['q']), message['T'])
+        elif hasattr(message, 'open_time'):
+            self.update_kline(message.open_time, message.close_time, message.open, message.high, message.low,
+                message.close, message.volume, message.quote_volume, message.trades, message.is_closed)
+        else:
+            self.update_trade(message.price, message.quantity, message.time)
+
+    def update_kline(self, open_time: int, close_time: int, open: float, high: float, low: float, close: float,
+            volume: float, quote_volume: float, trades: int, is_closed: bool) -> None:
+        """
+        Applies an update of a base kline, which can be partial or closed
+        """
+        for state in self.intervals.values():
+            bar_open_time = state.get_open_time(open_time)
+            if self._is_stale(state, bar_open_time):
+                continue
+            if state.current is not None and state.current.open_time != bar_open_time:
+                self._close(state)
+            if state.current is None:
+                state.current = Bar(bar_open_time, bar_open_time + state.length - 1, open, high, low, close)
+                state.completed = None
+                state.base_open_time = open_time
+            elif state.base_open_time != open_time:
+                # the previous base bar is complete, as a new one has started
+                state.completed = self._copy(state.current)
+                state.base_open_time = open_time
+
+            bar = state.current
+            completed = state.completed
+            if completed is None:
+                bar.open = open
+                bar.high = high
+                bar.low = low
+                bar.volume = volume
+                bar.quote_volume = quote_volume
+                bar.trades = trades
+            else:
+                bar.high = high if high > completed.high else completed.high
+                bar.low = low if low < completed.low else completed.low
+                bar.volume = completed.volume + volume
+                bar.quote_volume = completed.quote_volume + quote_volume
+                bar.trades = completed.trades + trades
+            bar.close = close
+
+            if is_closed and close_time >= bar.close_time:
+                self._close(state)
+
+    def update_trade(self, price: float, quantity: float, time: int) -> None:
+        """
+        Applies a trade
+        """
+        for state in self.intervals.values():
+            bar_open_time = state.get_open_time(time)
+            if self._is_stale(state, bar_open_time):
+                continue
+            bar = state.current
+            if bar is not None and bar.open_time != bar_open_time:
+                self._close(state)
+                bar = None
+            if bar is None:
+                state.current = Bar(bar_open_time, bar_open_time + state.length - 1, price, price, price, price,
+                    quantity, price * quantity, 1)
+                continue
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += quantity
+            bar.quote_volume += price * quantity
+            bar.trades += 1
+
+    def seed(self, interval: str, klines: List[list]) -> None:
+        """
+        Adds closed klines, as returned by :meth:`MarketDataEndpoints.get_klines`, to the history of an interval
+        """
+        state = self.intervals[interval]
+        now = int(time.time() * 1000)
+        for kline in klines:
+            if kline[6] >= now or (state.history and kline[0] <= state.history[-1].open_time):
+                continue
+            state.history.append(Bar(kline[0], kline[6], float(kline[1]), float(kline[2]), float(kline[3]),
+                float(kline[4]), float(kline[5]), float(kline[7]), kline[8], True))
+
+    def seed_base(self, klines: List[list]) -> None:
+        """
+        Applies 1m klines, as returned by :meth:`MarketDataEndpoints.get_klines`, as base kline updates
+        """
+        now = int(time.time() * 1000)
+        for kline in klines:
+            self.update_kline(kline[0], kline[6], float(kline[1]), float(kline[2]), float(kline[3]),
+                float(kline[4]), float(kline[5]), float(kline[7]), kline[8], kline[6] < now)
+
+    async def seed_from(self, market_data: MarketDataEndpoints) -> None:
+        """
+        Seeds the history of every interval, and the bars in progress, from the REST API.
+        Seed before the stream is started, so the bars in progress do not miss any updates
+        """
+        now = int(time.time() * 1000)
+        start = now
+        for interval, state in self.intervals.items():
+            status, klines = await market_data.get_klines(self.symbol, interval, limit=min(self.history + 1, 1000))
+            if status != 200:
+                raise Exception("Failed to get klines, status {}: {}".format(status, klines))
+            self.seed(interval, klines)
+            start = min(start, state.get_open_time(now))
+        # the bars in progress are rebuilt from the 1m klines since they opened
+        self.seed_base([kline async for kline in market_data.iter_klines(self.symbol, '1m', start, now)])
+
+    def _close(self, state: _Interval) -> None:
+        bar = state.current
+        bar.is_closed = True
+        state.history.append(bar)
+        state.current = None
+        state.completed = None
+        state.base_open_time = None
+        if self.on_close is not None:
+            self.on_close(state.interval, bar)
+
+    @staticmethod
+    def _is_stale(state: _Interval, bar_open_time: int) -> bool:
+        if state.current is not None:
+            return bar_open_time < state.current.open_time
+        return len(state.history) > 0 and bar_open_time <= state.history[-1].open_time
+
+    @staticmethod
+    def _copy(bar: Bar) -> Bar:
+        return Bar(bar.open_time, bar.close_time, bar.open, bar.high, bar.low, bar.close, bar.volume,
+            bar.quote_volume, bar.trades)
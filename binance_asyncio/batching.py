@@ -0,0 +1,108 @@
+import asyncio
+from typing import Dict, List
+
+# the maximum number of symbols of a batched request, by endpoint. Beyond 20 symbols,
+# the weight of the 24 hour ticker goes up
+MAX_SYMBOLS = {'ticker/24hr': 20, 'ticker/price': 100, 'ticker/bookTicker': 100}
+# the error code of a request with a symbol which does not exist
+INVALID_SYMBOL = -1121
+
+
+class TickerBatcher:
+    """
+    Collects the single symbol ticker requests of a :class:`MarketDataEndpoints` made
+    within a short window, and serves them from one multi-symbol request per endpoint,
+    which costs far less weight than a request per symbol. The callers get the same
+    results as from a single symbol request.
+
+    When a batched request fails because one of the symbols does not exist, its symbols
+    are requested one at a time, so every caller gets its own result. When it fails for
+    any other reason, for example a 429 or 418 of the rate limits, every caller gets
+    the response of the batched request, rather than making more requests.
+
+    Rather than creating one directly, pass ``batch_window`` to :class:`MarketDataEndpoints`
+
+    .. code-block::
+
+        market_data = MarketDataEndpoints(session=session, batch_window=0.005)
+        # served by a single request
+        results = await asyncio.gather(*[market_data.get_symbol_price_ticker(symbol) for symbol in symbols])
+
+    :param market_data: The client to make the requests with
+    :param window: The seconds to wait for more requests, after the first one
+    :type market_data: MarketDataEndpoints
+    :type window: float
+    """
+    def __init__(self, market_data, window: float = 0.005) -> None:
+        self.market_data = market_data
+        self.window = window
+        self.batches = 0
+        self._pending: Dict[str, Dict[str, List[asyncio.Future]]] = {}
+
+    async def get(self, endpoint: str, symbol: str):
+        """
+        Gets the ticker of a symbol, from the next batched request of the endpoint
+
+        :param endpoint: One of ``ticker/24hr``, ``ticker/price`` and ``ticker/bookTicker``
+        :param symbol: The symbol of the pair
+        :rtype: (int, dict)
+        """
+        symbol = symbol.upper()
+        loop = asyncio.get_event_loop()
+        pending = self._pending.get(endpoint)
+        if pending is None:
+            pending = self._pending[endpoint] = {}
+            loop.call_later(self.window, self._flush, endpoint)
+        future = loop.create_future()
+        pending.setdefault(symbol, []).append(future)
+        return await future
+
+    def _flush(self, endpoint: str) -> None:
+        pending = self._pending.pop(endpoint, {})
+        symbols = list(pending.keys())
+        size = MAX_SYMBOLS[endpoint]
+        for start in range(0, len(symbols), size):
+            chunk = {symbol: pending[symbol] for symbol in symbols[start:start + size]}
+            asyncio.ensure_future(self._fetch(endpoint, chunk))
+
+    async def _fetch(self, endpoint: str, chunk: Dict[str, List[asyncio.Future]]) -> None:
+        symbols = list(chunk.keys())
+        try:
+            results = {}
+            if len(symbols) > 1:
+                self.batches += 1
+                status, result = await self._get_many(endpoint, symbols)
+                if status == 200:
+                    results = {item['symbol']: (status, item) for item in result}
+                elif not _is_invalid_symbol(status, result):
+                    results = {symbol: (status, result) for symbol in symbols}
+            missing = [symbol for symbol in symbols if symbol not in results]
+            singles = await asyncio.gather(*[self._get_single(endpoint, symbol) for symbol in missing],
+                return_exceptions=True)
+            results.update(zip(missing, singles))
+        except Exception as exception:
+            results = {symbol: exception for symbol in symbols}
+
+        for symbol, futures in chunk.items():
+            result = results[symbol]
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _get_many(self, endpoint: str, symbols: List[str]):
+        if endpoint == 'ticker/24hr':
+            return await self.market_data.get_price_change_stats_tickers(symbols)
+        if endpoint == 'ticker/price':
+            return await self.market_data.get_symbol_price_tickers(symbols)
+        return await self.market_data.get_symbol_order_book_tickers(symbols)
+
+    async def _get_single(self, endpoint: str, symbol: str):
+        return await self.market_data._get(endpoint, {'symbol': symbol}, weight=2)
+
+
+def _is_invalid_symbol(status: int, result) -> bool:
+    return status == 400 and isinstance(result, dict) and result.get('code') == INVALID_SYMBOL
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+
+# the default number of seconds the responses of the market data endpoints are
+# considered fresh, endpoints which are not listed are neither cached nor coalesced
+DEFAULT_TTLS = {
+    'ticker/price': 0.5,
+    'ticker/bookTicker': 0.5,
+    'ticker/24hr': 1.0,
+    'avgPrice': 1.0,
+    'depth': 0.25,
+    'trades': 0.25,
+    'exchangeInfo': 60.0,
+}
+
+
+class ResponseCache:
+    """
+    An opt-in cache of the responses of unsigned GET requests, such as those of
+    :class:`MarketDataEndpoints`. Responses are cached per endpoint, for the number of
+    seconds configured for the endpoint, and the least recently used ones are evicted
+    once the cache is full.
+
+    Concurrent identical requests to the configured endpoints are coalesced, they
+    share one request in flight. A ttl of 0 only coalesces.
+
+    Cached results are shared by all callers, so they should not be modified.
+    Only successful responses are cached, though failed ones are shared with the
+    concurrent callers too.
+
+    .. code-block::
+
+        cache = ResponseCache({'ticker/price': 0.2, 'depth': 0.1})
+        market_data = MarketDataEndpoints(session=session, cache=cache)
+
+    :param ttls: The seconds the responses of every endpoint are fresh, by endpoint, see :data:`DEFAULT_TTLS`
+    :param max_entries: The maximum number of cached responses
+    :param clock: The function returning the current time in seconds
+    :type ttls: dict
+    :type max_entries: int
+    """
+    def __init__(self, ttls: Dict[str, float] = None, max_entries: int = 1024,
+            clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: 'OrderedDict[Tuple[str, str, str], Tuple[float, tuple]]' = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    def is_cached(self, endpoint: str) -> bool:
+        return endpoint in self.ttls
+
+    async def get(self, key: Tuple[str, str, str], fetch: Callable[[], Awaitable[tuple]]) -> tuple:
+        """
+        Gets a response from the cache, or fetches it, sharing the fetch with concurrent callers
+
+        :param key: The key of the request, the uri of the API, the endpoint and the query string
+        :param fetch: The coroutine function doing the request, returning the status and result
+        :rtype: (int, object)
+        """
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del entries[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        # the request runs as a task of its own, so cancelling one of the callers does not fail the others
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._store(key, done))
+        return await asyncio.shield(task)
+
+    def _store(self, key: Tuple[str, str, str], task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        response = task.result()
+        ttl = self.ttls.get(key[1], 0)
+        if ttl <= 0 or response[0] != 200:
+            return
+        entries = self._entries
+        entries[key] = (self.clock() + ttl, response)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str = None) -> None:
+        """
+        Drops the cached responses, of a single endpoint, or all of them
+        """
+        if endpoint is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[1] == endpoint]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
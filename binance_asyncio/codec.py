@@ -0,0 +1,66 @@
+"""
+The JSON codec used to decode REST responses and stream messages, and to encode
+requests. The fastest installed codec is used by default, in the order orjson, msgspec
+and the standard library. It can be changed with :func:`set_codec`, for example
+
+.. code-block::
+
+    from binance_asyncio import codec
+    codec.set_codec('json')
+
+Always use the codec through the module, i.e. ``codec.loads(...)``, as the functions
+are replaced when the codec is changed.
+"""
+import json
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'))
+
+
+CODECS: Dict[str, Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], str]]] = {
+    'json': (json.loads, _json_dumps),
+}
+
+if orjson is not None:
+    CODECS['orjson'] = (orjson.loads, lambda value: orjson.dumps(value).decode())
+
+if msgspec is not None:
+    _msgspec_decoder = msgspec.json.Decoder()
+    _msgspec_encoder = msgspec.json.Encoder()
+    CODECS['msgspec'] = (_msgspec_decoder.decode, lambda value: _msgspec_encoder.encode(value).decode())
+
+
+name = 'json'
+loads, dumps = CODECS['json']
+
+
+def set_codec(codec: str) -> None:
+    """
+    Selects the JSON codec
+
+    :param codec: The name of the codec, one of "orjson", "msgspec" or "json"
+    :type codec: string
+    """
+    global name, loads, dumps
+    if codec not in CODECS:
+        raise Exception("Codec {} is not available, choose one of {}".format(codec, ", ".join(CODECS)))
+    name = codec
+    loads, dumps = CODECS[codec]
+
+
+for _codec in ('orjson', 'msgspec'):
+    if _codec in CODECS:
+        set_codec(_codec)
+        break
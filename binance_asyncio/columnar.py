@@ -0,0 +1,185 @@
+"""
+Decoding of kline, trade and depth payloads into typed NumPy columns.
+
+NumPy is an optional dependency, install it with ``pip install binance-asyncio[numpy]``.
+Prices and quantities are decoded to float64, or, when a ``scale`` is given, to int64
+fixed point values, i.e. ``round(value * scale)``. They are scaled as float64, and those too
+large for that to be exact are scaled from their decimal strings, so the fixed point values are
+exact for decimals with no more digits than the scale.
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Dict, Iterable, List, Union
+from binance_asyncio import codec
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# the magnitude below which scaled float64 values round to the exact fixed point value
+_EXACT = 2.0 ** 51
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for columnar results, install it with pip install binance-asyncio[numpy]")
+
+
+def _integers(column) -> 'np.ndarray':
+    return np.array(column, dtype=np.int64)
+
+
+def _fixed(value, scale: int) -> int:
+    return int((Decimal(str(value)) * scale).to_integral_value(ROUND_HALF_EVEN))
+
+
+def _decimals(column, scale: int = None) -> 'np.ndarray':
+    values = np.array(column, dtype=np.float64)
+    if scale is None:
+        return values
+    scaled = values * scale
+    # below 2**51 the error of the float64 is well within half a unit, so rounding it is exact
+    inexact = ~(np.abs(scaled) < _EXACT)
+    result = np.rint(np.where(inexact, 0.0, scaled)).astype(np.int64)
+    for index in np.flatnonzero(inexact):
+        result[index] = _fixed(column[index], scale)
+    return result
+
+
+def _flags(column) -> 'np.ndarray':
+    return np.array(column, dtype=np.bool_)
+
+
+def _events(messages: Iterable[Union[str, bytes, dict]]) -> List[dict]:
+    return [codec.loads(message) if isinstance(message, (str, bytes)) else message for message in messages]
+
+
+def decode_klines(klines: List[list], scale: int = None) -> Dict[str, 'np.ndarray']:
+    """
+    Decodes the response of :meth:`MarketDataEndpoints.get_klines` into columns
+
+    :param klines: The klines, as returned by the REST API
+    :param scale: Optional fixed point scale of prices and volumes, for example 10**8
+    :rtype: dict
+    :return: a dict with the columns ``open_time``, ``open``, ``high``, ``low``, ``close``,
+        ``volume``, ``close_time``, ``quote_volume``, ``trades``, ``taker_buy_base_volume``
+        and ``taker_buy_quote_volume``
+    """
+    _require_numpy()
+    columns = list(zip(*klines)) if klines else [()] * 11
+    return {
+        'open_time': _integers(columns[0]),
+        'open': _decimals(columns[1], scale),
+        'high': _decimals(columns[2], scale),
+        'low': _decimals(columns[3], scale),
+        'close': _decimals(columns[4], scale),
+        'volume': _decimals(columns[5], scale),
+        'close_time': _integers(columns[6]),
+        'quote_volume': _decimals(columns[7], scale),
+        'trades': _integers(columns[8]),
+        'taker_buy_base_volume': _decimals(columns[9], scale),
+        'taker_buy_quote_volume': _decimals(columns[10], scale),
+    }
+
+
+def decode_aggregated_trades(trades: List[dict], scale: int = None) -> Dict[str, 'np.ndarray']:
+    """
+    Decodes the response of :meth:`MarketDataEndpoints.get_aggregated_trades` into columns
+
+    :param trades: The aggregated trades, as returned by the REST API
+    :param scale: Optional fixed point scale of prices and quantities, for example 10**8
+    :rtype: dict
+    :return: a dict with the columns ``id``, ``price``, ``quantity``, ``first_id``,
+        ``last_id``, ``time``, ``is_buyer_maker`` and ``is_best_match``
+    """
+    _require_numpy()
+    return {
+        'id': _integers([trade['a'] for trade in trades]),
+        'price': _decimals([trade['p'] for trade in trades], scale),
+        'quantity': _decimals([trade['q'] for trade in trades], scale),
+        'first_id': _integers([trade['f'] for trade in trades]),
+        'last_id': _integers([trade['l'] for trade in trades]),
+        'time': _integers([trade['T'] for trade in trades]),
+        'is_buyer_maker': _flags([trade['m'] for trade in trades]),
+        'is_best_match': _flags([trade['M'] for trade in trades]),
+    }
+
+
+def decode_orderbook(orderbook: dict, scale: int = None) -> Dict[str, 'np.ndarray']:
+    """
+    Decodes the response of :meth:`MarketDataEndpoints.get_orderbook` into columns
+
+    :param orderbook: The order book, as returned by the REST API
+    :param scale: Optional fixed point scale of prices and quantities, for example 10**8
+    :rtype: dict
+    :return: a dict with the ``last_update_id``, and the columns ``bid_price``,
+        ``bid_quantity``, ``ask_price`` and ``ask_quantity``
+    """
+    _require_numpy()
+    bids = list(zip(*orderbook['bids'])) if orderbook['bids'] else [(), ()]
+    asks = list(zip(*orderbook['asks'])) if orderbook['asks'] else [(), ()]
+    return {
+        'last_update_id': orderbook['lastUpdateId'],
+        'bid_price': _decimals(bids[0], scale),
+        'bid_quantity': _decimals(bids[1], scale),
+        'ask_price': _decimals(asks[0], scale),
+        'ask_quantity': _decimals(asks[1], scale),
+    }
+
+
+def decode_kline_events(messages: Iterable[Union[str, bytes, dict]], scale: int = None) -> Dict[str, 'np.ndarray']:
+    """
+    Decodes a batch of :class:`KlineStream` messages into columns
+
+    :param messages: The messages, either raw or already decoded
+    :param scale: Optional fixed point scale of prices and volumes, for example 10**8
+    :rtype: dict
+    :return: a dict with the columns ``event_time``, ``symbol``, ``open_time``, ``close_time``,
+        ``open``, ``high``, ``low``, ``close``, ``volume``, ``quote_volume``, ``trades``,
+        ``taker_buy_base_volume``, ``taker_buy_quote_volume`` and ``is_closed``
+    """
+    _require_numpy()
+    events = _events(messages)
+    klines = [event['k'] for event in events]
+    return {
+        'event_time': _integers([event['E'] for event in events]),
+        'symbol': np.array([event['s'] for event in events], dtype=np.str_),
+        'open_time': _integers([kline['t'] for kline in klines]),
+        'close_time': _integers([kline['T'] for kline in klines]),
+        'open': _decimals([kline['o'] for kline in klines], scale),
+        'high': _decimals([kline['h'] for kline in klines], scale),
+        'low': _decimals([kline['l'] for kline in klines], scale),
+        'close': _decimals([kline['c'] for kline in klines], scale),
+        'volume': _decimals([kline['v'] for kline in klines], scale),
+        'quote_volume': _decimals([kline['q'] for kline in klines], scale),
+        'trades': _integers([kline['n'] for kline in klines]),
+        'taker_buy_base_volume': _decimals([kline['V'] for kline in klines], scale),
+        'taker_buy_quote_volume': _decimals([kline['Q'] for kline in klines], scale),
+        'is_closed': _flags([kline['x'] for kline in klines]),
+    }
+
+
+def decode_aggregate_trade_events(messages: Iterable[Union[str, bytes, dict]], scale: int = None) -> Dict[str, 'np.ndarray']:
+    """
+    Decodes a batch of :class:`AggregateTradeStream` messages into columns
+
+    :param messages: The messages, either raw or already decoded
+    :param scale: Optional fixed point scale of prices and quantities, for example 10**8
+    :rtype: dict
+    :return: a dict with the columns ``event_time``, ``symbol``, ``id``, ``price``, ``quantity``,
+        ``first_id``, ``last_id``, ``time`` and ``is_buyer_maker``
+    """
+    _require_numpy()
+    events = _events(messages)
+    return {
+        'event_time': _integers([event['E'] for event in events]),
+        'symbol': np.array([event['s'] for event in events], dtype=np.str_),
+        'id': _integers([event['a'] for event in events]),
+        'price': _decimals([event['p'] for event in events], scale),
+        'quantity': _decimals([event['q'] for event in events], scale),
+        'first_id': _integers([event['f'] for event in events]),
+        'last_id': _integers([event['l'] for event in events]),
+        'time': _integers([event['T'] for event in events]),
+        'is_buyer_maker': _flags([event['m'] for event in events]),
+    }
@@ -0,0 +1,147 @@
+import asyncio
+import itertools
+from collections import deque
+from typing import Dict, List
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.ratelimit import Priority, request_priority
+from binance_asyncio.store import ColumnStore, np
+
+# the maximum number of aggregate trades of a request
+PAGE_SIZE = 1000
+
+
+class AggregateTradeDownloader:
+    """
+    Downloads the aggregate trades of a symbol into a :class:`ColumnStore`, keyed by the
+    aggregate trade id.
+
+    The ids to download are split into pages of 1000, and up to ``concurrency`` pages are
+    fetched at once, with the rate limiter priority ``priority``, so a download stays within
+    the request weight budget and yields to more urgent requests. The pages are written in
+    order, as segments of ``segment_rows`` rows, along with the id to continue from, so an
+    interrupted download resumes where it stopped. Running it again later downloads only
+    the trades since the previous run.
+
+    .. code-block::
+
+        downloader = AggregateTradeDownloader(market_data, 'BTCUSDT', 'data/btcusdt-aggtrades')
+        await downloader.run(start_time='365 days ago')
+        columns = downloader.store.read(['time', 'price', 'quantity'])
+
+    :param market_data: The client to make the requests with
+    :param symbol: The symbol of the pair
+    :param directory: The directory of the store
+    :param concurrency: The number of requests in flight at once
+    :param segment_rows: The number of rows of a segment, and so of the checkpoints
+    :param scale: Optional fixed point scale of prices and quantities, see :mod:`binance_asyncio.columnar`
+    :param priority: The rate limiter priority of the requests
+    :type market_data: MarketDataEndpoints
+    :type symbol: string
+    :type directory: string
+    :type concurrency: int
+    :type segment_rows: int
+    :type scale: int
+    """
+    def __init__(self, market_data: MarketDataEndpoints, symbol: str, directory: str, concurrency: int = 4,
+            segment_rows: int = 1_000_000, scale: int = None, priority: Priority = Priority.BACKFILL) -> None:
+        self.market_data = market_data
+        self.symbol = symbol.upper()
+        self.concurrency = concurrency
+        self.segment_rows = segment_rows
+        self.scale = scale
+        self.priority = priority
+        self.store = ColumnStore(directory, key='id')
+        state = self.store.state
+        if state.get('symbol', self.symbol) != self.symbol or state.get('scale', scale) != scale:
+            raise Exception("The store {} holds {} with scale {}, rather than {} with scale {}".format(
+                directory, state.get('symbol'), state.get('scale'), self.symbol, scale))
+
+    @property
+    def next_id(self) -> int:
+        """
+        The id of the next aggregate trade to download, or None before the first run
+        """
+        return self.store.state.get('next_id')
+
+    async def run(self, start_id: int = None, start_time=None, end_id: int = None) -> int:
+        """
+        Downloads the aggregate trades from the checkpoint of the previous run, or, on the
+        first run, from ``start_id``, the first trade at ``start_time``, or the first trade
+        of the symbol, until ``end_id`` or the latest trade.
+
+        :param start_id: The id of the first aggregate trade, on the first run
+        :param start_time: The time of the first aggregate trade, on the first run, as epoch milliseconds or for example '30 days ago'
+        :param end_id: The id of the last aggregate trade, inclusive. It defaults to the latest one
+        :type start_id: int
+        :type end_id: int
+        :rtype: int
+        :return: the number of aggregate trades written
+        """
+        self.store.repair()
+        start = self.next_id
+        if start is None:
+            if start_id is not None:
+                start = start_id
+            elif start_time is not None:
+                start = await self._get_id(start_time=start_time)
+            else:
+                start = 0
+        end = end_id if end_id is not None else await self._get_id()
+        if start is None or end is None or start > end:
+            return 0
+
+        def fetch(page):
+            with request_priority(self.priority):
+                return asyncio.ensure_future(self.market_data.get_aggregated_trades(self.symbol, from_id=page,
+                    limit=PAGE_SIZE, columnar=True, scale=self.scale))
+
+        pages = iter(range(start, end + 1, PAGE_SIZE))
+        pending = deque((page, fetch(page)) for page in itertools.islice(pages, self.concurrency))
+        buffer: List[Dict[str, 'np.ndarray']] = []
+        buffered = written = 0
+        next_id = start
+        try:
+            while pending:
+                page, task = pending.popleft()
+                status, columns = await task
+                if status != 200:
+                    raise Exception("Failed to get aggregate trades, status {}: {}".format(status, columns))
+                following = next(pages, None)
+                if following is not None:
+                    pending.append((following, fetch(following)))
+
+                last = min(page + PAGE_SIZE - 1, end)
+                ids = columns['id']
+                if len(ids) and ids[-1] > last:
+                    columns = {column: values[ids <= last] for column, values in columns.items()}
+                buffer.append(columns)
+                buffered += len(columns['id'])
+                next_id = last + 1
+                if buffered >= self.segment_rows:
+                    written += self._flush(buffer, next_id)
+                    buffer, buffered = [], 0
+        finally:
+            for _, task in pending:
+                task.cancel()
+            # the pages are consumed in order, so the buffer always continues the store
+            written += self._flush(buffer, next_id)
+        return written
+
+    def _flush(self, buffer: List[Dict[str, 'np.ndarray']], next_id: int) -> int:
+        state = {'symbol': self.symbol, 'scale': self.scale, 'next_id': next_id}
+        if not buffer:
+            if self.store.state.get('next_id') != next_id:
+                self.store.save_state(state)
+            return 0
+        columns = {column: np.concatenate([part[column] for part in buffer]) for column in buffer[0]}
+        self.store.append(columns, state)
+        return len(columns['id'])
+
+    async def _get_id(self, start_time=None) -> int:
+        """
+        Gets the id of the first aggregate trade from ``start_time``, or of the latest one
+        """
+        status, trades = await self.market_data.get_aggregated_trades(self.symbol, start_time=start_time, limit=1)
+        if status != 200:
+            raise Exception("Failed to get aggregate trades, status {}: {}".format(status, trades))
+        return trades[-1]['a'] if trades else None
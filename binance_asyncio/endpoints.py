@@ -1,57 +1,160 @@
-from binance_asyncio.requests import Request, RequestBuilder
+from binance_asyncio import codec
+from binance_asyncio.requests import Request, RequestBuilder, parse_time
+from binance_asyncio.intervals import interval_to_milliseconds
+from binance_asyncio.batching import TickerBatcher
+from binance_asyncio.cache import ResponseCache
+from binance_asyncio.columnar import decode_aggregated_trades, decode_klines, decode_orderbook
+from binance_asyncio.instrumentation import Instrumentation, RequestTimings
+from binance_asyncio.session import HttpSession
+from binance_asyncio.signing import Signer, encode_parameters
+from binance_asyncio.ratelimit import Priority, RateLimiter, orderbook_weight, request_priority, ticker_weight
+from collections import deque
+from typing import AsyncIterator, Iterable
+import asyncio
+import itertools
 import aiohttp
 import time
-import hmac
-import hashlib
-from urllib.parse import urlencode
+from yarl import URL
 
 class BaseClient:
     uri: str = "https://api.binance.com/api/v3"
 
-    def __init__(self, api_key, secret_key = None, uri=None) -> None:
+    def __init__(self, api_key, secret_key = None, uri=None, session: HttpSession = None,
+            cache: ResponseCache = None) -> None:
         self.headers = {'content-type': 'application/x-www-form-urlencoded'}
         if api_key is not None:
             self.headers['X-MBX-APIKEY'] = api_key
         if uri is not None:
             self.uri = uri
         self.secret_key = secret_key
+        self.signer = Signer(secret_key) if secret_key else None
+        self.session = session
+        self.cache = cache
+        self._owns_session = False
 
-    async def _get(self, endpoint: str, parameters: dict = dict(), signed=False):
-        async with aiohttp.ClientSession() as session:
-            if signed:
-                parameters['signature'] = self.get_signature(parameters)
-
-            query_string = urlencode(parameters)
-            location = '{}/{}?{}'.format(self.uri, endpoint, query_string)
-            async with session.get(location, headers=self.headers) as response:
-                return response.status, await response.json()
-
-    async def _delete(self, endpoint: str, parameters: dict = dict(), signed=False):
-        async with aiohttp.ClientSession() as session:
-            if signed:
-                parameters['signature'] = self.get_signature(parameters)
-
-            query_string = urlencode(parameters)
-            location = '{}/{}?{}'.format(self.uri, endpoint, query_string)
-            async with session.delete(location, headers=self.headers) as response:
-                return response.status, await response.json()            
-    
-    async def _post(self, endpoint: str, parameters: dict = dict(), signed=False):
-        async with aiohttp.ClientSession() as session:
-            if signed:
-                parameters['signature'] = self.get_signature(parameters)
+    async def open(self):
+        """
+        Opens the pooled HTTP session used by this client. If no session was
+        provided when the client was created, the client creates (and owns) one.
+        """
+        if self.session is None:
+            self.session = HttpSession()
+            self._owns_session = True
+        await self.session.open()
+        return self
+
+    async def close(self) -> None:
+        """
+        Closes the pooled HTTP session, if it is owned by this client. Sessions 
+        shared between clients must be closed by whoever created them.
+        """
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
 
-            query_string = urlencode(parameters)
-            location = '{}/{}'.format(self.uri, endpoint)
-            async with session.post(location, headers=self.headers, data=str.encode(query_string)) as response:
-                return response.status, await response.json()
+    async def warm_up(self, connections: int = 1) -> None:
+        """
+        Pre-establishes connections to the API host, by pinging it.
 
-    def get_signature(self, parameters):
-        request = str.encode(urlencode(parameters))
-        if self.secret_key:
-            return hmac.new(str.encode(self.secret_key), request, hashlib.sha256).hexdigest()
+        :param connections: The number of connections to open
+        :type connections: int
+        """
+        await self.open()
+        await self.session.warm_up('{}/ping'.format(self.uri), connections)
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _get(self, endpoint: str, parameters: dict = None, signed=False, **limits):
+        cache = self.cache
+        if cache is not None and not signed and cache.is_cached(endpoint):
+            key = (self.uri, endpoint, encode_parameters(parameters) if parameters else '')
+            return await cache.get(key, lambda: self._request('GET', endpoint, parameters, signed, **limits))
+        return await self._request('GET', endpoint, parameters, signed, **limits)
+
+    async def _delete(self, endpoint: str, parameters: dict = None, signed=False, **limits):
+        return await self._request('DELETE', endpoint, parameters, signed, **limits)
+    
+    async def _post(self, endpoint: str, parameters: dict = None, signed=False, **limits):
+        return await self._request('POST', endpoint, parameters, signed, **limits)
+
+    async def _put(self, endpoint: str, parameters: dict = None, signed=False, **limits):
+        return await self._request('PUT', endpoint, parameters, signed, **limits)
+
+    async def _request(self, method: str, endpoint: str, parameters: dict = None, signed=False,
+            weight=1, orders=0, priority: Priority = None):
+        parameters = dict() if parameters is None else parameters
+        limiter = self.session.rate_limiter if self.session is not None else None
+        if limiter is not None:
+            await limiter.acquire(weight, priority, orders)
+            if signed and 'timestamp' in parameters:
+                # the request may have been queued, so the timestamp is refreshed
+                parameters['timestamp'] = int(round(time.time() * 1000))
+
+        # the query string is encoded once, and the exact same bytes are signed and sent
+        query_string = encode_parameters(parameters)
+        if signed:
+            signature = 'signature={}'.format(self._sign(query_string.encode()))
+            query_string = '{}&{}'.format(query_string, signature) if query_string else signature
+
+        if method == 'POST':
+            location = URL('{}/{}'.format(self.uri, endpoint), encoded=True)
+            data = query_string.encode()
         else:
+            location = URL('{}/{}?{}'.format(self.uri, endpoint, query_string), encoded=True)
+            data = None
+
+        if self.session is None:
+            async with aiohttp.ClientSession() as session:
+                return await self._send(session, method, location, data, limiter)
+        instrumentation = self.session.instrumentation
+        if instrumentation is not None:
+            return await self._send_instrumented(await self.session.get_session(), method, location, data,
+                limiter, endpoint, weight, instrumentation)
+        return await self._send(await self.session.get_session(), method, location, data, limiter)
+
+    async def _send(self, session: aiohttp.ClientSession, method: str, location: URL, data: bytes,
+            limiter: RateLimiter = None):
+        async with session.request(method, location, headers=self.headers, data=data) as response:
+            if limiter is not None:
+                limiter.update(response.status, response.headers)
+            body = await response.read()
+            return response.status, codec.loads(body) if body else None
+
+    async def _send_instrumented(self, session: aiohttp.ClientSession, method: str, location: URL, data: bytes,
+            limiter: RateLimiter, endpoint: str, weight: int, instrumentation: Instrumentation):
+        timings = RequestTimings()
+        try:
+            async with session.request(method, location, headers=self.headers, data=data,
+                    trace_request_ctx=timings) as response:
+                headers_received = time.perf_counter()
+                timings.ttfb = headers_received - timings.start - timings.connect
+                if limiter is not None:
+                    limiter.update(response.status, response.headers)
+                body = await response.read()
+                body_read = time.perf_counter()
+                timings.read = body_read - headers_received
+                result = codec.loads(body) if body else None
+                timings.decode = time.perf_counter() - body_read
+        except BaseException:
+            timings.total = time.perf_counter() - timings.start
+            instrumentation.on_request(method, endpoint, 0, weight, timings, None)
+            raise
+        timings.total = time.perf_counter() - timings.start
+        instrumentation.on_request(method, endpoint, response.status, weight, timings, response.headers)
+        return response.status, result
+
+    def get_signature(self, parameters):
+        return self._sign(encode_parameters(parameters).encode())
+
+    def _sign(self, payload: bytes) -> str:
+        if self.signer is None:
             raise Exception("Secret key required")
+        return self.signer.sign(payload)
 
 
 
@@ -60,10 +163,15 @@ class GeneralEndpoints(BaseClient):
     Class wrapping the general endpoints of the BINANCE RESTfull API
 
     :param api_key: your Binance provided API key
+    :param session: an optional pooled session, which can be shared with other clients
+    :param cache: an optional cache of the responses, which can be shared with other clients, see
+        :class:`binance_asyncio.cache.ResponseCache`
     :type api_key: string
+    :type session: HttpSession
+    :type cache: ResponseCache
     """
-    def __init__(self, api_key=None, uri=None) -> None:
-        super().__init__(api_key, uri=uri)
+    def __init__(self, api_key=None, uri=None, session: HttpSession = None, cache: ResponseCache = None) -> None:
+        super().__init__(api_key, uri=uri, session=session, cache=cache)
 
     async def get_exchange_info(self):
         """
@@ -74,7 +182,7 @@ class GeneralEndpoints(BaseClient):
             response status code and the second element is a dict representing 
             the JSON response from the server
         """
-        return await self._get('exchangeInfo')
+        return await self._get('exchangeInfo', weight=20)
 
     async def get_server_time(self):
         """
@@ -105,20 +213,34 @@ class MarketDataEndpoints(BaseClient):
     Class wrapping the Market data endpoints of the BINANCE RESTfull API
 
     :param api_key: your Binance provided API key
+    :param session: an optional pooled session, which can be shared with other clients
+    :param cache: an optional cache of the responses, which can be shared with other clients, see
+        :class:`binance_asyncio.cache.ResponseCache`
+    :param batch_window: When given, the single symbol ticker requests made within this many seconds
+        of each other are served by one multi-symbol request, see :class:`binance_asyncio.batching.TickerBatcher`
     :type api_key: string
+    :type session: HttpSession
+    :type cache: ResponseCache
+    :type batch_window: float
     """
-    def __init__(self, api_key=None, uri=None) -> None:
-        super().__init__(api_key, uri=uri)
+    def __init__(self, api_key=None, uri=None, session: HttpSession = None, cache: ResponseCache = None,
+            batch_window: float = None) -> None:
+        super().__init__(api_key, uri=uri, session=session, cache=cache)
+        self.batcher = None if batch_window is None else TickerBatcher(self, batch_window)
 
-    async def get_orderbook(self, symbol: str, limit=100):
+    async def get_orderbook(self, symbol: str, limit=100, columnar=False, scale=None):
         """
         Gets the order book.
 
         :param symbol: The symbol of the pair
         :param limit: The maximum number results wanted. It default to 100 , the  
             maximum is 5000. And valid limits are 5, 10, 20, 50, 100, 500, 1000, 5000
+        :param columnar: When true, the result is decoded into typed NumPy columns, see :func:`binance_asyncio.columnar.decode_orderbook`
+        :param scale: Optional fixed point scale used for prices and quantities in columnar mode, for example 10**8
         :type symbol: string
         :type limit: int
+        :type columnar: bool
+        :type scale: int
         :rtype: (int, dict)   
         :return: returns a tuple, where the first element is the HTTP 
             response status code and the second element is a dict representing 
@@ -142,8 +264,12 @@ class MarketDataEndpoints(BaseClient):
                     ]
                 }
         """  
-        return await self._get('depth', \
-            RequestBuilder().with_symbol(symbol).with_limit(limit).build().get_params())
+        status, result = await self._get('depth', \
+            RequestBuilder().with_symbol(symbol).with_limit(limit).build().get_params(),
+            weight=orderbook_weight(limit))
+        if columnar and status == 200:
+            result = decode_orderbook(result, scale)
+        return status, result
 
     async def get_recent_trades(self, symbol: str, limit=500):
         """
@@ -173,7 +299,8 @@ class MarketDataEndpoints(BaseClient):
                 ]
         """
         return await self._get('trades', \
-            RequestBuilder().with_symbol(symbol).with_limit(limit).build().get_params())
+            RequestBuilder().with_symbol(symbol).with_limit(limit).build().get_params(),
+            weight=25)
     
     async def get_historical_trades(self, symbol: str, limit=500, from_id=None):
         """
@@ -209,10 +336,12 @@ class MarketDataEndpoints(BaseClient):
                 .with_limit(limit)
                 .with_from_id(from_id)
                 .build()
-                .get_params())
+                .get_params(),
+            weight=25)
 
 
-    async def get_aggregated_trades(self, symbol: str, from_id=None, start_time=None, end_time=None, limit=500):
+    async def get_aggregated_trades(self, symbol: str, from_id=None, start_time=None, end_time=None, limit=500,
+            columnar=False, scale=None):
         """
         Get aggregate trades.
 
@@ -221,10 +350,14 @@ class MarketDataEndpoints(BaseClient):
         :param from_id: This is the tradeid to get aggregate trades from (inclusive), if none is provided, it just gets most recent trades
         :param start_time: The time to begin the aggregation from. For example, '10 minutes ago' or '1 second ago'
         :param end_time: The time to end the aggregation, in similar format as above
+        :param columnar: When true, the result is decoded into typed NumPy columns, see :func:`binance_asyncio.columnar.decode_aggregated_trades`
+        :param scale: Optional fixed point scale used for prices and quantities in columnar mode, for example 10**8
         :type symbol: string
         :type limit: int
         :type start_time: string
         :type end_time: string
+        :type columnar: bool
+        :type scale: int
         :rtype: (int, list) 
         :return: returns a tuple, where the first element is the HTTP 
             response status code and the second element is a list 
@@ -245,7 +378,7 @@ class MarketDataEndpoints(BaseClient):
                     }
                 ]
         """
-        return await self._get('aggTrades', 
+        status, result = await self._get('aggTrades', 
             RequestBuilder()
                 .with_symbol(symbol)
                 .with_limit(limit)
@@ -253,9 +386,14 @@ class MarketDataEndpoints(BaseClient):
                 .with_start_time(start_time)
                 .with_end_time(end_time)
                 .build()
-                .get_params())
+                .get_params(),
+            weight=2)
+        if columnar and status == 200:
+            result = decode_aggregated_trades(result, scale)
+        return status, result
 
-    async def get_klines(self, symbol: str, interval='1m', start_time=None, end_time=None, limit=500):
+    async def get_klines(self, symbol: str, interval='1m', start_time=None, end_time=None, limit=500,
+            columnar=False, scale=None):
         """
         Get kline/candlestick bars for a symbol
 
@@ -281,11 +419,15 @@ class MarketDataEndpoints(BaseClient):
         :param limit: The maximum number of klines wanted. It default to 500 , the maximum is 1000.
         :param start_time: The time to get klines from from. For example, '10 minutes ago' or '1 second ago'
         :param end_time: The time to get klines until, in similar format as above
+        :param columnar: When true, the result is decoded into typed NumPy columns, see :func:`binance_asyncio.columnar.decode_klines`
+        :param scale: Optional fixed point scale used for prices and quantities in columnar mode, for example 10**8
         :type symbol: string
         :type limit: int
         :type interval: string
         :type start_time: string
         :type end_time: string
+        :type columnar: bool
+        :type scale: int
         :rtype: (int, list) 
         :return: returns a tuple, where the first element is the HTTP 
             response status code and the second element is a list 
@@ -310,14 +452,72 @@ class MarketDataEndpoints(BaseClient):
                     ]
                 ]
         """        
-        return await self._get('klines', RequestBuilder()
+        status, result = await self._get('klines', RequestBuilder()
                 .with_symbol(symbol)
                 .with_limit(limit)
                 .with_interval(interval)
                 .with_start_time(start_time)
                 .with_end_time(end_time)
                 .build()
-                .get_params())
+                .get_params(),
+            weight=2)
+        if columnar and status == 200:
+            result = decode_klines(result, scale)
+        return status, result
+
+    async def iter_klines(self, symbol: str, interval='1m', start_time=None, end_time=None, limit=1000,
+            concurrency=4, priority: Priority = Priority.BACKFILL) -> AsyncIterator[list]:
+        """
+        Iterates over all kline/candlestick bars of a symbol in a time range, of any length.
+
+        The range is split into windows of ``limit`` bars each, and up to ``concurrency``
+        windows are fetched at once. The bars are yielded one by one, in order, and at most
+        ``concurrency`` windows are held in memory at any time.
+
+        .. code-block::
+
+            async for kline in market_data.iter_klines('btcusdt', '1m', start_time='90 days ago'):
+                print(kline)
+
+        :param symbol: The symbol of the pair
+        :param interval: The interval of the kline, see :meth:`get_klines`
+        :param start_time: The time to get klines from, as epoch milliseconds or for example '10 days ago'.
+            It defaults to the ``limit`` most recent klines until ``end_time``
+        :param end_time: The time to get klines until, in similar format as above. It defaults to now
+        :param limit: The number of klines fetched per request, the maximum is 1000
+        :param concurrency: The number of requests in flight at once
+        :param priority: The rate limiter priority of the requests
+        :type symbol: string
+        :type interval: string
+        :type limit: int
+        :type concurrency: int
+        :rtype: AsyncIterator[list]
+        :return: an async iterator over the klines, each in the format returned by :meth:`get_klines`
+        """
+        end = parse_time(end_time) if end_time is not None else int(time.time() * 1000)
+        step = interval_to_milliseconds(interval) * limit
+        start = parse_time(start_time) if start_time is not None else end - step + 1
+
+        def fetch(window_start):
+            window_end = min(window_start + step, end + 1) - 1
+            with request_priority(priority):
+                return asyncio.ensure_future(self.get_klines(symbol, interval, window_start, window_end, limit))
+
+        windows = iter(range(start, end + 1, step))
+        pending = deque(fetch(window) for window in itertools.islice(windows, concurrency))
+        try:
+            while pending:
+                status, klines = await pending.popleft()
+                if status != 200:
+                    raise Exception("Failed to get klines, status {}: {}".format(status, klines))
+                window = next(windows, None)
+                if window is not None:
+                    pending.append(fetch(window))
+                for kline in klines:
+                    yield kline
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def get_current_average(self, symbol: str):
         """
@@ -336,7 +536,8 @@ class MarketDataEndpoints(BaseClient):
                 }
         """        
         return await self._get('avgPrice',
-            RequestBuilder().with_symbol(symbol).build().get_params())
+            RequestBuilder().with_symbol(symbol).build().get_params(),
+            weight=2)
 
     async def get_price_change_stats_ticker(self, symbol: str):
         """
@@ -371,8 +572,11 @@ class MarketDataEndpoints(BaseClient):
                     "count": 76         // Trade count
                 }
         """          
+        if self.batcher is not None:
+            return await self.batcher.get('ticker/24hr', symbol)
         return await self._get('ticker/24hr', 
-            RequestBuilder().with_symbol(symbol).build().get_params())
+            RequestBuilder().with_symbol(symbol).build().get_params(),
+            weight=2)
 
     async def get_symbol_price_ticker(self, symbol: str):
         """
@@ -390,8 +594,11 @@ class MarketDataEndpoints(BaseClient):
                     "price": "4.00000200"
                 }
         """             
+        if self.batcher is not None:
+            return await self.batcher.get('ticker/price', symbol)
         return await self._get('ticker/price', 
-            RequestBuilder().with_symbol(symbol).build().get_params())
+            RequestBuilder().with_symbol(symbol).build().get_params(),
+            weight=2)
 
     async def get_symbol_order_book_ticker(self, symbol: str):
         """
@@ -412,8 +619,58 @@ class MarketDataEndpoints(BaseClient):
                     "askQty": "9.00000000"
                 }
         """           
+        if self.batcher is not None:
+            return await self.batcher.get('ticker/bookTicker', symbol)
         return await self._get('ticker/bookTicker', 
-            RequestBuilder().with_symbol(symbol).build().get_params())
+            RequestBuilder().with_symbol(symbol).build().get_params(),
+            weight=2)
+
+    async def get_price_change_stats_tickers(self, symbols: Iterable[str] = None):
+        """
+        Get the 24 hour rolling window price change statistics of several symbols, in a single request.
+        Up to 20 symbols cost the same weight as a single one, 100 symbols or all of them cost more.
+
+        :param symbols: The symbols of the pairs, or None for all symbols
+        :type symbols: list
+        :rtype: (int, list)
+        :return: returns a tuple, where the first element is the HTTP 
+            response status code and the second element a list of the statistics
+            of every symbol, as returned by :meth:`get_price_change_stats_ticker`
+        """
+        symbols = None if symbols is None else list(symbols)
+        return await self._get('ticker/24hr',
+            RequestBuilder().with_symbols(symbols).build().get_params(),
+            weight=ticker_weight(None if symbols is None else len(symbols)))
+
+    async def get_symbol_price_tickers(self, symbols: Iterable[str] = None):
+        """
+        Get the latest price of several symbols, in a single request
+
+        :param symbols: The symbols of the pairs, or None for all symbols
+        :type symbols: list
+        :rtype: (int, list)
+        :return: returns a tuple, where the first element is the HTTP 
+            response status code and the second element a list of the prices
+            of every symbol, as returned by :meth:`get_symbol_price_ticker`
+        """
+        return await self._get('ticker/price',
+            RequestBuilder().with_symbols(symbols).build().get_params(),
+            weight=4)
+
+    async def get_symbol_order_book_tickers(self, symbols: Iterable[str] = None):
+        """
+        Get the best price/qty on the order book of several symbols, in a single request
+
+        :param symbols: The symbols of the pairs, or None for all symbols
+        :type symbols: list
+        :rtype: (int, list)
+        :return: returns a tuple, where the first element is the HTTP 
+            response status code and the second element a list of the order book tickers
+            of every symbol, as returned by :meth:`get_symbol_order_book_ticker`
+        """
+        return await self._get('ticker/bookTicker',
+            RequestBuilder().with_symbols(symbols).build().get_params(),
+            weight=4)
 
 
 class AccountEndpoints(BaseClient):
@@ -423,7 +680,7 @@ class AccountEndpoints(BaseClient):
                 .with_timestamp()
                 .build()
                 .get_params(),
-            True)
+            True, weight=20)
 
     async def _create_order(self, symbol: str, side:str, order_type:str, **parameters):
         timestamp = int(round(time.time() * 1000))
@@ -437,22 +694,26 @@ class AccountEndpoints(BaseClient):
 
     async def test_order(self, symbol: str, side:str, order_type:str, **parameters):
         request = await self._create_order(symbol, side, order_type, **parameters)
-        return await self._post('order/test', request.get_params(), True)
+        return await self._post('order/test', request.get_params(), True, priority=Priority.ORDER)
 
     async def order(self, symbol: str, side:str, order_type:str, **parameters):
         request = await self._create_order(symbol, side, order_type, **parameters)
-        return await self._post('order', request.get_params(), True)
+        return await self._post('order', request.get_params(), True, orders=1, priority=Priority.ORDER)
 
     async def query_order(self, symbol, **parameters):
         request = RequestBuilder().with_symbol(symbol=symbol).with_timestamp().build()
         request.add_parameters(parameters)
-        return await self._get('order',request.get_params(),True)
+        return await self._get('order',request.get_params(),True, weight=4, priority=Priority.ORDER)
 
-    async def open_orders(self, symbol, **parameters):
-        builder = RequestBuilder().with_symbol(symbol=symbol).with_timestamp()
+    async def open_orders(self, symbol=None, **parameters):
+        builder = RequestBuilder().with_timestamp()
+        if symbol is not None:
+            builder.with_symbol(symbol=symbol)
         request = builder.build()
         request.add_parameters(parameters)
-        return await self._get('openOrders',request.get_params(),True)
+        # the open orders of all symbols cost a lot more weight
+        weight = 6 if symbol is not None else 80
+        return await self._get('openOrders',request.get_params(),True, weight=weight, priority=Priority.ORDER)
 
     async def all_orders(self, symbol, **parameters):
         builder = RequestBuilder().with_symbol(symbol=symbol).with_timestamp()
@@ -467,11 +728,39 @@ class AccountEndpoints(BaseClient):
 
         request = builder.build()
         request.add_parameters(parameters)
-        return await self._get('allOrders',request.get_params(),True)
+        return await self._get('allOrders',request.get_params(),True, weight=20)
     
 
     async def cancel_order(self, symbol, **parameters):
         request = RequestBuilder().with_symbol(symbol=symbol).with_timestamp().build()
         request.add_parameters(parameters)
-        return await self._delete('order',request.get_params(),True)
+        return await self._delete('order',request.get_params(),True, priority=Priority.ORDER)
 
+    async def create_listen_key(self):
+        """
+        Starts a user data stream, its listen key is valid for 60 minutes, unless it is kept alive.
+        Only the API key is required.
+
+        :rtype: (int, dict)
+        :return: returns a tuple, where the first element is the HTTP 
+            response status code and the second element a dict of the form
+
+            .. code-block::
+
+                {
+                    "listenKey": "pqia91ma19a5s61cv6a81va65sdf19v8a65a1a5s61cv6a81va65sdf19v8a65a1"
+                }
+        """
+        return await self._post('userDataStream', weight=2)
+
+    async def keep_alive_listen_key(self, listen_key: str):
+        """
+        Extends the validity of a listen key by 60 minutes, it should be called about every 30 minutes
+        """
+        return await self._put('userDataStream', {'listenKey': listen_key}, weight=2)
+
+    async def close_listen_key(self, listen_key: str):
+        """
+        Closes a user data stream
+        """
+        return await self._delete('userDataStream', {'listenKey': listen_key}, weight=2)
@@ -0,0 +1,196 @@
+import asyncio
+import math
+import time
+from typing import Dict, Optional
+from binance_asyncio.endpoints import GeneralEndpoints
+
+
+def _decimals(step: str) -> int:
+    """
+    The number of decimals of a step, such as "0.00100000"
+    """
+    if '.' not in step:
+        return 0
+    return len(step.rstrip('0').split('.')[1])
+
+
+class SymbolInfo:
+    """
+    The trading rules of a symbol, parsed once from the exchange info. Filters which
+    are not present are None.
+    """
+    __slots__ = ('symbol', 'status', 'base_asset', 'quote_asset', 'tick_size', 'min_price', 'max_price',
+        'step_size', 'min_quantity', 'max_quantity', 'min_notional', 'filters', 'price_decimals',
+        'quantity_decimals')
+
+    def __init__(self, data: dict) -> None:
+        self.symbol = data['symbol']
+        self.status = data['status']
+        self.base_asset = data['baseAsset']
+        self.quote_asset = data['quoteAsset']
+        self.filters = {item['filterType']: item for item in data.get('filters', [])}
+        self.tick_size = self.min_price = self.max_price = None
+        self.step_size = self.min_quantity = self.max_quantity = None
+        self.min_notional = None
+        self.price_decimals = self.quantity_decimals = None
+
+        price = self.filters.get('PRICE_FILTER')
+        if price is not None:
+            self.tick_size = float(price['tickSize'])
+            self.min_price = float(price['minPrice'])
+            self.max_price = float(price['maxPrice'])
+            self.price_decimals = _decimals(price['tickSize'])
+
+        lot_size = self.filters.get('LOT_SIZE')
+        if lot_size is not None:
+            self.step_size = float(lot_size['stepSize'])
+            self.min_quantity = float(lot_size['minQty'])
+            self.max_quantity = float(lot_size['maxQty'])
+            self.quantity_decimals = _decimals(lot_size['stepSize'])
+
+        notional = self.filters.get('MIN_NOTIONAL') or self.filters.get('NOTIONAL')
+        if notional is not None:
+            self.min_notional = float(notional['minNotional'])
+
+    @property
+    def is_trading(self) -> bool:
+        return self.status == 'TRADING'
+
+    def round_price(self, price: float) -> float:
+        """
+        Rounds a price down to the tick size of the symbol
+        """
+        if not self.tick_size:
+            return price
+        return round(math.floor(price / self.tick_size + 1e-9) * self.tick_size, self.price_decimals)
+
+    def round_quantity(self, quantity: float) -> float:
+        """
+        Rounds a quantity down to the step size of the symbol
+        """
+        if not self.step_size:
+            return quantity
+        return round(math.floor(quantity / self.step_size + 1e-9) * self.step_size, self.quantity_decimals)
+
+    def format_price(self, price: float) -> str:
+        """
+        Rounds a price down to the tick size, and formats it for an order
+        """
+        price = self.round_price(price)
+        return str(price) if self.price_decimals is None else '{:.{}f}'.format(price, self.price_decimals)
+
+    def format_quantity(self, quantity: float) -> str:
+        """
+        Rounds a quantity down to the step size, and formats it for an order
+        """
+        quantity = self.round_quantity(quantity)
+        return str(quantity) if self.quantity_decimals is None else '{:.{}f}'.format(quantity, self.quantity_decimals)
+
+    def is_notional_valid(self, price: float, quantity: float) -> bool:
+        return self.min_notional is None or price * quantity >= self.min_notional
+
+    def __repr__(self) -> str:
+        return "SymbolInfo({}, {}, tick_size={}, step_size={}, min_notional={})".format(
+            self.symbol, self.status, self.tick_size, self.step_size, self.min_notional)
+
+
+class ExchangeInfoCache:
+    """
+    A cache of the exchange info, indexed by symbol. The document is downloaded
+    and parsed once, and then refreshed when it is older than ``ttl``, or in the
+    background, every ``ttl`` seconds, once :meth:`start` has been called.
+
+    .. code-block::
+
+        exchange_info = ExchangeInfoCache(GeneralEndpoints())
+        await exchange_info.start()
+        info = exchange_info['BTCUSDT']
+        price = info.format_price(43123.456789)
+
+    :param general: The client used to download the exchange info
+    :param ttl: The number of seconds the exchange info is considered fresh
+    :type general: GeneralEndpoints
+    :type ttl: float
+    """
+    def __init__(self, general: GeneralEndpoints, ttl: float = 3600.0) -> None:
+        self.general = general
+        self.ttl = ttl
+        self.symbols: Dict[str, SymbolInfo] = {}
+        self.rate_limits = []
+        self.updated = None
+        self._lock = None
+        self._task = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.updated is None or time.monotonic() - self.updated > self.ttl
+
+    async def refresh(self) -> None:
+        """
+        Downloads and indexes the exchange info. Concurrent calls share one download
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        updated = self.updated
+        async with self._lock:
+            if self.updated != updated:
+                return
+            status, data = await self.general.get_exchange_info()
+            if status != 200:
+                raise Exception("Failed to get exchange info, status {}: {}".format(status, data))
+            self.symbols = {item['symbol']: SymbolInfo(item) for item in data['symbols']}
+            self.rate_limits = data.get('rateLimits', [])
+            self.updated = time.monotonic()
+
+    async def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """
+        Gets the trading rules of a symbol, refreshing the exchange info first, if it is stale
+
+        :param symbol: The symbol of the pair
+        :type symbol: string
+        :rtype: SymbolInfo
+        :return: the trading rules, or None if the symbol does not exist
+        """
+        if self.is_stale:
+            await self.refresh()
+        return self.symbols.get(symbol.upper())
+
+    def __getitem__(self, symbol: str) -> SymbolInfo:
+        return self.symbols[symbol.upper()]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.symbols
+
+    async def start(self) -> None:
+        """
+        Loads the exchange info, and keeps it fresh in the background
+        """
+        if self.is_stale:
+            await self.refresh()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background refresh
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = self.ttl
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+                delay = self.ttl
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # keep serving the last known exchange info, and try again shortly
+                delay = min(self.ttl, 60.0)
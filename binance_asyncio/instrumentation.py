@@ -0,0 +1,330 @@
+"""
+Hooks to measure where the time goes, in the REST clients and the streams.
+
+An :class:`Instrumentation` is passed to :class:`HttpSession`, to measure the requests
+of every client using the session, and to :meth:`BaseStream.start` or
+:meth:`StreamMultiplexer.start`, to measure the messages of the streams. When no
+instrumentation is given, nothing is measured, and the hot paths are the same as without it.
+
+:class:`MetricsCollector` keeps the measurements in memory and exports them in the
+Prometheus text format, :class:`OpenTelemetryInstrumentation` records them with
+OpenTelemetry instruments instead. Other backends can subclass :class:`Instrumentation`.
+"""
+import bisect
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import aiohttp
+
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:
+    otel_metrics = None
+
+# the default bucket bounds of the histograms, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HANDLER_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1)
+
+
+class RequestTimings:
+    """
+    The phases of a single request, in seconds. ``connect`` is 0 when a pooled
+    connection was re-used, ``ttfb`` is the time from sending the request, after
+    any connect, until the response headers arrived, ``read`` the time to read the
+    body, and ``decode`` the time to decode it.
+    """
+    __slots__ = ('start', 'connect', 'ttfb', 'read', 'decode', 'total', '_connect_start')
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.read = 0.0
+        self.decode = 0.0
+        self.total = 0.0
+        self._connect_start = None
+
+
+async def _on_connection_create_start(session, context, parameters) -> None:
+    timings = context.trace_request_ctx
+    if isinstance(timings, RequestTimings):
+        timings._connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(session, context, parameters) -> None:
+    timings = context.trace_request_ctx
+    if isinstance(timings, RequestTimings) and timings._connect_start is not None:
+        timings.connect += time.perf_counter() - timings._connect_start
+
+
+def get_trace_config() -> aiohttp.TraceConfig:
+    """
+    The aiohttp trace config measuring the time spent establishing connections,
+    into the :class:`RequestTimings` passed as ``trace_request_ctx``
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    return trace_config
+
+
+def event_time(message) -> Optional[int]:
+    """
+    The event time of a message, its ``E`` field, in milliseconds since the epoch. Works for
+    raw, decoded and typed messages, and for lists of them, using the first. Raw messages
+    are scanned for the field, rather than decoded.
+    """
+    if isinstance(message, str):
+        index = message.find('"E":')
+        return None if index < 0 else _leading_integer(message, index + 4)
+    if isinstance(message, (bytes, bytearray)):
+        index = message.find(b'"E":')
+        return None if index < 0 else _leading_integer(message.decode('ascii', 'ignore'), index + 4)
+    if isinstance(message, dict):
+        return message.get('E')
+    if isinstance(message, list):
+        return event_time(message[0]) if message else None
+    return getattr(message, 'event_time', None)
+
+
+def _leading_integer(text: str, start: int) -> Optional[int]:
+    end = start
+    length = len(text)
+    while end < length and text[end].isdigit():
+        end += 1
+    return int(text[start:end]) if end > start else None
+
+
+class Instrumentation:
+    """
+    The hooks called by the clients and streams, every hook does nothing by default
+    """
+    def on_request(self, method: str, endpoint: str, status: int, weight: int, timings: RequestTimings,
+            headers) -> None:
+        """
+        Called when a request completed
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint, for example ``ticker/price``
+        :param status: The status code of the response, 0 when the request failed
+        :param weight: The weight of the request
+        :param timings: The phases of the request
+        :param headers: The response headers, None when the request failed
+        """
+
+    def on_message(self, stream: str, received: float, event_time: Optional[int], handler_time: float) -> None:
+        """
+        Called when a message of a stream was handled
+
+        :param stream: The stream, the class name of a :class:`BaseStream`, or the
+            stream name, for example ``btcusdt@trade``, for a :class:`StreamMultiplexer`
+        :param received: The time it was received, in seconds since the epoch
+        :param event_time: The event time of the message in milliseconds since the epoch, if it has one
+        :param handler_time: The seconds the handler took
+        """
+
+
+class Histogram:
+    """
+    A histogram with fixed bucket bounds, as cumulative buckets are only computed on export,
+    recording a value is a binary search and an increment
+    """
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """
+        :return: the cumulative count of every bucket, the last bound being infinity
+        """
+        total = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def quantile(self, share: float) -> float:
+        """
+        An estimate of a quantile, the upper bound of the bucket it falls in
+        """
+        rank = share * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float('inf')
+
+
+def _labels(**labels) -> str:
+    return ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in labels.items())
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsCollector(Instrumentation):
+    """
+    Keeps the measurements in memory, and exports them in the Prometheus text format.
+
+    .. code-block::
+
+        metrics = MetricsCollector()
+        session = HttpSession(instrumentation=metrics)
+        await stream.start(handler, instrumentation=metrics)
+        ...
+        print(metrics.to_prometheus())
+
+    :param prefix: The prefix of the metric names
+    :param latency_buckets: The bucket bounds of the request phases and the event time lag, in seconds
+    :param handler_buckets: The bucket bounds of the handler time, in seconds
+    :type prefix: string
+    """
+    def __init__(self, prefix: str = 'binance', latency_buckets: Iterable[float] = LATENCY_BUCKETS,
+            handler_buckets: Iterable[float] = HANDLER_BUCKETS) -> None:
+        self.prefix = prefix
+        self.latency_buckets = tuple(latency_buckets)
+        self.handler_buckets = tuple(handler_buckets)
+        self.request_phases: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, int], int] = {}
+        self.weight: Dict[str, int] = {}
+        self.used_weight: Optional[int] = None
+        self.messages: Dict[str, int] = {}
+        self.lag: Dict[str, Histogram] = {}
+        self.handler_time: Dict[str, Histogram] = {}
+        self._rate_marks: Dict[str, Tuple[float, int]] = {}
+
+    def _histogram(self, histograms: dict, key: Hashable, bounds: tuple) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(bounds)
+        return histogram
+
+    def on_request(self, method: str, endpoint: str, status: int, weight: int, timings: RequestTimings,
+            headers) -> None:
+        phases = self.request_phases
+        bounds = self.latency_buckets
+        for phase in ('connect', 'ttfb', 'read', 'decode', 'total'):
+            self._histogram(phases, (endpoint, phase), bounds).observe(getattr(timings, phase))
+        key = (endpoint, status)
+        self.responses[key] = self.responses.get(key, 0) + 1
+        self.weight[endpoint] = self.weight.get(endpoint, 0) + weight
+        if headers is not None:
+            used_weight = headers.get('X-MBX-USED-WEIGHT-1M')
+            if used_weight is not None:
+                self.used_weight = int(used_weight)
+
+    def on_message(self, stream: str, received: float, event_time: Optional[int], handler_time: float) -> None:
+        self.messages[stream] = self.messages.get(stream, 0) + 1
+        if event_time is not None:
+            self._histogram(self.lag, stream, self.latency_buckets).observe(
+                max(0.0, received - event_time / 1000))
+        self._histogram(self.handler_time, stream, self.handler_buckets).observe(handler_time)
+
+    def rates(self) -> Dict[str, float]:
+        """
+        The messages per second of every stream, since the previous call
+        """
+        now = time.monotonic()
+        rates = {}
+        for stream, count in self.messages.items():
+            mark = self._rate_marks.get(stream)
+            if mark is not None and now > mark[0]:
+                rates[stream] = (count - mark[1]) / (now - mark[0])
+            self._rate_marks[stream] = (now, count)
+        return rates
+
+    def to_prometheus(self) -> str:
+        """
+        Exports the measurements in the Prometheus text format, which can be served
+        on a ``/metrics`` route, or written to the textfile collector of the node exporter
+        """
+        prefix = self.prefix
+        lines = []
+
+        def histograms(name: str, description: str, items, label_names):
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} histogram'.format(name))
+            for key, histogram in sorted(items, key=lambda item: item[0]):
+                values = key if isinstance(key, tuple) else (key,)
+                labels = _labels(**dict(zip(label_names, values)))
+                for bound, count in histogram.cumulative():
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, labels, _format_value(bound), count))
+                lines.append('{}_sum{{{}}} {}'.format(name, labels, repr(histogram.sum)))
+                lines.append('{}_count{{{}}} {}'.format(name, labels, histogram.count))
+
+        def counters(name: str, description: str, items, label_names, kind='counter'):
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} {}'.format(name, kind))
+            for key, value in sorted(items, key=lambda item: item[0]):
+                values = key if isinstance(key, tuple) else (key,)
+                lines.append('{}{{{}}} {}'.format(name, _labels(**dict(zip(label_names, values))), value))
+
+        histograms(prefix + '_request_duration_seconds', 'Duration of the phases of REST requests.',
+            self.request_phases.items(), ('endpoint', 'phase'))
+        counters(prefix + '_responses_total', 'REST responses by status code, 0 for failed requests.',
+            self.responses.items(), ('endpoint', 'status'))
+        counters(prefix + '_request_weight_total', 'Request weight spent.', self.weight.items(), ('endpoint',))
+        if self.used_weight is not None:
+            lines.append('# HELP {}_used_weight The used weight of the current minute, as reported by the exchange.'
+                .format(prefix))
+            lines.append('# TYPE {}_used_weight gauge'.format(prefix))
+            lines.append('{}_used_weight {}'.format(prefix, self.used_weight))
+        counters(prefix + '_stream_messages_total', 'Messages received by stream.', self.messages.items(),
+            ('stream',))
+        histograms(prefix + '_stream_lag_seconds', 'Receive time minus the event time of messages.',
+            self.lag.items(), ('stream',))
+        histograms(prefix + '_stream_handler_seconds', 'Time spent in the handler per message.',
+            self.handler_time.items(), ('stream',))
+        return '\n'.join(lines) + '\n'
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Records the measurements with OpenTelemetry instruments, exported by whichever
+    meter provider is configured. OpenTelemetry is an optional dependency, install
+    it with ``pip install opentelemetry-api``.
+
+    :param meter: The meter to create the instruments with, by default the one of the global meter provider
+    """
+    def __init__(self, meter=None) -> None:
+        if meter is None:
+            if otel_metrics is None:
+                raise ImportError("opentelemetry is required for OpenTelemetryInstrumentation, "
+                    "install it with pip install opentelemetry-api")
+            meter = otel_metrics.get_meter('binance_asyncio')
+        self.request_duration = meter.create_histogram('binance.request.duration', unit='s',
+            description='Duration of the phases of REST requests')
+        self.responses = meter.create_counter('binance.responses', description='REST responses by status code')
+        self.weight = meter.create_counter('binance.request.weight', description='Request weight spent')
+        self.messages = meter.create_counter('binance.stream.messages', description='Messages received by stream')
+        self.lag = meter.create_histogram('binance.stream.lag', unit='s',
+            description='Receive time minus the event time of messages')
+        self.handler_time = meter.create_histogram('binance.stream.handler.duration', unit='s',
+            description='Time spent in the handler per message')
+
+    def on_request(self, method: str, endpoint: str, status: int, weight: int, timings: RequestTimings,
+            headers) -> None:
+        for phase in ('connect', 'ttfb', 'read', 'decode', 'total'):
+            self.request_duration.record(getattr(timings, phase), {'endpoint': endpoint, 'phase': phase})
+        self.responses.add(1, {'endpoint': endpoint, 'status': status})
+        self.weight.add(weight, {'endpoint': endpoint})
+
+    def on_message(self, stream: str, received: float, event_time: Optional[int], handler_time: float) -> None:
+        attributes = {'stream': stream}
+        self.messages.add(1, attributes)
+        if event_time is not None:
+            self.lag.record(max(0.0, received - event_time / 1000), attributes)
+        self.handler_time.record(handler_time, attributes)
@@ -0,0 +1,34 @@
+_SECOND = 1000
+_MINUTE = 60 * _SECOND
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+INTERVAL_MILLISECONDS = {
+    '1s': _SECOND,
+    '1m': _MINUTE,
+    '3m': 3 * _MINUTE,
+    '5m': 5 * _MINUTE,
+    '15m': 15 * _MINUTE,
+    '30m': 30 * _MINUTE,
+    '1h': _HOUR,
+    '2h': 2 * _HOUR,
+    '4h': 4 * _HOUR,
+    '6h': 6 * _HOUR,
+    '8h': 8 * _HOUR,
+    '12h': 12 * _HOUR,
+    '1d': _DAY,
+    '3d': 3 * _DAY,
+    '1w': 7 * _DAY,
+    # months vary in length, this is the longest one
+    '1M': 31 * _DAY,
+}
+
+
+def interval_to_milliseconds(interval: str) -> int:
+    """
+    Gets the length of a kline interval, such as "5m" or "1h", in milliseconds
+    """
+    try:
+        return INTERVAL_MILLISECONDS[interval]
+    except KeyError:
+        raise Exception("Invalid interval {}".format(interval))
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Tuple
+from binance_asyncio.columnar import decode_klines
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.intervals import interval_to_milliseconds
+from binance_asyncio.ratelimit import Priority
+from binance_asyncio.requests import parse_time
+from binance_asyncio.store import ColumnStore, np
+
+# the number of segments of a store beyond which they are merged into one
+MAX_SEGMENTS = 32
+# the number of most recent klines returned when no start time is given
+DEFAULT_LIMIT = 1000
+
+
+class KlineStore:
+    """
+    A read-through, on-disk cache of klines, with a :class:`ColumnStore` per symbol and interval.
+
+    The store keeps track of the ranges of open times it holds. A request is answered from
+    disk, only the ranges it does not hold yet are fetched from the REST API, and stored.
+    Klines which may still change, those of the latest interval, are never stored, they are
+    fetched again by every request which includes them.
+
+    .. code-block::
+
+        klines = KlineStore(market_data, 'data/klines')
+        columns = await klines.get_klines('BTCUSDT', '1h', start_time='90 days ago')
+        print(columns['close'][-1])
+
+    :param market_data: The client to make the requests with
+    :param directory: The directory of the stores, the one of a symbol and interval is ``<directory>/<symbol>/<interval>``
+    :param concurrency: The number of requests in flight at once, when fetching a missing range
+    :param scale: Optional fixed point scale of prices and volumes, see :mod:`binance_asyncio.columnar`
+    :param priority: The rate limiter priority of the requests
+    :type market_data: MarketDataEndpoints
+    :type directory: string
+    :type concurrency: int
+    :type scale: int
+    """
+    def __init__(self, market_data: MarketDataEndpoints, directory: str, concurrency: int = 4, scale: int = None,
+            priority: Priority = Priority.BACKFILL) -> None:
+        self.market_data = market_data
+        self.directory = directory
+        self.concurrency = concurrency
+        self.scale = scale
+        self.priority = priority
+        self.fetched = 0
+        self._stores: Dict[Tuple[str, str], ColumnStore] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def get_store(self, symbol: str, interval: str) -> ColumnStore:
+        """
+        Gets the store of a symbol and interval, keyed by the open time
+        """
+        key = (symbol.upper(), interval)
+        store = self._stores.get(key)
+        if store is None:
+            store = ColumnStore(os.path.join(self.directory, key[0], interval), key='open_time')
+            if store.state.get('scale', self.scale) != self.scale:
+                raise Exception("The store of {} {} has scale {}, rather than {}".format(
+                    key[0], interval, store.state.get('scale'), self.scale))
+            self._stores[key] = store
+        return store
+
+    def get_ranges(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """
+        Gets the ranges of open times the store holds all klines of, inclusive
+        """
+        return [tuple(covered) for covered in self.get_store(symbol, interval).state.get('ranges', [])]
+
+    async def get_klines(self, symbol: str, interval: str = '1m', start_time=None, end_time=None) -> Dict[str, 'np.ndarray']:
+        """
+        Gets the klines of a symbol whose open time is in a range, as columns, see
+        :func:`binance_asyncio.columnar.decode_klines`. When the store holds the whole
+        range in one segment, the columns are memory-mapped.
+
+        :param symbol: The symbol of the pair
+        :param interval: The interval of the klines, see :meth:`MarketDataEndpoints.get_klines`
+        :param start_time: The open time of the first kline, as epoch milliseconds or for example '10 days ago'.
+            It defaults to the 1000 most recent klines until ``end_time``
+        :param end_time: The open time of the last kline, in similar format as above. It defaults to now
+        :type symbol: string
+        :type interval: string
+        :rtype: dict
+        """
+        symbol = symbol.upper()
+        now = int(time.time() * 1000)
+        end = parse_time(end_time) if end_time is not None else now
+        milliseconds = interval_to_milliseconds(interval)
+        start = parse_time(start_time) if start_time is not None else end - milliseconds * DEFAULT_LIMIT + 1
+        # the open times after the horizon may belong to klines which have not closed yet
+        horizon = now - milliseconds
+        store = self.get_store(symbol, interval)
+
+        lock = self._locks.setdefault((symbol, interval), asyncio.Lock())
+        async with lock:
+            gaps = _gaps(self.get_ranges(symbol, interval), start, end)
+            fetched = await asyncio.gather(*[self._fetch(symbol, interval, low, high) for low, high in gaps])
+            fresh = []
+            ranges = self.get_ranges(symbol, interval)
+            for (low, high), columns in zip(gaps, fetched):
+                closed = columns['open_time'] <= horizon
+                stored = {column: values[closed] for column, values in columns.items()}
+                fresh.append({column: values[~closed] for column, values in columns.items()})
+                if low <= min(high, horizon):
+                    ranges = _merge(ranges + [(low, min(high, horizon))])
+                    store.append(stored, dict(store.state, scale=self.scale, ranges=ranges))
+            if len(store.segments) > MAX_SEGMENTS:
+                store.compact()
+
+        result = store.read(start=start, end=end) if store.columns else decode_klines([], self.scale)
+        fresh = [columns for columns in fresh if len(columns['open_time'])]
+        if not fresh:
+            return result
+        parts = [result] + fresh
+        result = {column: np.concatenate([part[column] for part in parts]) for column in result}
+        order = np.argsort(result['open_time'], kind='stable')
+        return {column: values[order] for column, values in result.items()}
+
+    async def _fetch(self, symbol: str, interval: str, start: int, end: int) -> Dict[str, 'np.ndarray']:
+        klines = [kline async for kline in self.market_data.iter_klines(symbol, interval, start, end,
+            concurrency=self.concurrency, priority=self.priority)]
+        self.fetched += len(klines)
+        return decode_klines(klines, self.scale)
+
+
+def _gaps(ranges: List[Tuple[int, int]], start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Gets the parts of the range from start to end, inclusive, which are not in the sorted, disjoint ranges
+    """
+    gaps = []
+    for low, high in ranges:
+        if high < start:
+            continue
+        if low > end:
+            break
+        if low > start:
+            gaps.append((start, low - 1))
+        start = high + 1
+    if start <= end:
+        gaps.append((start, end))
+    return gaps
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged = []
+    for low, high in sorted(ranges):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
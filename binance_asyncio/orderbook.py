@@ -0,0 +1,261 @@
+import asyncio
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+from binance_asyncio import codec
+from binance_asyncio.endpoints import MarketDataEndpoints
+
+
+class BookSide:
+    """
+    One side of an order book, the price levels are kept sorted in two compact
+    arrays of doubles, with the best level at the end. That way the best level
+    is read in O(1), a level is found in O(log n), and the updates, which mostly
+    happen near the top of the book, only move a few elements.
+
+    :param descending: True for the bid side, where the best price is the highest
+    :type descending: bool
+    """
+    __slots__ = ('sign', 'keys', 'quantities')
+
+    def __init__(self, descending: bool) -> None:
+        # the keys are sorted ascending, for the asks the prices are negated so
+        # the lowest price ends up last
+        self.sign = 1.0 if descending else -1.0
+        self.keys = array('d')
+        self.quantities = array('d')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def clear(self) -> None:
+        del self.keys[:]
+        del self.quantities[:]
+
+    def update(self, price: float, quantity: float) -> None:
+        key = price * self.sign
+        keys = self.keys
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            if quantity == 0:
+                del keys[index]
+                del self.quantities[index]
+            else:
+                self.quantities[index] = quantity
+        elif quantity != 0:
+            keys.insert(index, key)
+            self.quantities.insert(index, quantity)
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self.keys:
+            return None
+        return self.keys[-1] * self.sign, self.quantities[-1]
+
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        sign = self.sign
+        keys = self.keys
+        quantities = self.quantities
+        return [(keys[i] * sign, quantities[i]) for i in range(len(keys) - 1, max(len(keys) - n, 0) - 1, -1)]
+
+    def quantity_at(self, price: float) -> float:
+        key = price * self.sign
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return self.quantities[index]
+        return 0.0
+
+
+class LocalOrderBook:
+    """
+    An order book kept in sync locally, from a REST snapshot and the messages
+    of a :class:`DiffDepthStream`.
+
+    Diffs are buffered while a snapshot is fetched, and applied once it arrives.
+    The ``U``/``u`` update ids of every diff are validated, and the book
+    automatically resyncs from a new snapshot, if a gap is detected.
+
+    .. code-block::
+
+        book = LocalOrderBook('btcusdt', MarketDataEndpoints())
+        stream = DiffDepthStream()
+        await stream.subscribe('btcusdt', more_updates=True)
+        await stream.start(book.handle)
+
+    :param symbol: The symbol of the pair
+    :param market_data: The client used to fetch snapshots
+    :param limit: The depth of the snapshots
+    :param on_sync: Optional callable, called with the book every time it has been (re)synced
+    :type symbol: string
+    :type market_data: MarketDataEndpoints
+    :type limit: int
+    :type on_sync: Callable
+    """
+    retry_delay = 1.0
+
+    def __init__(self, symbol: str, market_data: MarketDataEndpoints, limit: int = 1000,
+            on_sync: Callable = None) -> None:
+        self.symbol = symbol.upper()
+        self.market_data = market_data
+        self.limit = limit
+        self.on_sync = on_sync
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id = 0
+        self.synced = False
+        self._buffer = []
+        self._sync_task = None
+
+    async def handle(self, message) -> None:
+        """
+        Handler for the messages of a :class:`DiffDepthStream`, raw or decoded
+        """
+        if isinstance(message, (str, bytes)):
+            message = codec.loads(message)
+        self.process(message)
+
+    def process(self, event: dict) -> None:
+        """
+        Applies a decoded diff event to the book, or buffers it while the book is syncing
+        """
+        if not self.synced:
+            self._buffer.append(event)
+            if self._sync_task is None:
+                self._sync_task = asyncio.ensure_future(self._synchronise())
+            return
+
+        if event['u'] <= self.last_update_id:
+            return
+        if event['U'] > self.last_update_id + 1:
+            self.resync()
+            self.process(event)
+            return
+        self._apply(event)
+
+    def resync(self) -> None:
+        """
+        Drops the current state of the book, and syncs it from a new snapshot
+        """
+        self.synced = False
+        self.bids.clear()
+        self.asks.clear()
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        """
+        :rtype: (float, float)
+        :return: the price and quantity of the best bid, or None if there are no bids
+        """
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        """
+        :rtype: (float, float)
+        :return: the price and quantity of the best ask, or None if there are no asks
+        """
+        return self.asks.best()
+
+    def top_bids(self, n: int) -> List[Tuple[float, float]]:
+        """
+        :return: the ``n`` best bids as a list of (price, quantity), best first
+        """
+        return self.bids.top(n)
+
+    def top_asks(self, n: int) -> List[Tuple[float, float]]:
+        """
+        :return: the ``n`` best asks as a list of (price, quantity), best first
+        """
+        return self.asks.top(n)
+
+    def depth_at(self, price: float) -> float:
+        """
+        :return: the quantity resting at a price level, on either side of the book
+        """
+        return self.bids.quantity_at(price) or self.asks.quantity_at(price)
+
+    def _apply(self, event: dict) -> None:
+        update = self.bids.update
+        for price, quantity in event['b']:
+            update(float(price), float(quantity))
+        update = self.asks.update
+        for price, quantity in event['a']:
+            update(float(price), float(quantity))
+        self.last_update_id = event['u']
+
+    def _load(self, snapshot: dict) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        update = self.bids.update
+        for price, quantity in snapshot['bids']:
+            update(float(price), float(quantity))
+        update = self.asks.update
+        for price, quantity in snapshot['asks']:
+            update(float(price), float(quantity))
+        self.last_update_id = snapshot['lastUpdateId']
+
+    async def _synchronise(self) -> None:
+        try:
+            while not self.synced:
+                try:
+                    status, snapshot = await self.market_data.get_orderbook(self.symbol, self.limit)
+                except Exception:
+                    # for example a timeout or a lost connection, retried like a failed request
+                    status = None
+                if status != 200:
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+
+                self._load(snapshot)
+                buffered, self._buffer = self._buffer, []
+                for event in buffered:
+                    if event['u'] <= self.last_update_id:
+                        continue
+                    if event['U'] > self.last_update_id + 1:
+                        self._buffer = buffered
+                        break
+                    self._apply(event)
+                else:
+                    self.synced = True
+                    break
+                # the snapshot is older than the buffered events, so try again
+                await asyncio.sleep(self.retry_delay)
+        finally:
+            self._sync_task = None
+
+        if self.on_sync is not None:
+            self.on_sync(self)
+
+
+class LocalOrderBooks:
+    """
+    A collection of :class:`LocalOrderBook`, fed by a single :class:`DiffDepthStream`
+    subscribed to all of their symbols. The messages are routed by their symbol.
+
+    :param market_data: The client used to fetch snapshots
+    :param limit: The depth of the snapshots
+    :type market_data: MarketDataEndpoints
+    :type limit: int
+    """
+    def __init__(self, market_data: MarketDataEndpoints, limit: int = 1000) -> None:
+        self.market_data = market_data
+        self.limit = limit
+        self.books: Dict[str, LocalOrderBook] = {}
+
+    def add(self, symbol: str, on_sync: Callable = None) -> LocalOrderBook:
+        book = LocalOrderBook(symbol, self.market_data, self.limit, on_sync)
+        self.books[book.symbol] = book
+        return book
+
+    def __getitem__(self, symbol: str) -> LocalOrderBook:
+        return self.books[symbol.upper()]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.books
+
+    async def handle(self, message) -> None:
+        """
+        Handler for the messages of a :class:`DiffDepthStream`, raw or decoded
+        """
+        if isinstance(message, (str, bytes)):
+            message = codec.loads(message)
+        book = self.books.get(message['s'])
+        if book is not None:
+            book.process(message)
@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Mapping, Optional
+
+
+class Priority(IntEnum):
+    """
+    The priority of a request, lower values are served first
+    """
+    ORDER = 0
+    NORMAL = 1
+    BACKFILL = 2
+
+
+_priority: ContextVar = ContextVar('binance_asyncio_request_priority', default=Priority.NORMAL)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """
+    Sets the default priority of all requests made within the block, including
+    those made from tasks created within it. For example
+
+    .. code-block::
+
+        with request_priority(Priority.BACKFILL):
+            await market_data.get_klines('btcusdt')
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+def orderbook_weight(limit: int) -> int:
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+
+def ticker_weight(symbols: Optional[int]) -> int:
+    """
+    The weight of the 24 hour ticker, for a number of symbols, None for all symbols
+    """
+    if symbols is None or symbols > 100:
+        return 80
+    if symbols > 20:
+        return 40
+    return 2
+
+
+_UNITS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400}
+
+
+def _interval_seconds(label: str) -> int:
+    return int(label[:-1]) * _UNITS[label[-1]]
+
+
+class RateLimiter:
+    """
+    Client side scheduler, which keeps requests within the request weight
+    and order count limits of the API.
+
+    Every request reserves its weight before being sent, the local estimate is
+    corrected with the ``X-MBX-USED-WEIGHT-*`` and ``X-MBX-ORDER-COUNT-*`` headers
+    of the responses. Requests which would exceed the budget are queued by priority,
+    and lower priorities are only allowed to use a share of the budget, so orders
+    are never starved by a backfill.
+
+    :param weight_limit: The request weight allowed per ``weight_interval``
+    :param weight_interval: The length of the weight window in seconds
+    :param order_limit: The number of orders allowed per ``order_interval``
+    :param order_interval: The length of the order window in seconds
+    :param shares: The share of ``weight_limit`` each priority may use
+    :type weight_limit: int
+    :type weight_interval: int
+    :type order_limit: int
+    :type order_interval: int
+    :type shares: dict
+    """
+    default_shares = {
+        Priority.ORDER: 1.0,
+        Priority.NORMAL: 0.9,
+        Priority.BACKFILL: 0.75,
+    }
+
+    def __init__(self, weight_limit=6000, weight_interval=60, order_limit=100,
+            order_interval=10, shares: Dict[Priority, float] = None, clock=time.time) -> None:
+        self.weight_limit = weight_limit
+        self.weight_interval = weight_interval
+        self.order_limit = order_limit
+        self.order_interval = order_interval
+        self.shares = dict(self.default_shares if shares is None else shares)
+        self.clock = clock
+        self.used_weight = 0
+        self.used_orders = 0
+        self.blocked_until = 0.0
+        self._weight_window = 0
+        self._order_window = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._event = None
+
+    async def acquire(self, weight: int = 1, priority: Priority = None, orders: int = 0) -> None:
+        """
+        Waits until the request can be sent without exceeding the limits, and
+        reserves its weight.
+
+        :param weight: The weight of the request
+        :param priority: The priority, defaults to the one set by :func:`request_priority`
+        :param orders: The number of orders the request places
+        """
+        if priority is None:
+            priority = current_priority()
+        entry = (int(priority), next(self._sequence))
+        heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                now = self.clock()
+                self._roll(now)
+                delay = None
+                if self._waiters[0] == entry:
+                    delay = self._delay(now, weight, priority, orders)
+                    if delay == 0:
+                        heapq.heappop(self._waiters)
+                        self.used_weight += weight
+                        self.used_orders += orders
+                        self._notify()
+                        return
+                await self._wait(delay)
+        except BaseException:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._notify()
+            raise
+
+    def update(self, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Updates the usage from the headers of a response
+        """
+        now = self.clock()
+        self._roll(now)
+        for name, value in headers.items():
+            name = name.upper()
+            if name.startswith('X-MBX-USED-WEIGHT-'):
+                if _interval_seconds(name[18:]) == self.weight_interval:
+                    self.used_weight = max(self.used_weight, int(value))
+            elif name.startswith('X-MBX-ORDER-COUNT-'):
+                if _interval_seconds(name[18:]) == self.order_interval:
+                    self.used_orders = max(self.used_orders, int(value))
+
+        if status in (418, 429):
+            retry_after = headers.get('Retry-After')
+            delay = float(retry_after) if retry_after else self.weight_interval
+            self.blocked_until = max(self.blocked_until, now + delay)
+        self._notify()
+
+    def _roll(self, now: float) -> None:
+        weight_window = int(now // self.weight_interval)
+        if weight_window != self._weight_window:
+            self._weight_window = weight_window
+            self.used_weight = 0
+        order_window = int(now // self.order_interval)
+        if order_window != self._order_window:
+            self._order_window = order_window
+            self.used_orders = 0
+
+    def _delay(self, now: float, weight: int, priority: Priority, orders: int) -> float:
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        budget = self.weight_limit * self.shares.get(priority, 1.0)
+        if self.used_weight > 0 and self.used_weight + weight > budget:
+            return (self._weight_window + 1) * self.weight_interval - now
+        if orders and self.used_orders + orders > self.order_limit:
+            return (self._order_window + 1) * self.order_interval - now
+        return 0
+
+    async def _wait(self, timeout: float) -> None:
+        if self._event is None:
+            self._event = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _notify(self) -> None:
+        if self._event is not None:
+            self._event.set()
+            self._event = None
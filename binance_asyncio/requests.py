@@ -1,6 +1,8 @@
+import re
 import time
-from typing import Dict
-import dateparser
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
 
 class Request:
     def __init__(self) -> None:
@@ -28,12 +30,17 @@ class RequestBuilder:
         self.request.add_param('symbol', symbol.upper())
         return self
 
+    def with_symbols(self, symbols: Optional[Iterable[str]]):
+        if symbols is not None:
+            self.request.add_param('symbols', '[{}]'.format(','.join('"{}"'.format(symbol.upper()) for symbol in symbols)))
+        return self
+
     def with_start_time(self, time:str):
-        self.request.add_param('startTime', self.__parse_time(time))
+        self.request.add_param('startTime', None if time is None else self.__parse_time(time))
         return self
 
     def with_end_time(self, time:str):
-        self.request.add_param('endTime', self.__parse_time(time))
+        self.request.add_param('endTime', None if time is None else self.__parse_time(time))
         return self
 
     def with_limit(self, limit:int):
@@ -41,7 +48,7 @@ class RequestBuilder:
         return self
     
     def with_from_id(self, from_id:str):
-        self.request.add_param('from_id', from_id)
+        self.request.add_param('fromId', from_id)
         return self
 
     def with_interval(self, interval:str):
@@ -57,6 +64,86 @@ class RequestBuilder:
         return self.request
 
     def __parse_time(self, time:str):
-        if time is None or time == "":
-            raise Exception("Invalid time format")
-        return int(dateparser.parse(time).timestamp() * 1000)
\ No newline at end of file
+        return parse_time(time)
+
+
+_RELATIVE = re.compile(r'^\s*(?:(\d+(?:\.\d+)?)|an?)\s*(millisecond|second|sec|minute|min|hour|day|week)s?\s+ago\s*$')
+
+_UNIT_MILLISECONDS = {
+    'millisecond': 1,
+    'second': 1000,
+    'sec': 1000,
+    'minute': 60 * 1000,
+    'min': 60 * 1000,
+    'hour': 60 * 60 * 1000,
+    'day': 24 * 60 * 60 * 1000,
+    'week': 7 * 24 * 60 * 60 * 1000,
+}
+
+
+def parse_time(time) -> int:
+    """
+    Parses a time into milliseconds since the epoch. The time can be given as
+
+    - milliseconds since the epoch, as an int or a string of digits
+    - a ``datetime``, naive datetimes are in local time
+    - an ISO-8601 string, for example '2021-03-01T12:00:00Z'
+    - relative to now, for example 'now', '15 minutes ago' or '2 days ago'
+    - any other natural language understood by dateparser, for example '1 month ago'
+
+    The common formats are parsed without dateparser, which is only imported when needed.
+    """
+    if isinstance(time, int):
+        return time
+    if isinstance(time, datetime):
+        return int(time.timestamp() * 1000)
+    if time is None or time == "":
+        raise Exception("Invalid time format")
+
+    offset = _parse_relative(time)
+    if offset is not None:
+        return int(_now() * 1000) - offset
+    absolute = _parse_absolute(time)
+    if absolute is not None:
+        return absolute
+    return _parse_natural(time)
+
+
+def _now() -> float:
+    return time.time()
+
+
+@lru_cache(maxsize=256)
+def _parse_relative(text: str) -> Optional[int]:
+    """
+    The offset from now in milliseconds, of a relative time
+    """
+    text = text.strip().lower()
+    if text == 'now':
+        return 0
+    match = _RELATIVE.match(text)
+    if match is None:
+        return None
+    amount = float(match.group(1)) if match.group(1) else 1
+    return int(amount * _UNIT_MILLISECONDS[match.group(2)])
+
+
+@lru_cache(maxsize=1024)
+def _parse_absolute(text: str) -> Optional[int]:
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    try:
+        return int(datetime.fromisoformat(text).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def _parse_natural(text: str) -> int:
+    import dateparser
+    parsed = dateparser.parse(text)
+    if parsed is None:
+        raise Exception("Invalid time format")
+    return int(parsed.timestamp() * 1000)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import asyncio
+from typing import Optional
+import aiohttp
+from binance_asyncio.instrumentation import Instrumentation, get_trace_config
+from binance_asyncio.ratelimit import RateLimiter
+
+
+class HttpSession:
+    """
+    A pooled HTTP session, which can be shared between several endpoint clients.
+
+    Owns a single ``aiohttp.ClientSession`` backed by a keep-alive connection pool,
+    so consecutive requests re-use already established TCP/TLS connections, rather
+    than doing a new handshake for every call.
+
+    :param limit: The maximum number of open connections in the pool
+    :param limit_per_host: The maximum number of open connections to a single host
+    :param keepalive_timeout: Seconds an idle connection is kept open for re-use
+    :param ttl_dns_cache: Seconds resolved DNS entries are cached for
+    :param timeout: The total timeout in seconds of a single request
+    :param rate_limiter: An optional rate limiter, shared by all requests made through the session
+    :param instrumentation: Optional hooks measuring all requests made through the session, see
+        :mod:`binance_asyncio.instrumentation`
+    :type limit: int
+    :type limit_per_host: int
+    :type keepalive_timeout: float
+    :type ttl_dns_cache: int
+    :type timeout: float
+    :type rate_limiter: RateLimiter
+    :type instrumentation: Instrumentation
+    """
+    def __init__(self, limit=100, limit_per_host=20, keepalive_timeout=60.0,
+            ttl_dns_cache=300, timeout=30.0, rate_limiter: RateLimiter = None,
+            instrumentation: Instrumentation = None) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def open(self):
+        """
+        Opens the underlying connection pool, it is safe to call this more than once
+        """
+        if self.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.ttl_dns_cache)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=None if self.instrumentation is None else [get_trace_config()])
+        return self
+
+    async def close(self) -> None:
+        """
+        Closes the connection pool and all of its connections
+        """
+        if not self.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        await self.open()
+        return self._session
+
+    async def warm_up(self, url: str, connections: int = 1) -> None:
+        """
+        Pre-establishes connections to a host, so the first real requests
+        does not have to pay for the TCP and TLS handshakes.
+
+        :param url: A cheap url on the host to warm up, for example the ping endpoint
+        :param connections: The number of connections to open concurrently
+        :type url: string
+        :type connections: int
+        """
+        session = await self.get_session()
+
+        async def touch():
+            async with session.get(url) as response:
+                await response.read()
+
+        await asyncio.gather(*[touch() for _ in range(connections)])
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,44 @@
+import hashlib
+import hmac
+import string
+from typing import Mapping
+from urllib.parse import quote_plus
+
+_SAFE = frozenset(string.ascii_letters + string.digits + '_.-~')
+
+
+def _quote(value) -> str:
+    if value.__class__ is int:
+        return str(value)
+    text = str(value)
+    if _SAFE.issuperset(text):
+        return text
+    return quote_plus(text)
+
+
+def encode_parameters(parameters: Mapping) -> str:
+    """
+    Encodes parameters into a query string in a single pass, parameters with
+    the value None are left out. The result is the same as ``urlencode``
+    """
+    return '&'.join(
+        '{}={}'.format(_quote(name), _quote(value)) for name, value in parameters.items() if value is not None)
+
+
+class Signer:
+    """
+    Signs payloads with HMAC SHA256. The key is prepared once, and copied for every
+    signature, rather than being set up again for every request.
+
+    :param secret_key: your Binance provided secret key
+    :type secret_key: string
+    """
+    __slots__ = ('_hmac',)
+
+    def __init__(self, secret_key: str) -> None:
+        self._hmac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, payload: bytes) -> str:
+        signature = self._hmac.copy()
+        signature.update(payload)
+        return signature.hexdigest()
@@ -0,0 +1,221 @@
+"""
+An append-only, on-disk store of columns, such as those decoded by :mod:`binance_asyncio.columnar`.
+
+A store is a directory of segments, every segment is a directory holding one ``.npy`` file
+per column, which can be memory-mapped. Segments are written once, under a temporary name
+which is renamed when complete, and are never modified. The manifest, ``manifest.json``,
+lists the complete segments, with the range of their key column, and the state of whatever
+writes to the store, such as the checkpoint of a download. It is replaced atomically after
+every segment, so an interrupted writer never leaves a partial segment in the store. The
+directories it may leave behind are removed by :meth:`ColumnStore.repair`, which only the
+writer of a store should call.
+
+NumPy is required, install it with ``pip install binance-asyncio[numpy]``.
+"""
+import json
+import os
+import shutil
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MANIFEST = 'manifest.json'
+_TEMPORARY = '.tmp'
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for the column store, install it with pip install binance-asyncio[numpy]")
+
+
+class ColumnStore:
+    """
+    An append-only store of columns, in memory-mappable segments.
+
+    .. code-block::
+
+        store = ColumnStore('data/btcusdt-aggtrades', key='id')
+        store.append(columns, state={'next_id': 1001})
+        columns = store.read(['time', 'price'], start=500, end=900)
+
+    :param directory: The directory of the store, it is created if it does not exist
+    :param key: Optional column the rows of every segment are sorted by, which allows reading ranges of it
+    :type directory: string
+    :type key: string
+    """
+    def __init__(self, directory: str, key: str = None) -> None:
+        _require_numpy()
+        self.directory = directory
+        self.key = key
+        self.columns: Dict[str, str] = {}
+        self.segments: List[dict] = []
+        self.state: dict = {}
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as file:
+                manifest = json.load(file)
+            self.columns = manifest['columns']
+            self.segments = manifest['segments']
+            self.state = manifest['state']
+            self.key = manifest.get('key', key)
+
+    @property
+    def rows(self) -> int:
+        return sum(segment['rows'] for segment in self.segments)
+
+    def append(self, columns: Dict[str, 'np.ndarray'], state: dict = None) -> Optional[dict]:
+        """
+        Writes the columns as a new segment, and updates the state along with it
+
+        :param columns: The columns, all of the same length, and the same columns as the earlier segments
+        :param state: Optional state to save with the segment, for example the checkpoint of a download
+        :rtype: dict
+        :return: the description of the segment, or None if the columns are empty
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise Exception("The columns are not of the same length")
+        rows = lengths.pop()
+        if self.columns and set(columns) != set(self.columns):
+            raise Exception("The columns {} do not match those of the store {}".format(
+                sorted(columns), sorted(self.columns)))
+        if rows == 0:
+            if state is not None:
+                self.save_state(state)
+            return None
+
+        segment = self._write(columns)
+        if not self.columns:
+            self.columns = {column: np.asarray(values).dtype.str for column, values in columns.items()}
+        self.segments.append(segment)
+        if state is not None:
+            self.state = state
+        self._save_manifest()
+        return segment
+
+    def compact(self) -> None:
+        """
+        Merges all segments into one, ordered by the key, so reads are memory-mapped views again
+        """
+        if len(self.segments) <= 1:
+            return
+        previous = self.segments
+        self.segments = [self._write(self.read())]
+        self._save_manifest()
+        for segment in previous:
+            shutil.rmtree(os.path.join(self.directory, segment['name']), ignore_errors=True)
+
+    def save_state(self, state: dict) -> None:
+        """
+        Saves the state, without writing a segment
+        """
+        self.state = state
+        self._save_manifest()
+
+    def remove(self, segments: Iterable[dict]) -> None:
+        """
+        Removes segments, for example once they have been merged into a new one
+        """
+        names = {segment['name'] for segment in segments}
+        self.segments = [segment for segment in self.segments if segment['name'] not in names]
+        self._save_manifest()
+        for name in names:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def load(self, segment: dict, columns: Iterable[str] = None, mmap=True) -> Dict[str, 'np.ndarray']:
+        """
+        Loads the columns of a segment, memory-mapped unless ``mmap`` is false
+        """
+        path = os.path.join(self.directory, segment['name'])
+        return {column: np.load(os.path.join(path, column + '.npy'), mmap_mode='r' if mmap else None)
+            for column in (columns or self.columns)}
+
+    def iter_segments(self, columns: Iterable[str] = None, start: int = None,
+            end: int = None) -> Iterator[Dict[str, 'np.ndarray']]:
+        """
+        Iterates over the memory-mapped columns of every segment, in the order they were written.
+        With a key, only the rows whose key is between ``start`` and ``end``, inclusive, are included.
+        """
+        columns = list(columns or self.columns)
+        bounded = start is not None or end is not None
+        if bounded and self.key is None:
+            raise Exception("The store has no key, so it can not be read by range")
+        for segment in self.segments:
+            if bounded and ((start is not None and segment['last'] < start)
+                    or (end is not None and segment['first'] > end)):
+                continue
+            loaded = self.load(segment, set(columns) | ({self.key} if bounded else set()))
+            if bounded:
+                keys = loaded[self.key]
+                low = 0 if start is None else int(np.searchsorted(keys, start, 'left'))
+                high = len(keys) if end is None else int(np.searchsorted(keys, end, 'right'))
+                if low >= high:
+                    continue
+                loaded = {column: values[low:high] for column, values in loaded.items()}
+            yield {column: loaded[column] for column in columns}
+
+    def read(self, columns: Iterable[str] = None, start: int = None, end: int = None) -> Dict[str, 'np.ndarray']:
+        """
+        Reads columns, of all rows, or of the rows whose key is between ``start`` and ``end``, inclusive.
+        The rows are ordered by the key, when the store has one. When the rows come from a
+        single segment, the columns are memory-mapped views, rather than copies.
+        """
+        columns = list(columns or self.columns)
+        parts = list(self.iter_segments(columns if self.key is None else set(columns) | {self.key}, start, end))
+        if not parts:
+            return {column: np.empty(0, dtype=np.dtype(self.columns[column])) for column in columns}
+        if len(parts) == 1:
+            return {column: parts[0][column] for column in columns}
+        result = {column: np.concatenate([part[column] for part in parts]) for column in set(columns) | (
+            {self.key} if self.key is not None else set())}
+        if self.key is not None:
+            keys = result[self.key]
+            if len(keys) > 1 and np.any(keys[1:] < keys[:-1]):
+                order = np.argsort(keys, kind='stable')
+                result = {column: values[order] for column, values in result.items()}
+        return {column: result[column] for column in columns}
+
+    def _write(self, columns: Dict[str, 'np.ndarray']) -> dict:
+        """
+        Writes a segment under a temporary name, and renames it once it is complete
+        """
+        name = '{:08d}'.format(self._next_segment())
+        temporary = os.path.join(self.directory, name + _TEMPORARY)
+        os.makedirs(temporary)
+        for column, values in columns.items():
+            np.save(os.path.join(temporary, column + '.npy'), np.ascontiguousarray(values))
+        os.replace(temporary, os.path.join(self.directory, name))
+
+        segment = {'name': name, 'rows': len(next(iter(columns.values())))}
+        if self.key is not None:
+            keys = columns[self.key]
+            segment['first'] = int(keys[0])
+            segment['last'] = int(keys[-1])
+        return segment
+
+    def _next_segment(self) -> int:
+        numbers = [int(name.split('.')[0]) for name in os.listdir(self.directory) if name.split('.')[0].isdigit()]
+        return max(numbers, default=-1) + 1
+
+    def repair(self) -> None:
+        """
+        Removes the segments of an interrupted writer, which never made it into the manifest.
+        It also removes the segment a writer is busy with, so it must only be called by the
+        writer of the store, before it appends
+        """
+        names = {segment['name'] for segment in self.segments}
+        for name in os.listdir(self.directory):
+            if name.split('.')[0].isdigit() and name not in names:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _save_manifest(self) -> None:
+        path = os.path.join(self.directory, MANIFEST)
+        temporary = path + _TEMPORARY
+        with open(temporary, 'w') as file:
+            json.dump({'key': self.key, 'columns': self.columns, 'segments': self.segments, 'state': self.state},
+                file, indent=1)
+        os.replace(temporary, path)
@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import time
+from typing import Dict, Optional
+import websockets
+from binance_asyncio import codec
+from binance_asyncio.signing import Signer
+
+
+class WebSocketAccountEndpoints:
+    """
+    Order entry over the WebSocket API, rather than HTTP. Requests are sent over one long-lived
+    connection, and matched to their responses by id, so any number of them can be in flight
+    at once. The methods mirror those of :class:`AccountEndpoints`, and so do the results,
+    a tuple of the status code and the result (or error) of the response.
+
+    .. code-block::
+
+        async with WebSocketAccountEndpoints(api_key, secret_key) as account:
+            code, result = await account.order('BNBUSDT', 'BUY', 'MARKET', quoteOrderQty=10)
+
+    :param api_key: your Binance provided API key
+    :param secret_key: your Binance provided secret key
+    :param uri: The uri of the WebSocket API, for example the one of the testnet
+    :param timeout: The number of seconds to wait for a response
+    :type api_key: string
+    :type secret_key: string
+    :type uri: string
+    :type timeout: float
+    """
+    uri = "wss://ws-api.binance.com:443/ws-api/v3"
+
+    def __init__(self, api_key, secret_key, uri=None, timeout: float = 10.0) -> None:
+        self.api_key = api_key
+        self.signer = Signer(secret_key)
+        if uri is not None:
+            self.uri = uri
+        self.timeout = timeout
+        self.socket_reference = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = None
+        self._lock = None
+
+    async def open(self):
+        """
+        Connects to the WebSocket API, it is safe to call this more than once
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.socket_reference is None:
+                self.socket_reference = await websockets.connect(self.uri)
+                self._reader = asyncio.ensure_future(self._read(self.socket_reference))
+        return self
+
+    async def close(self) -> None:
+        if self.socket_reference is not None:
+            await self.socket_reference.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def test_order(self, symbol: str, side:str, order_type:str, **parameters):
+        return await self._call('order.test', self._create_order(symbol, side, order_type, parameters))
+
+    async def order(self, symbol: str, side:str, order_type:str, **parameters):
+        return await self._call('order.place', self._create_order(symbol, side, order_type, parameters))
+
+    async def query_order(self, symbol, **parameters):
+        parameters['symbol'] = symbol.upper()
+        return await self._call('order.status', parameters)
+
+    async def cancel_order(self, symbol, **parameters):
+        parameters['symbol'] = symbol.upper()
+        return await self._call('order.cancel', parameters)
+
+    def _create_order(self, symbol: str, side: str, order_type: str, parameters: dict) -> dict:
+        parameters['symbol'] = symbol.upper()
+        parameters['side'] = side
+        parameters['type'] = order_type
+        return parameters
+
+    def _sign(self, parameters: dict) -> dict:
+        parameters = {name: value for name, value in parameters.items() if value is not None}
+        parameters['apiKey'] = self.api_key
+        parameters['timestamp'] = int(round(time.time() * 1000))
+        payload = '&'.join('{}={}'.format(name, parameters[name]) for name in sorted(parameters))
+        parameters['signature'] = self.signer.sign(payload.encode())
+        return parameters
+
+    async def _call(self, method: str, parameters: dict, signed=True):
+        await self.open()
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self.socket_reference.send(codec.dumps({
+                "id": request_id,
+                "method": method,
+                "params": self._sign(parameters) if signed else parameters,
+            }))
+            response = await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        return response['status'], response['result'] if 'result' in response else response.get('error')
+
+    async def _read(self, websocket) -> None:
+        error: Optional[Exception] = None
+        try:
+            async for message in websocket:
+                response = codec.loads(message)
+                future = self._pending.get(response.get('id'))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except Exception as exception:
+            error = exception
+        finally:
+            if self.socket_reference is websocket:
+                self.socket_reference = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error or Exception("WebSocket API connection closed"))
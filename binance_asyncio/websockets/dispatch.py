@@ -0,0 +1,467 @@
+"""
+Dispatchers decide how the messages read from a stream are passed to its handler.
+A dispatcher is passed to :meth:`BaseStream.start`, by default the handler is
+awaited inline, for every message, by the reader of the socket.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, List, Optional
+from binance_asyncio import codec
+
+
+def symbol_key(message) -> Optional[Hashable]:
+    """
+    The default key of a message, its symbol. Works for raw, decoded and typed messages,
+    though raw messages have to be decoded to find it.
+    """
+    if isinstance(message, (str, bytes)):
+        message = codec.loads(message)
+    if isinstance(message, dict):
+        return message.get('s')
+    return getattr(message, 'symbol', None)
+
+
+class Dispatcher:
+    """
+    Awaits the handler inline, for every message. The stream reader waits for
+    the handler, before it reads the next message.
+    """
+    def __init__(self) -> None:
+        self.handler = None
+
+    async def open(self, handler: Callable) -> None:
+        self.handler = handler
+
+    async def dispatch(self, message: Any) -> None:
+        await self.handler(message)
+
+    async def close(self) -> None:
+        pass
+
+
+class QueueMetrics:
+    """
+    Counters of a :class:`QueueDispatcher`
+    """
+    __slots__ = ('received', 'delivered', 'dropped', 'conflated', 'max_depth')
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def __repr__(self) -> str:
+        fields = ", ".join("{}={}".format(name, getattr(self, name)) for name in self.__slots__)
+        return "QueueMetrics({})".format(fields)
+
+
+class QueueDispatcher(Dispatcher):
+    """
+    Decouples the stream reader from the handler with a bounded queue, so a slow
+    handler does not stall reading from the socket. The handler runs in its own task.
+
+    What happens when the queue is full, depends on the overflow policy
+
+    - "block", the reader waits for room in the queue
+    - "drop_oldest", the oldest queued message is dropped
+    - "conflate", only the latest message per key is queued, a new message replaces
+      the queued message with the same key, in place. This suits streams where only
+      the latest value matters, such as :class:`TickerStream` and :class:`SymbolBookTickerStream`.
+      If the queue still overflows, the oldest key is dropped. Messages without a key all share
+      one, so the messages of :class:`PartialBookDepthStream`, which have no symbol, conflate
+      to the latest snapshot of a stream of a single symbol. A stream of several symbols needs
+      a ``key`` which tells their messages apart
+
+    :param maxsize: The maximum number of queued messages
+    :param overflow: The overflow policy, one of "block", "drop_oldest" or "conflate"
+    :param key: The key used for conflation, it defaults to the symbol of the message
+    :type maxsize: int
+    :type overflow: string
+    :type key: Callable
+    """
+    policies = ('block', 'drop_oldest', 'conflate')
+
+    def __init__(self, maxsize: int = 1000, overflow: str = 'block', key: Callable = symbol_key) -> None:
+        super().__init__()
+        if overflow not in self.policies:
+            raise Exception("Invalid overflow policy {}".format(overflow))
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.key = key
+        self.metrics = QueueMetrics()
+        self._queue = OrderedDict() if overflow == 'conflate' else deque()
+        self._not_empty = None
+        self._not_full = None
+        self._worker = None
+        self._error = None
+        self._closing = False
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of messages currently queued
+        """
+        return len(self._queue)
+
+    async def open(self, handler: Callable) -> None:
+        await super().open(handler)
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def dispatch(self, message: Any) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+        metrics = self.metrics
+        metrics.received += 1
+        queue = self._queue
+        if self.overflow == 'conflate':
+            key = self.key(message)
+            if key in queue:
+                queue[key] = message
+                metrics.conflated += 1
+                return
+            if len(queue) >= self.maxsize:
+                queue.popitem(last=False)
+                metrics.dropped += 1
+            queue[key] = message
+        elif self.overflow == 'drop_oldest':
+            if len(queue) >= self.maxsize:
+                queue.popleft()
+                metrics.dropped += 1
+            queue.append(message)
+        else:
+            while len(queue) >= self.maxsize:
+                self._not_full.clear()
+                await self._not_full.wait()
+            queue.append(message)
+
+        if len(queue) > metrics.max_depth:
+            metrics.max_depth = len(queue)
+        self._not_empty.set()
+
+    async def close(self) -> None:
+        """
+        Passes the messages still queued to the handler, and stops its task. An error of
+        the handler which was not raised by :meth:`dispatch` yet is raised here
+        """
+        if self._worker is not None:
+            self._closing = True
+            self._not_empty.set()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                self._worker.cancel()
+                raise
+            finally:
+                self._worker = None
+                self._closing = False
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _get(self) -> Any:
+        if self.overflow == 'conflate':
+            return self._queue.popitem(last=False)[1]
+        return self._queue.popleft()
+
+    async def _run(self) -> None:
+        while True:
+            while not self._queue:
+                if self._closing:
+                    return
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            message = self._get()
+            self._not_full.set()
+            try:
+                await self.handler(message)
+            except Exception as error:
+                self._error = error
+            self.metrics.delivered += 1
+
+
+class BatchMetrics:
+    """
+    Counters of a :class:`BatchDispatcher`
+    """
+    __slots__ = ('received', 'delivered', 'batches', 'largest')
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.delivered = 0
+        self.batches = 0
+        self.largest = 0
+
+    def __repr__(self) -> str:
+        fields = ", ".join("{}={}".format(name, getattr(self, name)) for name in self.__slots__)
+        return "BatchMetrics({})".format(fields)
+
+
+class BatchDispatcher(Dispatcher):
+    """
+    Calls the handler with lists of messages, rather than once per message, which suits
+    vectorized handlers of high rate streams, such as :class:`AllMarketTickerStream`,
+    :class:`AllBookTickerStream` and :class:`DiffDepthStream` on many symbols.
+
+    The handler runs in its own task. It is passed all messages read since its previous
+    call, as soon as the reader has no more messages available, so a batch holds the
+    messages which arrived together. The reader waits for the handler when a batch
+    has ``max_batch`` messages, and yields to it once the oldest message of a batch is
+    ``max_latency`` seconds old.
+
+    .. code-block::
+
+        # the handler is passed the columns of every batch of klines
+        dispatcher = BatchDispatcher(max_batch=5000, transform=KlineStream.to_columns)
+        await stream.start(handler, dispatcher=dispatcher)
+
+    :param max_batch: The maximum number of messages of a batch
+    :param max_latency: The seconds after which the reader yields to the handler
+    :param transform: Optional callable applied to every batch before it is passed to the handler,
+        for example :meth:`KlineStream.to_columns`
+    :type max_batch: int
+    :type max_latency: float
+    :type transform: Callable
+    """
+    def __init__(self, max_batch: int = 1000, max_latency: float = 0.01, transform: Callable = None) -> None:
+        super().__init__()
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.transform = transform
+        self.metrics = BatchMetrics()
+        self._batch: List[Any] = []
+        self._first = 0.0
+        self._ready = None
+        self._taken = None
+        self._worker = None
+        self._error = None
+        self._closing = False
+
+    async def open(self, handler: Callable) -> None:
+        await super().open(handler)
+        self._ready = asyncio.Event()
+        self._taken = asyncio.Event()
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def dispatch(self, message: Any) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+        batch = self._batch
+        if not batch:
+            self._first = time.monotonic()
+            self._ready.set()
+        batch.append(message)
+        self.metrics.received += 1
+        if len(batch) >= self.max_batch:
+            while self._batch is batch:
+                self._taken.clear()
+                await self._taken.wait()
+        elif time.monotonic() - self._first >= self.max_latency:
+            # the handler takes the batch now, if it is not still busy with the previous one
+            await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        """
+        Passes the messages still batched to the handler, and stops its task. An error of
+        the handler which was not raised by :meth:`dispatch` yet is raised here
+        """
+        if self._worker is not None:
+            self._closing = True
+            self._ready.set()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                self._worker.cancel()
+                raise
+            finally:
+                self._worker = None
+                self._closing = False
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def _run(self) -> None:
+        metrics = self.metrics
+        while True:
+            while not self._batch:
+                if self._closing:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+            batch, self._batch = self._batch, []
+            self._taken.set()
+            size = len(batch)
+            try:
+                await self.handler(batch if self.transform is None else self.transform(batch))
+            except Exception as error:
+                self._error = error
+            metrics.batches += 1
+            metrics.delivered += size
+            if size > metrics.largest:
+                metrics.largest = size
+
+
+def _handle_all(handler: Callable, messages: List[Any]) -> List[Any]:
+    return [handler(message) for message in messages]
+
+
+class _Shard:
+    __slots__ = ('queue', 'not_empty', 'not_full', 'worker')
+
+    def __init__(self) -> None:
+        self.queue = deque()
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.not_full.set()
+        self.worker = None
+
+
+class ExecutorDispatcher(Dispatcher):
+    """
+    Runs the handler, a plain function rather than a coroutine function, in an executor,
+    so CPU heavy handlers do not stall the stream reader, and can use several cores.
+
+    The messages are sharded by their key, by default their symbol, and every shard
+    runs the handler on one batch of its queued messages at a time, so the messages
+    of a key are handled in order, while the shards run in parallel. A shard queues at
+    most ``max_pending`` messages, beyond that the reader waits for it.
+
+    With a :class:`ProcessPoolExecutor`, the handler has to be a function defined at the
+    top level of a module, and the messages are pickled, raw or json messages are
+    cheaper to send than typed ones. A shard is not bound to a process of the pool,
+    so state kept by the handler in a process only sees some of the messages of a key.
+    With the default :class:`ThreadPoolExecutor`, the handlers only run in parallel
+    while they release the GIL, for example in NumPy.
+
+    .. code-block::
+
+        def signal(message):
+            return model.update(message['s'], float(message['p']))
+
+        dispatcher = ExecutorDispatcher(ProcessPoolExecutor(4), shards=4, on_result=print)
+        await stream.start(signal, decode='json', dispatcher=dispatcher)
+
+    :param executor: The executor to run the handler in, by default a thread pool with a thread
+        per shard, which is shut down when the dispatcher closes
+    :param shards: The number of shards, it defaults to the number of CPUs
+    :param key: The key of a message, it defaults to the symbol of the message
+    :param max_pending: The maximum number of queued messages per shard
+    :param max_batch: The maximum number of messages a shard sends to the executor at once
+    :param on_result: Optional callable, or coroutine function, called with the result of the
+        handler, for every message, in order per key
+    :type executor: Executor
+    :type shards: int
+    :type key: Callable
+    :type max_pending: int
+    :type max_batch: int
+    :type on_result: Callable
+    """
+    def __init__(self, executor: Executor = None, shards: int = None, key: Callable = symbol_key,
+            max_pending: int = 100, max_batch: int = 100, on_result: Callable = None) -> None:
+        super().__init__()
+        self.executor = executor
+        self.shards = shards or os.cpu_count() or 1
+        self.key = key
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.on_result = on_result
+        self.metrics = QueueMetrics()
+        self._owns_executor = executor is None
+        self._shards: List[_Shard] = []
+        self._error = None
+        self._closing = False
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of messages currently queued, over all shards
+        """
+        return sum(len(shard.queue) for shard in self._shards)
+
+    async def open(self, handler: Callable) -> None:
+        await super().open(handler)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.shards)
+        if not self._shards:
+            self._shards = [_Shard() for _ in range(self.shards)]
+            for shard in self._shards:
+                shard.worker = asyncio.ensure_future(self._run(shard))
+
+    async def dispatch(self, message: Any) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+        metrics = self.metrics
+        metrics.received += 1
+        shard = self._shards[hash(self.key(message)) % self.shards]
+        queue = shard.queue
+        while len(queue) >= self.max_pending:
+            shard.not_full.clear()
+            await shard.not_full.wait()
+        queue.append(message)
+        if len(queue) > metrics.max_depth:
+            metrics.max_depth = len(queue)
+        shard.not_empty.set()
+
+    async def close(self) -> None:
+        """
+        Handles the messages still queued, and stops the shards. An error of the handler
+        which was not raised by :meth:`dispatch` yet is raised here
+        """
+        if not self._shards:
+            return
+        self._closing = True
+        workers = [shard.worker for shard in self._shards]
+        for shard in self._shards:
+            shard.not_empty.set()
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for worker in workers:
+                worker.cancel()
+            raise
+        finally:
+            self._shards = []
+            self._closing = False
+            if self._owns_executor and self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def _run(self, shard: _Shard) -> None:
+        loop = asyncio.get_running_loop()
+        queue = shard.queue
+        while True:
+            while not queue:
+                if self._closing:
+                    return
+                shard.not_empty.clear()
+                await shard.not_empty.wait()
+            batch = [queue.popleft() for _ in range(min(len(queue), self.max_batch))]
+            shard.not_full.set()
+            try:
+                results = await loop.run_in_executor(self.executor, _handle_all, self.handler, batch)
+                if self.on_result is not None:
+                    for result in results:
+                        result = self.on_result(result)
+                        if asyncio.iscoroutine(result):
+                            await result
+            except Exception as error:
+                self._error = error
+            self.metrics.delivered += len(batch)
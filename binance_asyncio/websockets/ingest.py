@@ -0,0 +1,511 @@
+"""
+Multi-process ingestion of streams into tables in shared memory.
+
+:class:`ShardedIngestion` starts worker processes which each subscribe a shard of the
+streams, decode their messages, and publish the latest top of book and 24 hour ticker of
+every symbol, and every trade, into a :class:`MarketTables` block of shared memory. Any
+process on the host can attach to the block by its name, and read the tables as NumPy
+arrays, without copying or decoding anything.
+
+The rows of the top of book and ticker tables are guarded by a sequence lock, a row is
+only written by the worker owning its symbol, and readers retry rows which were being
+written while they read them. Every worker appends its trades to a ring of its own, a
+reader notices the trades which were overwritten before it read them.
+
+NumPy is required, install it with ``pip install binance-asyncio[numpy]``.
+"""
+import asyncio
+import json
+import multiprocessing
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+from binance_asyncio.websockets.reconnect import ReconnectPolicy
+from binance_asyncio.websockets.streams import (AllBookTickerStream, AllMarketTickerStream, BaseStream,
+    SymbolBookTickerStream, TickerStream, TradeStream)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# the layout of the rows of the tables, every table starts on a cache line
+BOOK_FIELDS = [('seq', '<u8'), ('update_id', '<i8'), ('bid_price', '<f8'), ('bid_quantity', '<f8'),
+    ('ask_price', '<f8'), ('ask_quantity', '<f8'), ('time', '<i8')]
+TICKER_FIELDS = [('seq', '<u8'), ('event_time', '<i8'), ('last_price', '<f8'), ('open', '<f8'), ('high', '<f8'),
+    ('low', '<f8'), ('volume', '<f8'), ('quote_volume', '<f8'), ('price_change_percent', '<f8'), ('trades', '<i8')]
+TRADE_FIELDS = [('id', '<i8'), ('price', '<f8'), ('quantity', '<f8'), ('time', '<i8'), ('symbol', '<i4'),
+    ('is_buyer_maker', '?')]
+
+_VERSION = 1
+_HEADER = 16
+_CACHE_LINE = 64
+# the number of times a row being written is read again, before it is considered torn,
+# a write takes microseconds, unless its writer was terminated while writing it
+_MAX_RETRIES = 100000
+
+# the fields of a ReconnectPolicy passed to the workers, its callbacks can not be pickled
+_POLICY_FIELDS = ('initial_delay', 'max_delay', 'multiplier', 'jitter', 'max_retries', 'max_connection_age',
+    'ping_interval', 'ping_timeout')
+
+# the streams a worker can subscribe, by the kind of a subscription
+STREAMS = {
+    'trade': TradeStream,
+    'bookTicker': SymbolBookTickerStream,
+    'ticker': TickerStream,
+    '!bookTicker': AllBookTickerStream,
+    '!ticker@arr': AllMarketTickerStream,
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for shared memory ingestion, install it with pip install binance-asyncio[numpy]")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _CACHE_LINE) * _CACHE_LINE
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    # before Python 3.13, attaching registers the block with the resource tracker,
+    # which would unlink it when this process exits, while the owner still uses it
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def _torn(indices) -> Exception:
+    return Exception("The rows {} are torn, their writer stopped while writing them".format(list(indices)))
+
+
+def _read_row(table: 'np.ndarray', index: int) -> Optional['np.void']:
+    sequence = table['seq']
+    for _ in range(_MAX_RETRIES):
+        before = sequence[index]
+        if before & 1:
+            continue
+        row = table[index:index + 1].copy()[0]
+        if sequence[index] == before:
+            return row if before else None
+    raise _torn([index])
+
+
+def _snapshot(table: 'np.ndarray') -> 'np.ndarray':
+    sequence = table['seq']
+    rows = table.copy()
+    torn = ((rows['seq'] & 1) == 1) | (sequence != rows['seq'])
+    for _ in range(_MAX_RETRIES):
+        if not torn.any():
+            return rows
+        indices = np.flatnonzero(torn)
+        before = sequence[indices]
+        rows[indices] = table[indices]
+        torn[indices] = ((before & 1) == 1) | (sequence[indices] != before) | (rows['seq'][indices] != before)
+    if not torn.any():
+        return rows
+    raise _torn(np.flatnonzero(torn).tolist())
+
+
+class MarketTables:
+    """
+    The top of book, 24 hour ticker and trade tables of a set of symbols, in a block of shared memory.
+
+    The owner creates the block with :meth:`create`, other processes attach to it by its
+    name with :meth:`attach`. The tables are NumPy structured arrays over the shared memory,
+    ``books`` and ``tickers`` have a row per symbol, in the order of ``symbols``, and
+    ``trades`` a ring per writer. Reading them directly is zero copy, but rows may be
+    read while they are written, :meth:`get_book`, :meth:`get_ticker` and the snapshots
+    return consistent copies. They raise an exception for rows left torn by a writer
+    which was terminated while writing them.
+
+    .. code-block::
+
+        tables = MarketTables.attach('market')
+        print(tables.get_book('BTCUSDT'))
+        reader = tables.get_trade_reader()
+        while True:
+            trades = reader.read()
+            ...
+
+    The arrays are views of the shared memory, they can not be used once the tables are closed.
+    """
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool = False) -> None:
+        _require_numpy()
+        self.memory = memory
+        self.owner = owner
+        buffer = memory.buf
+        length, version = np.ndarray(2, '<u8', buffer=buffer)
+        if version != _VERSION:
+            raise Exception("The shared memory {} does not hold market tables of version {}".format(memory.name, _VERSION))
+        meta = json.loads(bytes(buffer[_HEADER:_HEADER + int(length)]))
+        self.symbols: List[str] = meta['symbols']
+        self.index: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.rings: int = meta['rings']
+        self.ring_capacity: int = meta['ring_capacity']
+
+        count = len(self.symbols)
+        offsets = self._get_offsets(int(length), count, self.rings, self.ring_capacity)
+        self.books = np.ndarray(count, np.dtype(BOOK_FIELDS), buffer=buffer, offset=offsets[0])
+        self.tickers = np.ndarray(count, np.dtype(TICKER_FIELDS), buffer=buffer, offset=offsets[1])
+        # every head is on a cache line of its own, so writers do not contend
+        self._heads = np.ndarray((self.rings, _CACHE_LINE // 8), '<u8', buffer=buffer, offset=offsets[2])
+        self.trades = np.ndarray((self.rings, self.ring_capacity), np.dtype(TRADE_FIELDS), buffer=buffer,
+            offset=offsets[3])
+        self._book_sequence = self.books['seq']
+        self._ticker_sequence = self.tickers['seq']
+
+    @staticmethod
+    def _get_offsets(length: int, count: int, rings: int, ring_capacity: int) -> Tuple[int, int, int, int, int]:
+        books = _align(_HEADER + length)
+        tickers = _align(books + count * np.dtype(BOOK_FIELDS).itemsize)
+        heads = _align(tickers + count * np.dtype(TICKER_FIELDS).itemsize)
+        trades = heads + rings * _CACHE_LINE
+        return books, tickers, heads, trades, trades + rings * ring_capacity * np.dtype(TRADE_FIELDS).itemsize
+
+    @classmethod
+    def create(cls, symbols: Sequence[str], rings: int = 1, ring_capacity: int = 65536,
+            name: str = None) -> 'MarketTables':
+        """
+        Creates the tables, in a new block of shared memory
+
+        :param symbols: The symbols, every symbol has a row in the top of book and ticker tables
+        :param rings: The number of trade rings, one per writer
+        :param ring_capacity: The number of trades of a ring
+        :param name: The name of the block, by default a random one
+        :rtype: MarketTables
+        """
+        _require_numpy()
+        meta = json.dumps({'symbols': [symbol.upper() for symbol in symbols], 'rings': rings,
+            'ring_capacity': ring_capacity}).encode()
+        size = cls._get_offsets(len(meta), len(symbols), rings, ring_capacity)[-1]
+        memory = shared_memory.SharedMemory(name, create=True, size=size)
+        np.ndarray(2, '<u8', buffer=memory.buf)[:] = (len(meta), _VERSION)
+        memory.buf[_HEADER:_HEADER + len(meta)] = meta
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'MarketTables':
+        """
+        Attaches to the tables created by another process
+        """
+        return cls(_attach(name))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def close(self) -> None:
+        """
+        Releases the arrays and detaches from the shared memory, which the owner also removes
+        """
+        self.books = self.tickers = self.trades = self._heads = None
+        self._book_sequence = self._ticker_sequence = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self) -> 'MarketTables':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def update_book(self, index: int, update_id: int, bid_price: float, bid_quantity: float, ask_price: float,
+            ask_quantity: float, time: int) -> None:
+        """
+        Writes the top of book of a symbol, by the index of the symbol
+        """
+        sequence = self._book_sequence
+        odd = sequence[index] + 1
+        sequence[index] = odd
+        self.books[index] = (odd, update_id, bid_price, bid_quantity, ask_price, ask_quantity, time)
+        sequence[index] = odd + 1
+
+    def update_ticker(self, index: int, event_time: int, last_price: float, open: float, high: float, low: float,
+            volume: float, quote_volume: float, price_change_percent: float, trades: int) -> None:
+        """
+        Writes the 24 hour ticker of a symbol, by the index of the symbol
+        """
+        sequence = self._ticker_sequence
+        odd = sequence[index] + 1
+        sequence[index] = odd
+        self.tickers[index] = (odd, event_time, last_price, open, high, low, volume, quote_volume,
+            price_change_percent, trades)
+        sequence[index] = odd + 1
+
+    def append_trade(self, ring: int, symbol: int, trade_id: int, price: float, quantity: float, time: int,
+            is_buyer_maker: bool) -> None:
+        """
+        Appends a trade to a ring, by the index of the symbol, a ring has a single writer
+        """
+        head = self._heads[ring, 0]
+        self.trades[ring, head % self.ring_capacity] = (trade_id, price, quantity, time, symbol, is_buyer_maker)
+        self._heads[ring, 0] = head + 1
+
+    def get_book(self, symbol: str) -> Optional['np.void']:
+        """
+        Gets a consistent copy of the top of book of a symbol, or None before the first update
+        """
+        return _read_row(self.books, self.index[symbol.upper()])
+
+    def get_ticker(self, symbol: str) -> Optional['np.void']:
+        """
+        Gets a consistent copy of the 24 hour ticker of a symbol, or None before the first update
+        """
+        return _read_row(self.tickers, self.index[symbol.upper()])
+
+    def get_books(self) -> 'np.ndarray':
+        """
+        Gets a copy of the top of book table, every row of which is consistent. The rows
+        which were never updated have a ``seq`` of 0
+        """
+        return _snapshot(self.books)
+
+    def get_tickers(self) -> 'np.ndarray':
+        """
+        Gets a copy of the 24 hour ticker table, every row of which is consistent. The rows
+        which were never updated have a ``seq`` of 0
+        """
+        return _snapshot(self.tickers)
+
+    def get_trade_reader(self, from_start: bool = False) -> 'TradeReader':
+        """
+        Gets a reader of the trades appended from now on, or of all trades still in the rings
+        """
+        return TradeReader(self, from_start)
+
+
+class TradeReader:
+    """
+    Reads the trades appended to the rings of :class:`MarketTables` since its previous read.
+    Trades which were overwritten before they were read, because the reader fell more than
+    the capacity of a ring behind, are counted in ``lost``. The oldest slot of a ring is the
+    one being written next, so a read returns at most one trade less than the capacity per ring.
+    """
+    def __init__(self, tables: MarketTables, from_start: bool = False) -> None:
+        self.tables = tables
+        heads = tables._heads[:, 0]
+        self.positions = [0 if from_start else int(head) for head in heads]
+        self.lost = 0
+
+    def read(self) -> 'np.ndarray':
+        """
+        Reads the new trades, of all rings, ordered by time. The ``symbol`` column is the
+        index of the symbol in :attr:`MarketTables.symbols`
+
+        :rtype: np.ndarray
+        """
+        tables = self.tables
+        capacity = tables.ring_capacity
+        parts = []
+        for ring in range(tables.rings):
+            head = int(tables._heads[ring, 0])
+            position = self.positions[ring]
+            # the slot of the position head - capacity is the one the writer fills next
+            start = max(position, head - capacity + 1)
+            self.lost += start - position
+            if start < head:
+                positions = np.arange(start, head)
+                trades = tables.trades[ring, positions % capacity]
+                # the writer may have overwritten the oldest trades while they were copied
+                valid = positions > int(tables._heads[ring, 0]) - capacity
+                if not valid.all():
+                    self.lost += int(len(valid) - valid.sum())
+                    trades = trades[valid]
+                parts.append(trades)
+            self.positions[ring] = head
+        if not parts:
+            return np.empty(0, np.dtype(TRADE_FIELDS))
+        trades = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        if len(parts) > 1:
+            trades = trades[np.argsort(trades['time'], kind='stable')]
+        return trades
+
+
+class ShardedIngestion:
+    """
+    Ingests streams in worker processes, into :class:`MarketTables` shared by all processes
+    of the host, so decoding a high rate of messages scales over several cores.
+
+    The trades, book tickers and 24 hour tickers of the symbols are sharded over the
+    workers, every symbol belongs to a single worker. With ``all_market``, the book
+    tickers and 24 hour tickers of all symbols are rather subscribed by the ``!bookTicker``
+    and ``!ticker@arr`` streams, each ingested by a worker of its own, and only the
+    updates of ``symbols`` are published.
+
+    .. code-block::
+
+        with ShardedIngestion(symbols, workers=4, name='market') as tables:
+            while True:
+                books = tables.get_books()
+                ...
+
+        # in any other process
+        tables = MarketTables.attach('market')
+
+    :param symbols: The symbols to ingest
+    :param workers: The number of worker processes
+    :param trades: Whether to ingest the trades of the symbols
+    :param book_tickers: Whether to ingest the top of book of the symbols
+    :param tickers: Whether to ingest the 24 hour tickers of the symbols
+    :param all_market: Whether to ingest the book tickers and 24 hour tickers of all symbols
+        by the all market streams, rather than a stream per symbol
+    :param ring_capacity: The number of trades of the ring of every worker
+    :param name: The name of the shared memory, by default a random one
+    :param uri: The uri of the stream endpoint, by default the one of :class:`BaseStream`
+    :param reconnect: How the streams of the workers reconnect, by default with the default :class:`ReconnectPolicy`.
+        Only its delays, retries and timeouts are passed to the workers, its callbacks are not called
+    :type symbols: list
+    :type workers: int
+    :type trades: bool
+    :type book_tickers: bool
+    :type tickers: bool
+    :type all_market: bool
+    :type ring_capacity: int
+    :type name: string
+    :type uri: string
+    :type reconnect: ReconnectPolicy
+    """
+    def __init__(self, symbols: Sequence[str], workers: int = 2, trades: bool = True, book_tickers: bool = True,
+            tickers: bool = True, all_market: bool = False, ring_capacity: int = 65536, name: str = None,
+            uri: str = None, reconnect: ReconnectPolicy = None) -> None:
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.workers = workers
+        self.trades = trades
+        self.book_tickers = book_tickers
+        self.tickers = tickers
+        self.all_market = all_market
+        self.ring_capacity = ring_capacity
+        self.name = name
+        self.uri = uri
+        self.reconnect = reconnect
+        self.tables: Optional[MarketTables] = None
+        self.processes: List[multiprocessing.Process] = []
+        self._stop = None
+
+    def get_shards(self) -> List[List[Tuple[str, Optional[str]]]]:
+        """
+        Gets the subscriptions of every worker, as pairs of the kind of stream, see :data:`STREAMS`,
+        and the symbol, which is None for the all market streams
+        """
+        shards = [[] for _ in range(self.workers)]
+        worker = 0
+        if self.all_market:
+            for kind, enabled in (('!bookTicker', self.book_tickers), ('!ticker@arr', self.tickers)):
+                if enabled:
+                    shards[worker % self.workers].append((kind, None))
+                    worker += 1
+        kinds = [kind for kind, enabled in (('trade', self.trades), ('bookTicker', self.book_tickers),
+            ('ticker', self.tickers)) if enabled and not (self.all_market and kind != 'trade')]
+        for symbol in self.symbols:
+            shards[worker % self.workers].extend((kind, symbol.lower()) for kind in kinds)
+            worker += 1
+        return shards
+
+    def start(self) -> MarketTables:
+        """
+        Creates the tables, and starts the workers
+
+        :rtype: MarketTables
+        """
+        self.tables = MarketTables.create(self.symbols, self.workers, self.ring_capacity, self.name)
+        context = multiprocessing.get_context('spawn')
+        self._stop = context.Event()
+        reconnect = None if self.reconnect is None else {name: getattr(self.reconnect, name) for name in _POLICY_FIELDS}
+        self.processes = [context.Process(target=_work, name='ingest-{}'.format(ring), daemon=True,
+                args=(self.tables.name, ring, subscriptions, self.uri, reconnect, self._stop))
+            for ring, subscriptions in enumerate(self.get_shards())]
+        for process in self.processes:
+            process.start()
+        return self.tables
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stops the workers, terminating those which do not stop within the timeout, and removes the tables
+        """
+        if self._stop is not None:
+            self._stop.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.processes = []
+        if self.tables is not None:
+            self.tables.close()
+            self.tables = None
+
+    def __enter__(self) -> MarketTables:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _work(name: str, ring: int, subscriptions: List[Tuple[str, Optional[str]]], uri: Optional[str],
+        reconnect: Optional[dict], stop) -> None:
+    tables = MarketTables.attach(name)
+    try:
+        asyncio.run(_ingest(tables, ring, subscriptions, uri, ReconnectPolicy(**(reconnect or {})), stop))
+    finally:
+        tables.close()
+
+
+async def _ingest(tables: MarketTables, ring: int, subscriptions: List[Tuple[str, Optional[str]]],
+        uri: Optional[str], reconnect: ReconnectPolicy, stop) -> None:
+    if uri is not None:
+        BaseStream.uri = uri
+    index = tables.index
+
+    async def on_book(message):
+        i = index.get(message['s'])
+        if i is not None:
+            tables.update_book(i, message['u'], float(message['b']), float(message['B']), float(message['a']),
+                float(message['A']), int(time.time() * 1000))
+
+    async def on_ticker(message):
+        for ticker in message if isinstance(message, list) else (message,):
+            i = index.get(ticker['s'])
+            if i is not None:
+                tables.update_ticker(i, ticker['E'], float(ticker['c']), float(ticker['o']), float(ticker['h']),
+                    float(ticker['l']), float(ticker['v']), float(ticker['q']), float(ticker['P']), ticker['n'])
+
+    async def on_trade(message):
+        i = index.get(message['s'])
+        if i is not None:
+            tables.append_trade(ring, i, message['t'], float(message['p']), float(message['q']), message['T'],
+                message['m'])
+
+    handlers = {'trade': on_trade, 'bookTicker': on_book, 'ticker': on_ticker, '!bookTicker': on_book,
+        '!ticker@arr': on_ticker}
+    streams: Dict[str, BaseStream] = {}
+    for kind, symbol in subscriptions:
+        stream = streams.get(kind)
+        if stream is None:
+            stream = streams[kind] = STREAMS[kind]()
+        if symbol is None:
+            await stream._subscribe()
+        else:
+            await stream.subscribe(symbol)
+
+    async def watch():
+        while not stop.is_set():
+            await asyncio.sleep(0.1)
+        for stream in streams.values():
+            await stream.stop()
+
+    watcher = asyncio.ensure_future(watch())
+    try:
+        await asyncio.gather(*[stream.start(handlers[kind], decode='json', reconnect=reconnect)
+            for kind, stream in streams.items()])
+    finally:
+        watcher.cancel()
@@ -0,0 +1,190 @@
+"""
+Compact, typed representations of the stream messages, used when a stream is
+started with ``decode='typed'``. Each payload is decoded once, prices and
+quantities are converted to floats.
+"""
+from abc import ABC, abstractmethod
+from typing import List, Tuple, Union
+
+
+def _levels(levels) -> List[Tuple[float, float]]:
+    return [(float(price), float(quantity)) for price, quantity in levels]
+
+
+class Message(ABC):
+    __slots__ = ()
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, data: dict) -> 'Message':
+        pass
+
+    @classmethod
+    def decode(cls, data: Union[dict, list]):
+        """
+        Converts a decoded payload, or a list of them, into messages
+        """
+        if isinstance(data, list):
+            return [cls.from_dict(item) for item in data]
+        return cls.from_dict(data)
+
+    def __repr__(self) -> str:
+        fields = ", ".join("{}={!r}".format(name, getattr(self, name)) for name in self.__slots__)
+        return "{}({})".format(type(self).__name__, fields)
+
+
+class AggregateTrade(Message):
+    __slots__ = ('event_time', 'symbol', 'id', 'price', 'quantity', 'first_id', 'last_id', 'time',
+        'is_buyer_maker')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AggregateTrade':
+        message = cls()
+        message.event_time = data['E']
+        message.symbol = data['s']
+        message.id = data['a']
+        message.price = float(data['p'])
+        message.quantity = float(data['q'])
+        message.first_id = data['f']
+        message.last_id = data['l']
+        message.time = data['T']
+        message.is_buyer_maker = data['m']
+        return message
+
+
+class Trade(Message):
+    __slots__ = ('event_time', 'symbol', 'id', 'price', 'quantity', 'time', 'is_buyer_maker')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Trade':
+        message = cls()
+        message.event_time = data['E']
+        message.symbol = data['s']
+        message.id = data['t']
+        message.price = float(data['p'])
+        message.quantity = float(data['q'])
+        message.time = data['T']
+        message.is_buyer_maker = data['m']
+        return message
+
+
+class Ticker(Message):
+    __slots__ = ('event_time', 'symbol', 'price_change', 'price_change_percent', 'weighted_average_price',
+        'last_price', 'last_quantity', 'bid_price', 'bid_quantity', 'ask_price', 'ask_quantity',
+        'open_price', 'high_price', 'low_price', 'volume', 'quote_volume', 'open_time', 'close_time',
+        'first_id', 'last_id', 'count')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Ticker':
+        message = cls()
+        message.event_time = data['E']
+        message.symbol = data['s']
+        message.price_change = float(data['p'])
+        message.price_change_percent = float(data['P'])
+        message.weighted_average_price = float(data['w'])
+        message.last_price = float(data['c'])
+        message.last_quantity = float(data['Q'])
+        message.bid_price = float(data['b'])
+        message.bid_quantity = float(data['B'])
+        message.ask_price = float(data['a'])
+        message.ask_quantity = float(data['A'])
+        message.open_price = float(data['o'])
+        message.high_price = float(data['h'])
+        message.low_price = float(data['l'])
+        message.volume = float(data['v'])
+        message.quote_volume = float(data['q'])
+        message.open_time = data['O']
+        message.close_time = data['C']
+        message.first_id = data['F']
+        message.last_id = data['L']
+        message.count = data['n']
+        return message
+
+
+class MiniTicker(Message):
+    __slots__ = ('event_time', 'symbol', 'close_price', 'open_price', 'high_price', 'low_price',
+        'volume', 'quote_volume')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MiniTicker':
+        message = cls()
+        message.event_time = data['E']
+        message.symbol = data['s']
+        message.close_price = float(data['c'])
+        message.open_price = float(data['o'])
+        message.high_price = float(data['h'])
+        message.low_price = float(data['l'])
+        message.volume = float(data['v'])
+        message.quote_volume = float(data['q'])
+        return message
+
+
+class Kline(Message):
+    __slots__ = ('event_time', 'symbol', 'interval', 'open_time', 'close_time', 'first_trade_id',
+        'last_trade_id', 'open', 'close', 'high', 'low', 'volume', 'trades', 'is_closed',
+        'quote_volume', 'taker_buy_base_volume', 'taker_buy_quote_volume')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Kline':
+        kline = data['k']
+        message = cls()
+        message.event_time = data['E']
+        message.symbol = data['s']
+        message.interval = kline['i']
+        message.open_time = kline['t']
+        message.close_time = kline['T']
+        message.first_trade_id = kline['f']
+        message.last_trade_id = kline['L']
+        message.open = float(kline['o'])
+        message.close = float(kline['c'])
+        message.high = float(kline['h'])
+        message.low = float(kline['l'])
+        message.volume = float(kline['v'])
+        message.trades = kline['n']
+        message.is_closed = kline['x']
+        message.quote_volume = float(kline['q'])
+        message.taker_buy_base_volume = float(kline['V'])
+        message.taker_buy_quote_volume = float(kline['Q'])
+        return message
+
+
+class BookTicker(Message):
+    __slots__ = ('update_id', 'symbol', 'bid_price', 'bid_quantity', 'ask_price', 'ask_quantity')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BookTicker':
+        message = cls()
+        message.update_id = data['u']
+        message.symbol = data['s']
+        message.bid_price = float(data['b'])
+        message.bid_quantity = float(data['B'])
+        message.ask_price = float(data['a'])
+        message.ask_quantity = float(data['A'])
+        return message
+
+
+class PartialDepth(Message):
+    __slots__ = ('last_update_id', 'bids', 'asks')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PartialDepth':
+        message = cls()
+        message.last_update_id = data['lastUpdateId']
+        message.bids = _levels(data['bids'])
+        message.asks = _levels(data['asks'])
+        return message
+
+
+class DepthUpdate(Message):
+    __slots__ = ('event_time', 'symbol', 'first_update_id', 'final_update_id', 'bids', 'asks')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DepthUpdate':
+        message = cls()
+        message.event_time = data['E']
+        message.symbol = data['s']
+        message.first_update_id = data['U']
+        message.final_update_id = data['u']
+        message.bids = _levels(data['b'])
+        message.asks = _levels(data['a'])
+        return message
@@ -0,0 +1,222 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import websockets
+from binance_asyncio import codec
+from binance_asyncio.instrumentation import Instrumentation, event_time
+from binance_asyncio.websockets.streams import BaseStream
+from binance_asyncio.websockets.reconnect import ReconnectPolicy, Reconnector
+
+
+class _Shard:
+    def __init__(self, streams: List[str]) -> None:
+        self.streams = streams
+        self.socket_reference = None
+        self.sending = asyncio.Lock()
+        self.next_send = 0.0
+
+
+class StreamMultiplexer:
+    """
+    Multiplexes the subscriptions of any number of streams, of any type, onto
+    the combined stream endpoint, rather than a connection per stream.
+    Every message is routed to the handler of its stream, by its ``stream`` field.
+
+    When a connection reaches the maximum number of streams, the subscriptions
+    are sharded across several connections automatically. A connection subscribes
+    its streams in chunks, paced below the limit of 5 incoming messages per second
+    of the exchange, rather than in its URL.
+
+    .. code-block::
+
+        trades = TradeStream()
+        await trades.subscribe('btcusdt')
+        klines = KlineStream()
+        await klines.subscribe('btcusdt', '1m')
+
+        multiplexer = StreamMultiplexer()
+        multiplexer.add(trades, trade_handler)
+        multiplexer.add(klines, kline_handler)
+        await multiplexer.start()
+
+    Note, unlike :meth:`BaseStream.start`, the handlers are called with the
+    decoded ``data`` of the message, rather than the raw text. Or, when added 
+    with ``typed=True``, with the typed message of the stream.
+
+    :param max_streams: The maximum number of streams per connection
+    :param subscribe_chunk: The maximum number of streams per subscribe message
+    :param subscribe_interval: The minimum seconds between subscribe messages of a connection
+    :type max_streams: int
+    :type subscribe_chunk: int
+    :type subscribe_interval: float
+    """
+    uri = "wss://stream.binance.com:9443/stream"
+    last_id = 0
+
+    def __init__(self, max_streams: int = 1024, subscribe_chunk: int = 200, subscribe_interval: float = 0.25) -> None:
+        self.max_streams = max_streams
+        self.subscribe_chunk = subscribe_chunk
+        self.subscribe_interval = subscribe_interval
+        self.handlers: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
+        self.shards: List[_Shard] = []
+        self.active = True
+        self.reconnect = None
+        self.instrumentation = None
+        self._tasks = []
+
+    def add(self, stream: BaseStream, handler: Callable, typed=False) -> None:
+        """
+        Adds all current subscriptions of a stream, their messages are passed to the handler.
+        If the multiplexer is already running, the streams are subscribed right away.
+
+        :param stream: The stream, with its subscriptions
+        :param handler: The coroutine function to handle its messages
+        :param typed: When true, the handler is passed typed messages, see :mod:`binance_asyncio.websockets.messages`
+        :type stream: BaseStream
+        :type handler: Callable
+        :type typed: bool
+        """
+        if typed and stream.message_type is None:
+            raise Exception("{} has no typed messages".format(type(stream).__name__))
+        self.add_streams(list(stream.parameters.keys()), handler,
+            stream.message_type.decode if typed else None)
+
+    def add_streams(self, streams: List[str], handler: Callable, converter: Callable = None) -> None:
+        """
+        Adds streams by their names, for example ``btcusdt@trade``. The data of
+        their messages is passed through the optional converter, before the handler.
+        """
+        new_streams = [name for name in streams if name not in self.handlers]
+        for name in streams:
+            self.handlers[name] = (handler, converter)
+        if self._tasks:
+            self._place(new_streams)
+
+    async def start(self, keep_alive=False, reconnect: ReconnectPolicy = None,
+            instrumentation: Instrumentation = None) -> None:
+        """
+        Connects all shards, and handles their messages until they are closed
+
+        :param keep_alive: When true, shards are reconnected when their connection is lost,
+            using the default :class:`ReconnectPolicy`
+        :param reconnect: How the shards reconnect, implies ``keep_alive``. The gap callbacks
+            are passed the shard, whose ``streams`` are affected by the gap
+        :param instrumentation: Optional hooks measuring the messages of every stream, by stream name,
+            see :mod:`binance_asyncio.instrumentation`
+        :type keep_alive: bool
+        :type reconnect: ReconnectPolicy
+        :type instrumentation: Instrumentation
+        """
+        if reconnect is None and keep_alive:
+            reconnect = ReconnectPolicy()
+        self.reconnect = reconnect
+        self.instrumentation = instrumentation
+        self.active = True
+        self.shards = [_Shard(streams) for streams in self._chunks(list(self.handlers.keys()))]
+        self._tasks = [asyncio.ensure_future(self._run(shard)) for shard in self.shards]
+        try:
+            while self._tasks:
+                tasks = list(self._tasks)
+                await asyncio.gather(*tasks)
+                self._tasks = [task for task in self._tasks if task not in tasks]
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
+
+    async def stop(self) -> None:
+        """
+        Closes all connections
+        """
+        self.active = False
+        for shard in self.shards:
+            if shard.socket_reference is not None:
+                await shard.socket_reference.close()
+
+    def _chunks(self, streams: List[str]) -> List[List[str]]:
+        return [streams[i:i + self.max_streams] for i in range(0, len(streams), self.max_streams)]
+
+    def _place(self, streams: List[str]) -> None:
+        for shard in self.shards:
+            room = self.max_streams - len(shard.streams)
+            if room <= 0 or not streams:
+                continue
+            added, streams = streams[:room], streams[room:]
+            shard.streams.extend(added)
+            if shard.socket_reference is not None:
+                asyncio.ensure_future(self._subscribe_added(shard, shard.socket_reference, added))
+
+        for chunk in self._chunks(streams):
+            shard = _Shard(chunk)
+            self.shards.append(shard)
+            self._tasks.append(asyncio.ensure_future(self._run(shard)))
+
+    async def _run(self, shard: _Shard) -> None:
+        if self.reconnect is None:
+            await self._connect(shard)
+        else:
+            await self.reconnect.run(
+                lambda reconnector: self._connect(shard, reconnector),
+                shard,
+                lambda: self.active)
+
+    async def _subscribe(self, shard: _Shard, websocket, streams: List[str]) -> None:
+        # the sends of a connection are serialised, and paced by the subscribe interval
+        async with shard.sending:
+            for i in range(0, len(streams), self.subscribe_chunk):
+                delay = shard.next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await websocket.send(self._get_request('SUBSCRIBE', streams[i:i + self.subscribe_chunk]))
+                shard.next_send = time.monotonic() + self.subscribe_interval
+
+    async def _subscribe_added(self, shard: _Shard, websocket, streams: List[str]) -> None:
+        try:
+            await self._subscribe(shard, websocket, streams)
+        except websockets.ConnectionClosed:
+            # the streams are subscribed by the next connection of the shard
+            pass
+
+    async def _connect(self, shard: _Shard, reconnector: Reconnector = None) -> None:
+        options = {} if reconnector is None else reconnector.policy.get_connect_options()
+        async with websockets.connect(self.uri, **options) as websocket:
+            shard.socket_reference = websocket
+            try:
+                await self._subscribe(shard, websocket, list(shard.streams))
+                if reconnector is not None:
+                    await reconnector.established(websocket)
+                handlers = self.handlers
+                if self.instrumentation is not None:
+                    await self._read_instrumented(websocket, self.instrumentation)
+                else:
+                    async for message in websocket:
+                        envelope = codec.loads(message)
+                        route = handlers.get(envelope.get('stream'))
+                        if route is not None:
+                            handler, converter = route
+                            data = envelope['data']
+                            await handler(data if converter is None else converter(data))
+            finally:
+                shard.socket_reference = None
+
+    async def _read_instrumented(self, websocket, instrumentation: Instrumentation) -> None:
+        handlers = self.handlers
+        async for message in websocket:
+            received = time.time()
+            envelope = codec.loads(message)
+            name = envelope.get('stream')
+            route = handlers.get(name)
+            if route is not None:
+                handler, converter = route
+                data = envelope['data']
+                start = time.perf_counter()
+                await handler(data if converter is None else converter(data))
+                instrumentation.on_message(name, received, event_time(data), time.perf_counter() - start)
+
+    def _get_request(self, type: str, streams: List[str]) -> str:
+        StreamMultiplexer.last_id = StreamMultiplexer.last_id + 1
+        return codec.dumps({
+                "method": type,
+                "params": streams,
+                "id": StreamMultiplexer.last_id
+                })
@@ -0,0 +1,157 @@
+import asyncio
+import inspect
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+
+class ReconnectPolicy:
+    """
+    Describes how a stream keeps its connection alive, and reconnects when it is lost.
+
+    Reconnects are delayed with jittered exponential backoff, connections are rolled
+    over before the 24 hour limit of the exchange, and dead connections are detected
+    with ping/pong. Subscriptions are renewed on every new connection.
+
+    A rollover closes the connection before it opens the next one, without a delay, so
+    it always causes a short gap, which is reported by the gap callbacks like any other.
+    Rolling over early only picks when that gap happens, rather than avoiding it.
+
+    The gap callbacks are passed the stream and times in milliseconds since the epoch,
+    ``on_gap_start(stream, start)`` is called when the connection is lost, and
+    ``on_gap_end(stream, start, end)`` once the stream is subscribed again. ``on_connect(stream)``
+    is called every time the stream is subscribed, including the first time, before any message
+    of the connection is read. They can be plain functions or coroutine functions.
+
+    :param initial_delay: The delay in seconds before the first reconnect attempt
+    :param max_delay: The maximum delay in seconds between reconnect attempts
+    :param multiplier: The factor the delay grows by after each failed attempt
+    :param jitter: The share of the delay which is randomised
+    :param max_retries: The number of consecutive failed attempts before giving up, None to never give up
+    :param max_connection_age: Seconds after which a connection is proactively replaced, with a gap
+    :param ping_interval: Seconds between pings
+    :param ping_timeout: Seconds to wait for a pong, before the connection is considered dead
+    :param on_gap_start: Optional callable, called when the data gap starts
+    :param on_gap_end: Optional callable, called when the data gap ends
+    :param on_connect: Optional callable, called when the stream is subscribed
+    :type initial_delay: float
+    :type max_delay: float
+    :type multiplier: float
+    :type jitter: float
+    :type max_retries: int
+    :type max_connection_age: float
+    :type ping_interval: float
+    :type ping_timeout: float
+    :type on_gap_start: Callable
+    :type on_gap_end: Callable
+    :type on_connect: Callable
+    """
+    def __init__(self, initial_delay=0.5, max_delay=30.0, multiplier=2.0, jitter=0.5, max_retries=None,
+            max_connection_age=23.5 * 3600, ping_interval=20.0, ping_timeout=20.0,
+            on_gap_start: Callable = None, on_gap_end: Callable = None, on_connect: Callable = None) -> None:
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_retries = max_retries
+        self.max_connection_age = max_connection_age
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.on_gap_start = on_gap_start
+        self.on_gap_end = on_gap_end
+        self.on_connect = on_connect
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        :return: the delay in seconds before a reconnect attempt, the first attempt being 0
+        """
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def get_connect_options(self) -> dict:
+        return {'ping_interval': self.ping_interval, 'ping_timeout': self.ping_timeout}
+
+    async def run(self, connect: Callable[['Reconnector'], Awaitable], source: Any,
+            is_active: Callable[[], bool]) -> None:
+        """
+        Runs ``connect`` until ``is_active`` returns false, reconnecting whenever it returns or fails.
+        ``connect`` is passed a :class:`Reconnector`, which it must notify once it is subscribed.
+        """
+        await Reconnector(self, source).run(connect, is_active)
+
+
+def _now() -> int:
+    return int(time.time() * 1000)
+
+
+async def _notify(callback: Optional[Callable], *args) -> None:
+    if callback is not None:
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
+
+
+class Reconnector:
+    """
+    The state of a single stream, kept alive by a :class:`ReconnectPolicy`
+    """
+    def __init__(self, policy: ReconnectPolicy, source: Any) -> None:
+        self.policy = policy
+        self.source = source
+        self.gap_start = None
+        self.is_established = False
+        self.rolled_over = False
+        self._rollover = None
+
+    async def established(self, websocket) -> None:
+        """
+        Called by the connection once it is subscribed, ends any gap and schedules the rollover.
+        The connection only counts as established once ``on_connect`` returned, so a failing
+        ``on_connect`` is retried with backoff, like a failed connection
+        """
+        await _notify(self.policy.on_connect, self.source)
+        self.is_established = True
+        if self.gap_start is not None:
+            gap_start, self.gap_start = self.gap_start, None
+            await _notify(self.policy.on_gap_end, self.source, gap_start, _now())
+        if self.policy.max_connection_age:
+            self._rollover = asyncio.get_event_loop().call_later(
+                self.policy.max_connection_age, self._roll_over, websocket)
+
+    def _roll_over(self, websocket) -> None:
+        self.rolled_over = True
+        asyncio.ensure_future(websocket.close())
+
+    async def run(self, connect: Callable[['Reconnector'], Awaitable], is_active: Callable[[], bool]) -> None:
+        attempt = 0
+        while is_active():
+            self.is_established = False
+            self.rolled_over = False
+            error = None
+            try:
+                await connect(self)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                error = exception
+            finally:
+                if self._rollover is not None:
+                    self._rollover.cancel()
+                    self._rollover = None
+
+            if not is_active():
+                return
+            if self.gap_start is None:
+                self.gap_start = _now()
+                await _notify(self.policy.on_gap_start, self.source, self.gap_start)
+
+            if self.is_established:
+                attempt = 0
+            if self.rolled_over:
+                continue
+            if self.policy.max_retries is not None and attempt >= self.policy.max_retries:
+                if error is not None:
+                    raise error
+                return
+            await asyncio.sleep(self.policy.get_delay(attempt))
+            attempt += 1
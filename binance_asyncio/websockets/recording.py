@@ -0,0 +1,243 @@
+"""
+Recording of the raw messages of streams, and replaying them, for example to backtest
+a strategy against exactly the messages it received in production.
+
+The recordings are written to segment files in a directory. A segment is a sequence of
+zlib compressed blocks, each prefixed by its compressed and raw length (two little endian
+uint32). A block holds records, each a receive timestamp in nanoseconds (uint64), the
+length of the message (uint32) and the message itself, as UTF-8. A recorder which was
+killed while writing a block leaves it truncated, such a block is skipped by the replay.
+"""
+import asyncio
+import inspect
+import mmap
+import os
+import struct
+import time
+import warnings
+import zlib
+from typing import Callable, Iterator, List, Tuple, Union
+from binance_asyncio.websockets.streams import BaseStream
+
+_BLOCK = struct.Struct('<II')
+_RECORD = struct.Struct('<QI')
+SUFFIX = '.seg'
+
+
+class StreamRecorder:
+    """
+    Records the raw messages of any number of streams, with the time they were received.
+
+    .. code-block::
+
+        recorder = StreamRecorder('recordings/btcusdt-depth')
+        recorder.attach(stream)
+        try:
+            await stream.start(handler)
+        finally:
+            recorder.close()
+
+    :param directory: The directory to write the segments to, it is created if it does not exist
+    :param segment_size: The number of uncompressed bytes after which a new segment is started
+    :param block_size: The number of uncompressed bytes compressed together
+    :param level: The zlib compression level
+    :param flush_interval: The age in seconds of the oldest message of a block, after which the
+        block is written along with the next message, even if it is not full, so a crash loses
+        little of the recording. None to only write full blocks
+    :type directory: string
+    :type segment_size: int
+    :type block_size: int
+    :type level: int
+    :type flush_interval: float
+    """
+    def __init__(self, directory: str, segment_size: int = 256 * 1024 * 1024, block_size: int = 256 * 1024,
+            level: int = 3, flush_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.segment_size = segment_size
+        self.block_size = block_size
+        self.level = level
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._block = bytearray()
+        self._block_started = 0.0
+        self._file = None
+        self._segment_written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._segment = len(segment_paths(directory))
+
+    def attach(self, stream: BaseStream) -> None:
+        """
+        Starts recording the messages of a stream
+        """
+        stream.taps.append(self.write)
+
+    def detach(self, stream: BaseStream) -> None:
+        """
+        Stops recording the messages of a stream
+        """
+        stream.taps.remove(self.write)
+
+    def write(self, message: Union[str, bytes], received: int = None) -> None:
+        """
+        Records a message
+
+        :param message: The raw message
+        :param received: The time it was received in nanoseconds since the epoch, defaults to now
+        """
+        if isinstance(message, str):
+            message = message.encode()
+        block = self._block
+        if not block:
+            self._block_started = time.monotonic()
+        block += _RECORD.pack(time.time_ns() if received is None else received, len(message))
+        block += message
+        self.count += 1
+        if len(block) >= self.block_size:
+            self._write_block()
+        elif self.flush_interval is not None and time.monotonic() - self._block_started >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered messages to disk
+        """
+        if self._block:
+            self._write_block()
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_block(self) -> None:
+        if self._file is None or self._segment_written >= self.segment_size:
+            if self._file is not None:
+                self._file.close()
+            path = os.path.join(self.directory, '{:08d}{}'.format(self._segment, SUFFIX))
+            self._file = open(path, 'ab')
+            self._segment += 1
+            self._segment_written = 0
+        raw = bytes(self._block)
+        compressed = zlib.compress(raw, self.level)
+        self._file.write(_BLOCK.pack(len(compressed), len(raw)))
+        self._file.write(compressed)
+        self._segment_written += len(raw)
+        self._block = bytearray()
+
+
+def segment_paths(path: str) -> List[str]:
+    """
+    The segment files of a recording, in order. The path can be a directory or a single segment
+    """
+    if os.path.isfile(path):
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(SUFFIX)]
+
+
+def read_blocks(path: str) -> Iterator[bytes]:
+    """
+    Iterates over the decompressed blocks of a segment file, which is memory-mapped
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                position = 0
+                end = len(mapped)
+                while position + _BLOCK.size <= end:
+                    compressed, _ = _BLOCK.unpack_from(mapped, position)
+                    position += _BLOCK.size
+                    if position + compressed > end:
+                        break
+                    yield zlib.decompress(view[position:position + compressed])
+                    position += compressed
+                if position < end:
+                    warnings.warn("Skipped the truncated last block of {}".format(path))
+            finally:
+                view.release()
+
+
+class StreamReplay:
+    """
+    Replays a recording of :class:`StreamRecorder`, to the same handlers as the live
+    streams. Either as fast as possible, or at the pace the messages were received.
+
+    .. code-block::
+
+        replay = StreamReplay('recordings/btcusdt-depth')
+        await replay.replay(handler)
+
+    :param path: The directory of the recording, or a single segment file
+    :type path: string
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def records(self, as_bytes=False) -> Iterator[Tuple[int, Union[str, bytes]]]:
+        """
+        Iterates over the recorded messages
+
+        :param as_bytes: When true, the messages are bytes rather than text
+        :rtype: Iterator[(int, string)]
+        :return: an iterator of tuples, of the receive time in nanoseconds and the message
+        """
+        unpack = _RECORD.unpack_from
+        size = _RECORD.size
+        for path in segment_paths(self.path):
+            for block in read_blocks(path):
+                position = 0
+                end = len(block)
+                while position < end:
+                    received, length = unpack(block, position)
+                    position += size
+                    message = block[position:position + length]
+                    position += length
+                    yield received, message if as_bytes else message.decode()
+
+    async def replay(self, handler: Callable, pace=False, speed: float = 1.0, decoder: Callable = None,
+            as_bytes=False) -> int:
+        """
+        Passes the recorded messages to a handler
+
+        :param handler: The handler, a coroutine function or a plain function
+        :param pace: When true, the messages are replayed at the pace they were received,
+            otherwise as fast as possible
+        :param speed: When pacing, the factor the replay is sped up by
+        :param decoder: Optional decoder of the messages, for example ``stream.get_decoder('json')``
+        :param as_bytes: When true, the handler is passed bytes rather than text
+        :type pace: bool
+        :type speed: float
+        :type as_bytes: bool
+        :rtype: int
+        :return: the number of messages replayed
+        """
+        is_coroutine = inspect.iscoroutinefunction(handler)
+        count = 0
+        start = None
+        for received, message in self.records(as_bytes):
+            if pace:
+                if start is None:
+                    start = (received, time.monotonic())
+                delay = (received - start[0]) / 1e9 / speed - (time.monotonic() - start[1])
+                if delay > 0.001:
+                    await asyncio.sleep(delay)
+            if decoder is not None:
+                message = decoder(message)
+                if message is None:
+                    continue
+            if is_coroutine:
+                await handler(message)
+            else:
+                handler(message)
+            count += 1
+            if not count & 0xffff:
+                # let the other tasks run now and then
+                await asyncio.sleep(0)
+        return count
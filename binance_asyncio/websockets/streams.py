@@ -1,37 +1,156 @@
-from typing import Callable, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 from abc import ABC, abstractmethod
+from binance_asyncio import codec
+from binance_asyncio.columnar import decode_aggregate_trade_events, decode_kline_events
+from binance_asyncio.instrumentation import Instrumentation, event_time
+from binance_asyncio.websockets import messages
+from binance_asyncio.websockets.dispatch import Dispatcher
+from binance_asyncio.websockets.reconnect import ReconnectPolicy, Reconnector
+import time
 import websockets
-import json
+
+
+def decode_message(message):
+    """
+    Decodes a message with the configured codec, replies to requests, such as
+    subscriptions, are decoded to None
+    """
+    data = codec.loads(message)
+    if isinstance(data, dict) and 'result' in data and 'id' in data:
+        return None
+    return data
+
 
 class BaseStream(ABC):
     uri = "wss://stream.binance.com:9443/ws"
     last_id = 0
+    message_type = None
 
     def __init__(self) -> None:
         self.parameters = {}
         self.active = True
         self.active_id = None
         self.socket_reference = None
+        self.taps = []
+
+    async def start(self,  handler: Callable, keep_alive=False, decode='raw', dispatcher: Dispatcher = None,
+            reconnect: ReconnectPolicy = None, instrumentation: Instrumentation = None):
+        """
+        Connects, subscribes and passes every message to the handler
 
-    async def start(self,  handler: Callable, keep_alive=False):
+        :param handler: The coroutine function to handle the messages
+        :param keep_alive: When true, the stream reconnects when the connection is lost,
+            using the default :class:`ReconnectPolicy`
+        :param decode: What the handler is passed, either
+
+            - "raw", the raw text of the message
+            - "json", the message decoded once with the configured :mod:`binance_asyncio.codec`
+            - "typed", the message decoded into a compact object, see :mod:`binance_asyncio.websockets.messages`
+        :param dispatcher: How messages are passed to the handler, by default they are awaited 
+            inline by the reader, see :mod:`binance_asyncio.websockets.dispatch`
+        :param reconnect: How the stream reconnects, implies ``keep_alive``
+        :param instrumentation: Optional hooks measuring the messages, see :mod:`binance_asyncio.instrumentation`.
+            With a dispatcher, the handler time is the time to dispatch the message
+        :type handler: Callable
+        :type keep_alive: bool
+        :type decode: string
+        :type dispatcher: Dispatcher
+        :type reconnect: ReconnectPolicy
+        :type instrumentation: Instrumentation
+        """
         self.active_id = BaseStream.last_id = BaseStream.last_id + 1
-        if not keep_alive:
-            await self._start(handler)
-        else:
-            while self.active:
-                try:
-                    await self._start(handler)
-                except:
-                    continue
+        decoder = self.get_decoder(decode)
+        if dispatcher is not None:
+            await dispatcher.open(handler)
+            handler = dispatcher.dispatch
+        if reconnect is None and keep_alive:
+            reconnect = ReconnectPolicy()
+        self.active = True
+        try:
+            if reconnect is None:
+                await self._start(handler, decoder, instrumentation=instrumentation)
+            else:
+                await reconnect.run(
+                    lambda reconnector: self._start(handler, decoder, reconnector, instrumentation),
+                    self,
+                    lambda: self.active)
+        finally:
+            if dispatcher is not None:
+                await dispatcher.close()
 
-    async def _start(self,  handler: Callable):
-        async with websockets.connect(BaseStream.uri) as websocket:
+    async def stop(self) -> None:
+        """
+        Stops the stream, and closes its connection
+        """
+        self.active = False
+        if self.socket_reference is not None:
+            await self.socket_reference.close()
+
+    async def _start(self,  handler: Callable, decoder: Optional[Callable] = None, reconnector: Reconnector = None,
+            instrumentation: Instrumentation = None):
+        options = {} if reconnector is None else reconnector.policy.get_connect_options()
+        async with websockets.connect(BaseStream.uri, **options) as websocket:
             self.socket_reference = websocket
-            request = await self._get_request('SUBSCRIBE')
-            await websocket.send(request)
-            await websocket.recv()
-            async for message in websocket:
-                await handler(message)
+            try:
+                request = await self._get_request('SUBSCRIBE')
+                await websocket.send(request)
+                await websocket.recv()
+                if reconnector is not None:
+                    await reconnector.established(websocket)
+                taps = self.taps
+                if instrumentation is not None:
+                    await self._read_instrumented(websocket, handler, decoder, instrumentation)
+                elif decoder is None:
+                    async for message in websocket:
+                        if taps:
+                            for tap in taps:
+                                tap(message)
+                        await handler(message)
+                else:
+                    async for message in websocket:
+                        if taps:
+                            for tap in taps:
+                                tap(message)
+                        message = decoder(message)
+                        if message is not None:
+                            await handler(message)
+            finally:
+                self.socket_reference = None
+
+    async def _read_instrumented(self, websocket, handler: Callable, decoder: Optional[Callable],
+            instrumentation: Instrumentation) -> None:
+        name = type(self).__name__
+        taps = self.taps
+        async for message in websocket:
+            received = time.time()
+            for tap in taps:
+                tap(message)
+            if decoder is not None:
+                message = decoder(message)
+                if message is None:
+                    continue
+            start = time.perf_counter()
+            await handler(message)
+            instrumentation.on_message(name, received, event_time(message), time.perf_counter() - start)
+
+    def get_decoder(self, decode: str) -> Optional[Callable]:
+        """
+        Gets the function decoding raw messages, for a decode mode of :meth:`start`
+        """
+        if decode == 'raw':
+            return None
+        if decode == 'json':
+            return decode_message
+        if decode == 'typed':
+            if self.message_type is None:
+                raise Exception("{} has no typed messages".format(type(self).__name__))
+            decode_typed = self.message_type.decode
+
+            def decoder(message):
+                data = decode_message(message)
+                return None if data is None else decode_typed(data)
+            return decoder
+        raise Exception("Invalid decode mode {}".format(decode))
 
     @abstractmethod
     async def get_stream_identifier(self) -> str:
@@ -48,7 +167,7 @@ class BaseStream(ABC):
 
     async def _get_request(self, type:str):
         parameters = list(self.parameters.keys())
-        return json.dumps({
+        return codec.dumps({
                 "method": type,
                 "params": parameters,
                 "id": self.active_id
@@ -59,30 +178,52 @@ class BaseStream(ABC):
         self.parameters[parameter] = None
 
 class AggregateTradeStream(BaseStream):
+    message_type = messages.AggregateTrade
+
     async def get_stream_identifier(self) -> str:
         return "{}@aggTrade"
 
+    @staticmethod
+    def to_columns(messages: Iterable, scale: int = None) -> dict:
+        """
+        Decodes a batch of messages into typed NumPy columns, see 
+        :func:`binance_asyncio.columnar.decode_aggregate_trade_events`
+        """
+        return decode_aggregate_trade_events(messages, scale)
+
 class TradeStream(BaseStream): 
+    message_type = messages.Trade
+
     async def get_stream_identifier(self) -> str:
         return "{}@trade"
 
 class TickerStream(BaseStream):
+    message_type = messages.Ticker
+
     async def get_stream_identifier(self) -> str:
         return "{}@ticker"
 
 class AllMarketTickerStream(BaseStream):
+    message_type = messages.Ticker
+
     async def get_stream_identifier(self) -> str:
         return "!ticker@arr"
 
 class MiniTickerStream(BaseStream):    
+    message_type = messages.MiniTicker
+
     async def get_stream_identifier(self) -> str:
         return "{}@miniTicker"
 
 class AllMarketsMiniTickerStream(BaseStream):
+    message_type = messages.MiniTicker
+
     async def get_stream_identifier(self) -> str:
         return "!miniTicker@arr"
 
 class KlineStream(BaseStream):
+    message_type = messages.Kline
+
     async def subscribe(self, symbol:str, interval:str) -> None:
         arguments = [symbol, interval]
         await super()._subscribe(*arguments)
@@ -90,15 +231,29 @@ class KlineStream(BaseStream):
     async def get_stream_identifier(self) -> str:
         return "{}@kline_{}"
 
+    @staticmethod
+    def to_columns(messages: Iterable, scale: int = None) -> dict:
+        """
+        Decodes a batch of messages into typed NumPy columns, see 
+        :func:`binance_asyncio.columnar.decode_kline_events`
+        """
+        return decode_kline_events(messages, scale)
+
 class SymbolBookTickerStream(BaseStream):
+    message_type = messages.BookTicker
+
     async def get_stream_identifier(self) -> str:
         return "{}@bookTicker"
 
 class AllBookTickerStream(BaseStream):
+    message_type = messages.BookTicker
+
     async def get_stream_identifier(self) -> str:
         return "!bookTicker"
 
 class PartialBookDepthStream(BaseStream):
+    message_type = messages.PartialDepth
+
     async def subscribe(self, symbol:str, levels:str, more_updates:bool=False) -> None:
         arguments = [symbol, levels, "" if not more_updates else "@100ms"]
         await super()._subscribe(*arguments)
@@ -107,8 +262,23 @@ class PartialBookDepthStream(BaseStream):
         return "{}@depth{}{}"
 
 class DiffDepthStream(BaseStream):
+    message_type = messages.DepthUpdate
+
     async def subscribe(self, symbol:str, more_updates:bool=False) -> None:
         arguments = [symbol, "" if not more_updates else "@100ms"]
         await super()._subscribe(*arguments)
     async def get_stream_identifier(self) -> str:
-        return "{}@depth{}"
\ No newline at end of file
+        return "{}@depth{}"
+
+class UserDataStream(BaseStream):
+    """
+    The account, balance and order updates of an account, subscribed by the listen key
+    of :meth:`AccountEndpoints.create_listen_key`, which has to be kept alive.
+    :class:`binance_asyncio.account.AccountState` takes care of that, and keeps
+    a local view of the account up to date.
+    """
+    async def subscribe(self, listen_key:str) -> None:
+        await self._subscribe(listen_key)
+
+    async def get_stream_identifier(self) -> str:
+        return "{}"
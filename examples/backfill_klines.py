@@ -0,0 +1,14 @@
+import asyncio
+from binance_asyncio.endpoints import MarketDataEndpoints
+
+async def main():
+    api_key = '<insert your api key here>'
+
+    async with MarketDataEndpoints(api_key=api_key) as market_data:
+        # pulls 90 days of 1m candles, 4 requests at a time, in order
+        count = 0
+        async for kline in market_data.iter_klines('btcusdt', '1m', start_time='90 days ago', concurrency=4):
+            count += 1
+        print(count)
+    
+asyncio.run(main())
@@ -0,0 +1,15 @@
+import asyncio
+from binance_asyncio.download import AggregateTradeDownloader
+from binance_asyncio.endpoints import MarketDataEndpoints
+
+async def main():
+    async with MarketDataEndpoints() as market_data:
+        downloader = AggregateTradeDownloader(market_data, 'BTCUSDT', 'data/btcusdt-aggtrades', concurrency=4)
+        # the first run starts a day ago, later runs continue from the previous one
+        written = await downloader.run(start_time='1 day ago')
+        print(written, 'aggregate trades written, continuing from', downloader.next_id)
+
+    columns = downloader.store.read(['time', 'price', 'quantity'])
+    print(len(columns['time']), 'aggregate trades, the last price is', columns['price'][-1])
+
+asyncio.run(main())
@@ -0,0 +1,39 @@
+import asyncio
+from aiohttp import web
+from binance_asyncio.session import HttpSession
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.instrumentation import MetricsCollector
+from binance_asyncio.websockets.streams import TradeStream
+
+metrics = MetricsCollector()
+
+async def serve_metrics(request):
+    return web.Response(text=metrics.to_prometheus(), content_type='text/plain')
+
+async def handler(message):
+    pass
+
+async def poll(market_data):
+    while True:
+        await market_data.get_symbol_price_ticker('BTCUSDT')
+        await asyncio.sleep(1)
+
+async def main():
+    # the metrics are served on http://localhost:9100/metrics, for prometheus to scrape
+    application = web.Application()
+    application.router.add_get('/metrics', serve_metrics)
+    runner = web.AppRunner(application)
+    await runner.setup()
+    await web.TCPSite(runner, 'localhost', 9100).start()
+
+    # every request made through the session is measured
+    async with HttpSession(instrumentation=metrics) as session:
+        market_data = MarketDataEndpoints(session=session)
+        task = asyncio.create_task(poll(market_data))
+
+        stream = TradeStream()
+        await stream.subscribe("btcusdt")
+        await stream.start(handler, decode="json", keep_alive=True, instrumentation=metrics)
+        task.cancel()
+
+asyncio.run(main())
@@ -0,0 +1,19 @@
+import asyncio
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.aggregation import KlineAggregator
+from binance_asyncio.websockets.streams import KlineStream
+
+def on_close(interval, bar):
+    print(interval, bar)
+
+async def main():
+    # 5m, 15m, 1h and 4h klines, from a single 1m kline stream
+    aggregator = KlineAggregator('btcusdt', ['5m', '15m', '1h', '4h'], history=200, on_close=on_close)
+    async with MarketDataEndpoints() as market_data:
+        await aggregator.seed_from(market_data)
+
+    stream = KlineStream()
+    await stream.subscribe("btcusdt", "1m")
+    await stream.start(aggregator.handle, decode="typed", keep_alive=True)
+
+asyncio.run(main())
@@ -0,0 +1,17 @@
+import asyncio
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.klines import KlineStore
+
+async def main():
+    async with MarketDataEndpoints() as market_data:
+        klines = KlineStore(market_data, 'data/klines')
+        # the first call fetches 30 days of klines, and stores them
+        columns = await klines.get_klines('BTCUSDT', '1h', start_time='30 days ago')
+        print(len(columns['open_time']), 'klines,', klines.fetched, 'fetched')
+
+        # the second call is served from disk, only the latest klines are fetched
+        columns = await klines.get_klines('BTCUSDT', '1h', start_time='30 days ago')
+        print(len(columns['open_time']), 'klines,', klines.fetched, 'fetched')
+        print('the latest close is', columns['close'][-1])
+
+asyncio.run(main())
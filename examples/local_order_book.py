@@ -0,0 +1,24 @@
+import asyncio
+from binance_asyncio.endpoints import MarketDataEndpoints
+from binance_asyncio.orderbook import LocalOrderBooks
+from binance_asyncio.websockets.streams import DiffDepthStream
+
+async def report(books):
+    while True:
+        await asyncio.sleep(1)
+        for symbol, book in books.books.items():
+            if book.synced:
+                print(symbol, book.best_bid(), book.best_ask())
+
+async def main():
+    async with MarketDataEndpoints() as market_data:
+        books = LocalOrderBooks(market_data)
+        stream = DiffDepthStream()
+        for symbol in ["btcusdt", "ethusdt"]:
+            books.add(symbol)
+            await stream.subscribe(symbol, more_updates=True)
+
+        asyncio.create_task(report(books))
+        await stream.start(books.handle)
+
+asyncio.run(main())
@@ -0,0 +1,28 @@
+import asyncio
+from binance_asyncio.session import HttpSession
+from binance_asyncio.ratelimit import RateLimiter, Priority, request_priority
+from binance_asyncio.endpoints import AccountEndpoints, MarketDataEndpoints
+
+async def backfill(market_data):
+    # everything requested inside the block is scheduled behind other requests,
+    # and may only use part of the weight budget
+    with request_priority(Priority.BACKFILL):
+        for _ in range(100):
+            code, result = await market_data.get_klines('btcusdt', limit=1000)
+
+async def main():
+    api_key = '<insert your api key here>'
+    secret_key = '<insert your secret key here>'
+
+    # All clients sharing the session share one request weight budget
+    async with HttpSession(rate_limiter=RateLimiter(weight_limit=6000)) as session:
+        market_data = MarketDataEndpoints(api_key=api_key, session=session)
+        account = AccountEndpoints(api_key=api_key, secret_key=secret_key, session=session)
+
+        task = asyncio.create_task(backfill(market_data))
+        # orders are always served first
+        code, result = await account.test_order('BNBUSDT', 'SELL', 'MARKET', quantity=1)
+        print(code, result)
+        await task
+    
+asyncio.run(main())
@@ -0,0 +1,26 @@
+import asyncio
+import sys
+from binance_asyncio.websockets.streams import DiffDepthStream
+from binance_asyncio.websockets.recording import StreamRecorder, StreamReplay
+
+async def my_handler(message):
+    print(message)
+
+async def record():
+    stream = DiffDepthStream()
+    await stream.subscribe("btcusdt", more_updates=True)
+
+    recorder = StreamRecorder("recordings/btcusdt-depth")
+    recorder.attach(stream)
+    try:
+        await stream.start(my_handler, keep_alive=True)
+    finally:
+        recorder.close()
+
+async def replay():
+    # feeds the recorded messages to the same handler, as fast as possible,
+    # use pace=True to replay them at the pace they were received
+    count = await StreamReplay("recordings/btcusdt-depth").replay(my_handler)
+    print(count, "messages replayed")
+
+asyncio.run(replay() if "replay" in sys.argv else record())
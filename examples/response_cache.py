@@ -0,0 +1,15 @@
+import asyncio
+from binance_asyncio.session import HttpSession
+from binance_asyncio.cache import ResponseCache
+from binance_asyncio.endpoints import MarketDataEndpoints
+
+async def main():
+    # prices are reused for 200ms, and concurrent identical requests share one request
+    cache = ResponseCache({'ticker/price': 0.2, 'avgPrice': 1.0, 'depth': 0.1})
+    async with HttpSession() as session:
+        market_data = MarketDataEndpoints(session=session, cache=cache)
+        results = await asyncio.gather(*[market_data.get_symbol_price_ticker('BTCUSDT') for _ in range(50)])
+        print(results[0])
+        print("requests", cache.misses, "coalesced", cache.coalesced, "hits", cache.hits)
+
+asyncio.run(main())
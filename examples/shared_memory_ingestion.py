@@ -0,0 +1,20 @@
+import time
+from binance_asyncio.websockets.ingest import MarketTables, ShardedIngestion
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT", "ADAUSDT", "DOGEUSDT", "TRXUSDT"]
+
+def main():
+    # four worker processes ingest the streams, any process can attach to the tables by name
+    with ShardedIngestion(SYMBOLS, workers=4, name="binance-market") as tables:
+        reader = MarketTables.attach("binance-market").get_trade_reader()
+        while True:
+            time.sleep(1)
+            books = tables.get_books()
+            spreads = books["ask_price"] - books["bid_price"]
+            trades = reader.read()
+            print(len(trades), "trades,", reader.lost, "lost")
+            for symbol, spread in zip(tables.symbols, spreads):
+                print(symbol, "spread", round(spread, 8))
+
+if __name__ == "__main__":
+    main()
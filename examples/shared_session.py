@@ -0,0 +1,27 @@
+import asyncio
+from binance_asyncio.session import HttpSession
+from binance_asyncio.endpoints import GeneralEndpoints, MarketDataEndpoints
+
+async def main():
+    api_key = '<insert your api key here>'
+
+    # One pooled session, with keep-alive connections, shared by several clients.
+    # Used as a context manager it is closed again when the block exits.
+    async with HttpSession(limit_per_host=10) as session:
+        general = GeneralEndpoints(api_key=api_key, session=session)
+        market_data = MarketDataEndpoints(api_key=api_key, session=session)
+
+        # optionally, open a couple of connections up front
+        await general.warm_up(connections=2)
+
+        code, result = await general.get_server_time()
+        print(code, result)
+        code, result = await market_data.get_symbol_price_ticker('btcusdt')
+        print(code, result)
+
+    # A single client can also own its session
+    async with MarketDataEndpoints(api_key=api_key) as market_data:
+        code, result = await market_data.get_current_average('btcusdt')
+        print(code, result)
+    
+asyncio.run(main())
@@ -0,0 +1,17 @@
+import asyncio
+from binance_asyncio.websockets.streams import DiffDepthStream
+from binance_asyncio.websockets.dispatch import BatchDispatcher
+
+async def handler(batch):
+    # every depth update read since the previous call, in one list
+    print(len(batch), "depth updates of", sorted({update['s'] for update in batch}))
+
+async def main():
+    stream = DiffDepthStream()
+    for symbol in ("btcusdt", "ethusdt", "bnbusdt", "solusdt", "xrpusdt"):
+        await stream.subscribe(symbol, more_updates=True)
+
+    dispatcher = BatchDispatcher(max_batch=5000, max_latency=0.05)
+    await stream.start(handler, decode="json", dispatcher=dispatcher)
+
+asyncio.run(main())
@@ -0,0 +1,26 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from binance_asyncio.websockets.streams import TradeStream
+from binance_asyncio.websockets.dispatch import ExecutorDispatcher
+
+def signal(trade):
+    # runs in a worker process, the trades of a symbol are handled in order
+    price = float(trade['p'])
+    quantity = float(trade['q'])
+    return trade['s'], price, price * quantity
+
+def report(result):
+    symbol, price, notional = result
+    print(symbol, price, "notional", round(notional, 2))
+
+async def main():
+    stream = TradeStream()
+    for symbol in ("btcusdt", "ethusdt", "bnbusdt", "solusdt"):
+        await stream.subscribe(symbol)
+
+    with ProcessPoolExecutor(4) as executor:
+        dispatcher = ExecutorDispatcher(executor, shards=4, on_result=report)
+        await stream.start(signal, decode="json", dispatcher=dispatcher)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,28 @@
+import asyncio
+from binance_asyncio.websockets.streams import TradeStream, SymbolBookTickerStream, KlineStream
+from binance_asyncio.websockets.multiplexer import StreamMultiplexer
+
+async def trade_handler(data):
+    print("trade", data['s'], data['p'])
+
+async def book_handler(data):
+    print("book", data['s'], data['b'], data['a'])
+
+async def kline_handler(data):
+    print("kline", data['s'], data['k']['c'])
+
+async def main():
+    trades, books, klines = TradeStream(), SymbolBookTickerStream(), KlineStream()
+    for symbol in ["btcusdt", "ethusdt", "bnbusdt"]:
+        await trades.subscribe(symbol)
+        await books.subscribe(symbol)
+        await klines.subscribe(symbol, "1m")
+
+    # all the subscriptions share one connection, up to 1024 streams per connection
+    multiplexer = StreamMultiplexer()
+    multiplexer.add(trades, trade_handler)
+    multiplexer.add(books, book_handler)
+    multiplexer.add(klines, kline_handler)
+    await multiplexer.start(keep_alive=True)
+
+asyncio.run(main())
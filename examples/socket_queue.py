@@ -0,0 +1,24 @@
+import asyncio
+from binance_asyncio.websockets.streams import SymbolBookTickerStream
+from binance_asyncio.websockets.dispatch import QueueDispatcher
+
+async def slow_handler(message):
+    # a handler slower than the stream, only the latest book ticker per symbol is kept
+    await asyncio.sleep(0.1)
+    print(message)
+
+async def report(dispatcher):
+    while True:
+        await asyncio.sleep(5)
+        print("queue depth", dispatcher.depth, dispatcher.metrics)
+
+async def main():
+    stream = SymbolBookTickerStream()
+    await stream.subscribe("btcusdt")
+    await stream.subscribe("ethusdt")
+
+    dispatcher = QueueDispatcher(maxsize=100, overflow="conflate")
+    asyncio.create_task(report(dispatcher))
+    await stream.start(slow_handler, decode="json", dispatcher=dispatcher)
+
+asyncio.run(main())
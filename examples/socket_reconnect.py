@@ -0,0 +1,23 @@
+import asyncio
+from binance_asyncio.websockets.streams import KlineStream
+from binance_asyncio.websockets.reconnect import ReconnectPolicy
+
+async def my_handler(message):
+    print(message)
+
+def gap_started(stream, start):
+    print("connection lost at", start)
+
+def gap_ended(stream, start, end):
+    # e.g. refetch the klines between start and end with get_klines
+    print("missed data between", start, "and", end)
+
+async def main():
+    stream = KlineStream()
+    await stream.subscribe("btcusdt", "1m")
+
+    policy = ReconnectPolicy(initial_delay=1.0, max_delay=60.0,
+        on_gap_start=gap_started, on_gap_end=gap_ended)
+    await stream.start(my_handler, reconnect=policy)
+
+asyncio.run(main())
@@ -0,0 +1,18 @@
+import asyncio
+from binance_asyncio.endpoints import MarketDataEndpoints
+
+async def main():
+    symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT']
+
+    async with MarketDataEndpoints() as market_data:
+        # the prices of several symbols, in one request
+        code, prices = await market_data.get_symbol_price_tickers(symbols)
+        print(code, prices)
+
+    # single symbol calls made within 5ms of each other are served by one request
+    async with MarketDataEndpoints(batch_window=0.005) as market_data:
+        results = await asyncio.gather(*[market_data.get_price_change_stats_ticker(symbol) for symbol in symbols])
+        for code, statistics in results:
+            print(code, statistics['symbol'], statistics['lastPrice'])
+
+asyncio.run(main())
@@ -0,0 +1,23 @@
+import asyncio
+from binance_asyncio.endpoints import AccountEndpoints
+from binance_asyncio.account import AccountState
+
+def on_event(event):
+    print(event['e'])
+
+async def main():
+    api_key = '<insert your api key here>'
+    secret_key = '<insert your secret key here>'
+
+    # seeded once from the REST API, then kept up to date by the user data stream
+    state = AccountState(AccountEndpoints(api_key=api_key, secret_key=secret_key), on_event=on_event)
+    await state.start()
+    try:
+        while True:
+            usdt = state.get_balance('USDT')
+            print("USDT", usdt.free if usdt else 0, "open orders", state.get_open_orders('BTCUSDT'))
+            await asyncio.sleep(5)
+    finally:
+        await state.stop()
+
+asyncio.run(main())
@@ -0,0 +1,19 @@
+import asyncio
+from binance_asyncio.websockets.api import WebSocketAccountEndpoints
+
+async def main():
+    api_key = '<insert your api key here>'
+    secret_key = '<insert your secret key here>'
+
+    # Same methods as AccountEndpoints, but sent over one persistent websocket connection
+    async with WebSocketAccountEndpoints(api_key, secret_key, uri='wss://ws-api.testnet.binance.vision/ws-api/v3') as account:
+        code, result = await account.test_order('BNBUSDT', 'SELL', 'MARKET', quantity=1)
+        print(code, result)
+
+        code, result = await account.order('BNBUSDT', 'BUY', 'LIMIT', timeInForce='GTC', quantity=1, price='200')
+        print(code, result)
+
+        code, result = await account.cancel_order('BNBUSDT', orderId=result['orderId'])
+        print(code, result)
+    
+asyncio.run(main())
@@ -26,5 +26,9 @@ setuptools.setup(
         'aiohttp',
         'dateparser',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+        'fast': ['orjson'],
+    },
     python_requires='>=3.9',
 )